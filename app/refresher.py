@@ -0,0 +1,40 @@
+"""Background refresher: keeps the local store up to date for the Streamlit app"""
+
+import argparse
+import asyncio
+import logging
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.refresher import Refresher
+from config import LOG_FORMAT, LOG_LEVEL, REFRESH_IDLE_INTERVAL, REFRESH_LIVE_INTERVAL
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh football-data.org data into the local store")
+    parser.add_argument("--api-url", help="API root, e.g. a local fake API (defaults to FOOTBALL_API_URL)")
+    parser.add_argument("--idle-interval", type=float, default=REFRESH_IDLE_INTERVAL,
+                        help="Seconds between refreshes of a competition without live matches")
+    parser.add_argument("--live-interval", type=float, default=REFRESH_LIVE_INTERVAL,
+                        help="Seconds between refreshes during live match windows")
+    parser.add_argument("--once", action="store_true", help="Refresh everything once and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=LOG_LEVEL, format=LOG_FORMAT)
+
+    refresher = Refresher(
+        idle_interval=args.idle_interval,
+        live_interval=args.live_interval,
+        base_url=args.api_url
+    )
+
+    if args.once:
+        asyncio.run(refresher.run_once())
+    else:
+        asyncio.run(refresher.run_forever())
+
+
+if __name__ == "__main__":
+    main()
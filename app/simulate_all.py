@@ -0,0 +1,49 @@
+"""Batch simulation service: precomputes season odds of every competition for the app"""
+
+import argparse
+import logging
+import time
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.api_client import FootballDataClient
+from src.batch_simulation import BatchSimulator
+from config import BATCH_INTERVAL, BATCH_SIMULATIONS, LOG_FORMAT, LOG_LEVEL
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the season of every competition into the local store")
+    parser.add_argument("--api-url", help="API root, e.g. a local fake API (defaults to FOOTBALL_API_URL)")
+    parser.add_argument("--simulations", type=int, default=BATCH_SIMULATIONS,
+                        help="Simulated seasons per competition")
+    parser.add_argument("--workers", type=int, help="Worker processes (defaults to the CPU count)")
+    parser.add_argument("--interval", type=float, default=BATCH_INTERVAL,
+                        help="Seconds between checks for new results")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible runs")
+    parser.add_argument("--force", action="store_true", help="Re-simulate competitions even if unchanged")
+    parser.add_argument("--once", action="store_true", help="Simulate once and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=LOG_LEVEL, format=LOG_FORMAT)
+
+    batch = BatchSimulator(
+        client=FootballDataClient(base_url=args.api_url),
+        n_simulations=args.simulations,
+        workers=args.workers
+    )
+
+    force = args.force
+    while True:
+        started = time.time()
+        summaries = batch.run(force=force, seed=args.seed)
+        logging.info(f"{len(summaries)} competition(s) simulated in {time.time() - started:.1f}s")
+        if args.once:
+            break
+        force = False
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,12 +8,20 @@ from datetime import datetime
 
 import sys
 import os
+import threading
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.api_client import FootballDataClient
 from src.data_processor import FootballDataProcessor
-from src.ml_predictor import MatchPredictor
-from config import COMPETITIONS
+from src.data_store import MatchStore
+from src.form_engine import FormEngine
+from src.rating_engine import EloRatings
+from src.goal_model import get_score_grid
+from src.ingestion import standings_columns
+from src.outcome_model import OutcomeModel
+from src.prediction_matrix import PredictionMatrix
+from src.standings_engine import StandingsTable
+from config import COMPETITIONS, LIVE_PAGE_TICK, RECENT_MATCHES
 # Custom CSS
 st.markdown("""
 <style>
@@ -98,6 +106,20 @@ def init_components():
 
 client, processor = init_components()
 
+@st.cache_resource
+def init_store():
+    """Open the local match store"""
+    return MatchStore()
+
+store = init_store()
+
+@st.cache_resource
+def init_outcome_model():
+    """Load the trained outcome model (None until app/train_model.py has run)"""
+    return OutcomeModel.load()
+
+outcome_model = init_outcome_model()
+
 # Title
 st.markdown("""
     <div style='text-align: center; padding: 20px;'>
@@ -107,15 +129,6 @@ st.markdown("""
         </p>
     </div>
 """, unsafe_allow_html=True)
-def fetch_upcoming_matches(competition_id: int):
-    """Fetch upcoming matches for a competition"""
-    client = FootballDataClient()
-    data = client.get_competition_matches(competition_id)
-
-    return [
-        match for match in data.get("matches", [])
-        if match["status"] == "SCHEDULED"
-    ]
 # Sidebar
 # Sidebar
 st.sidebar.markdown("""
@@ -163,12 +176,94 @@ if not standings_data:
 # Process standings
 standings_df = processor.process_standings(standings_data)
 
+@st.cache_data(ttl=600)
+def fetch_competition_matches(comp_id):
+    """Fetch and cache the competition's matches (form, goal model, fixtures)"""
+    try:
+        return client.get_competition_matches(comp_id)
+    except Exception as e:
+        st.error(f"Erreur: {e}")
+        return None
+
+@st.cache_resource
+def init_result_engines(comp_id):
+    """
+    Rolling form and Elo ratings of a competition, updated as new results come in
+
+    Shared by every session: only touched under the returned lock.
+    """
+    return FormEngine(), EloRatings(), threading.Lock()
+
+competition_matches = fetch_competition_matches(competition_id)
+form_engine, rating_engine, engines_lock = init_result_engines(competition_id)
+with engines_lock:
+    if competition_matches:
+        form_engine.update(competition_matches)
+        rating_engine.update(competition_matches)
+    # nombre de résultats pris en compte : clé de cache des caractéristiques
+    results_key = len(form_engine.applied)
+    form_df = form_engine.to_dataframe() if results_key else None
+    ratings_df = rating_engine.to_dataframe() if results_key else None
+
+@st.cache_data(ttl=600)
+def build_team_features(standings_data, results_key, _form_df, _ratings_df):
+    """Build and cache per-team prediction features"""
+    if not results_key:
+        return processor.build_team_features(standings_data)
+    return processor.build_team_features(standings_data, _form_df, _ratings_df)
+
+team_features = build_team_features(standings_data, results_key, form_df, ratings_df)
+
+@st.cache_data(ttl=600)
+def build_prediction_matrix(standings_key, results_key, model_key, _team_features):
+    """Predict every home/away pair once per standings snapshot (and results and model)"""
+    return PredictionMatrix(_team_features, key=standings_key, outcome_model=outcome_model)
+
+standings_key = processor.standings_hash(standings_data)
+prediction_matrix = build_prediction_matrix(
+    standings_key, results_key, outcome_model.identity if outcome_model else None, team_features
+)
+
+@st.cache_resource(ttl=600)
+def build_score_grid(comp_id, standings_key, _standings_data):
+    """Fit the Dixon-Coles model once per standings snapshot"""
+    matches = fetch_competition_matches(comp_id)
+    if not matches:
+        return None
+
+    columns = standings_columns(_standings_data)
+    teams = dict(zip(columns['team_id'].tolist(), columns['team'].tolist()))
+    return get_score_grid(comp_id, standings_key, matches, teams)
+
 # ========================================
 # PAGE 1: CLASSEMENT
 # ========================================
 if page == "📊 Classement":
     st.header(f"📊 {selected_competition} - Classement")
     
+    @st.cache_data(ttl=60)
+    def fetch_competition_live_matches(comp_id):
+        """Fetch matches in play for a competition"""
+        try:
+            matches = client.get_live_matches().get('matches', [])
+        except Exception as e:
+            st.error(f"Erreur API : {e}")
+            return []
+        return [m for m in matches if (m.get('competition') or {}).get('id') == comp_id]
+    
+    if st.checkbox("🔴 Classement en direct (matchs en cours inclus)"):
+        # Snapshot + scores en cours, sans re-télécharger le classement
+        live_matches = fetch_competition_live_matches(competition_id)
+        # résultats de la saison : départages aux confrontations directes (Liga, Serie A)
+        season_matches = (fetch_competition_matches(competition_id) or {}).get('matches', [])
+        standings_df = (
+            StandingsTable(standings_data, competition_id, results=season_matches)
+            .with_live(live_matches)
+            .to_dataframe()
+            .drop(columns='team_id')
+        )
+        st.caption(f"{len(live_matches)} match(s) en cours pris en compte")
+    
     # Display metrics
     col1, col2, col3, col4 = st.columns(4)
     
@@ -241,27 +336,37 @@ if page == "📊 Classement":
         st.plotly_chart(fig_goals, use_container_width=True)
     
     with tab3:
+        top10 = standings_df.head(10)
+        if results_key:
+            # Forme réelle : derniers matchs de chaque équipe
+            recent = form_df.set_index('team').reindex(top10['team']).fillna(0)
+            wins, draws, losses = recent['wins'], recent['draws'], recent['losses']
+            form_title = f'Top 10 - Forme sur les {RECENT_MATCHES} derniers matchs (V/N/D)'
+        else:
+            wins, draws, losses = top10['won'], top10['draw'], top10['lost']
+            form_title = 'Top 10 - Forme (V/N/D)'
+
         fig_form = go.Figure()
         fig_form.add_trace(go.Bar(
             name='Victoires',
-            x=standings_df.head(10)['team'],
-            y=standings_df.head(10)['won'],
+            x=top10['team'],
+            y=wins,
             marker_color='green'
         ))
         fig_form.add_trace(go.Bar(
             name='Nuls',
-            x=standings_df.head(10)['team'],
-            y=standings_df.head(10)['draw'],
+            x=top10['team'],
+            y=draws,
             marker_color='orange'
         ))
         fig_form.add_trace(go.Bar(
             name='Défaites',
-            x=standings_df.head(10)['team'],
-            y=standings_df.head(10)['lost'],
+            x=top10['team'],
+            y=losses,
             marker_color='red'
         ))
         fig_form.update_layout(
-            title='Top 10 - Forme (V/N/D)',
+            title=form_title,
             xaxis_tickangle=-45,
             barmode='stack',
             height=500
@@ -294,33 +399,26 @@ elif page == "🎯 Prédictions":
             key="away"
         )
     
+    model_name = st.radio(
+        "Modèle", ["Force des équipes (ML)", "Dixon-Coles (Poisson)"], horizontal=True
+    )
+
     # Predict button
     if st.button("🔮 PRÉDIRE LE RÉSULTAT", type="primary", use_container_width=True):
         if home_team_name == away_team_name:
             st.error("⚠️ Veuillez sélectionner deux équipes différentes !")
         else:
             with st.spinner("Analyse en cours..."):
-                # Get team stats
-                home_stats = standings_df[standings_df['team'] == home_team_name].iloc[0].to_dict()
-                away_stats = standings_df[standings_df['team'] == away_team_name].iloc[0].to_dict()
-                
-                # Add team names
-                home_stats['name'] = home_team_name
-                away_stats['name'] = away_team_name
-                
-                # Calculate averages
-                home_stats['avg_goals_scored'] = home_stats['goals_for'] / max(home_stats['played'], 1)
-                home_stats['avg_goals_conceded'] = home_stats['goals_against'] / max(home_stats['played'], 1)
-                away_stats['avg_goals_scored'] = away_stats['goals_for'] / max(away_stats['played'], 1)
-                away_stats['avg_goals_conceded'] = away_stats['goals_against'] / max(away_stats['played'], 1)
-                
-                # Form points (simplified)
-                home_stats['form_points'] = home_stats['won'] * 3 + home_stats['draw']
-                away_stats['form_points'] = away_stats['won'] * 3 + away_stats['draw']
-                
-                # Predict
-                predictor = MatchPredictor()
-                prediction = predictor.predict_match(home_stats, away_stats)
+                # Precomputed prediction
+                if model_name == "Dixon-Coles (Poisson)":
+                    score_grid = build_score_grid(competition_id, standings_key, standings_data)
+                    prediction = score_grid.get(home_team_name, away_team_name) if score_grid else None
+                else:
+                    prediction = prediction_matrix.get(home_team_name, away_team_name)
+
+            if prediction is None:
+                st.error("❌ Prédiction indisponible pour ces équipes")
+            else:
                 
                 # Display results
                 st.success("✅ Prédiction générée !")
@@ -378,22 +476,37 @@ elif page == "🎯 Prédictions":
                 st.markdown(f"### {prediction['predicted_score']}")
                 st.info(f"💡 Confiance du modèle : **{prediction['confidence']}%**")
                 
-                # Key factors
-                st.markdown("---")
-                st.subheader("🔑 Facteurs Clés")
-                for factor in prediction['key_factors']:
-                    st.markdown(f"- {factor}")
-                
-                # Team strengths
-                st.markdown("---")
-                st.subheader("💪 Force des Équipes")
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.metric(f"🏠 {home_team_name}", f"{prediction['home_strength']}/100")
-                
-                with col2:
-                    st.metric(f"✈️ {away_team_name}", f"{prediction['away_strength']}/100")
+                if 'score_matrix' in prediction:
+                    # Score matrix (Dixon-Coles)
+                    st.markdown("---")
+                    st.subheader("🎯 Probabilité de chaque score")
+                    goals = list(range(6))
+                    fig_scores = px.imshow(
+                        prediction['score_matrix'][:6, :6] * 100,
+                        x=goals, y=goals, text_auto='.1f', color_continuous_scale='Greens',
+                        labels={'x': f"Buts {away_team_name}", 'y': f"Buts {home_team_name}", 'color': '%'}
+                    )
+                    st.plotly_chart(fig_scores, use_container_width=True)
+                    st.caption(
+                        f"Buts attendus : {prediction['home_expected_goals']} - {prediction['away_expected_goals']}"
+                    )
+                else:
+                    # Key factors
+                    st.markdown("---")
+                    st.subheader("🔑 Facteurs Clés")
+                    for factor in prediction['key_factors']:
+                        st.markdown(f"- {factor}")
+
+                    # Team strengths
+                    st.markdown("---")
+                    st.subheader("💪 Force des Équipes")
+                    col1, col2 = st.columns(2)
+
+                    with col1:
+                        st.metric(f"🏠 {home_team_name}", f"{prediction['home_strength']}/100")
+
+                    with col2:
+                        st.metric(f"✈️ {away_team_name}", f"{prediction['away_strength']}/100")
 
 
 # ========================================
@@ -425,8 +538,8 @@ elif page == "⚔️ Comparaison":
         st.warning("⚠️ Sélectionnez deux équipes différentes")
     else:
         # Get team stats
-        team1 = standings_df[standings_df['team'] == team1_name].iloc[0]
-        team2 = standings_df[standings_df['team'] == team2_name].iloc[0]
+        team1 = team_features.get(team1_name)
+        team2 = team_features.get(team2_name)
         
         # Header
         st.markdown("---")
@@ -476,6 +589,47 @@ elif page == "⚔️ Comparaison":
             st.metric("Nuls", int(team2['draw']))
             st.metric("Défaites", int(team2['lost']))
         
+        # Forme récente
+        if 'form_string' in team1:
+            st.markdown("---")
+            st.subheader(f"🔥 Forme ({RECENT_MATCHES} derniers matchs)")
+
+            col1, col2, col3 = st.columns([2, 1, 2])
+
+            for col, team in ((col1, team1), (col3, team2)):
+                with col:
+                    st.metric("Série (récent → ancien)", team['form_string'] or "-")
+                    st.metric("Points", int(team['form_points']))
+                    st.metric("Points dom. / ext.", f"{team['form_home_points']:.0f} / {team['form_away_points']:.0f}")
+                    st.metric("Buts marqués / encaissés (pondérés)",
+                              f"{team['form_goal_rate_for']:.2f} / {team['form_goal_rate_against']:.2f}")
+
+            with col2:
+                st.markdown("")
+
+        # Elo
+        if 'elo' in team1:
+            st.markdown("---")
+            st.subheader("📈 Classement Elo")
+
+            col1, col2, col3 = st.columns([2, 1, 2])
+            with col1:
+                st.metric("Elo", f"{team1['elo']:.0f}")
+            with col2:
+                st.markdown("")
+            with col3:
+                st.metric("Elo", f"{team2['elo']:.0f}")
+
+            fig_elo = go.Figure()
+            for team, color in ((team1, '#2ecc71'), (team2, '#e74c3c')):
+                with engines_lock:
+                    dates, ratings = rating_engine.history(team['team_id'])
+                fig_elo.add_trace(go.Scatter(
+                    x=pd.to_datetime(dates), y=ratings, mode='lines', name=team['team'], line_color=color
+                ))
+            fig_elo.update_layout(title="Évolution Elo (par journée)", yaxis_title="Elo", height=400)
+            st.plotly_chart(fig_elo, use_container_width=True)
+
         # Buts
         st.markdown("---")
         st.subheader("🎯 Attaque & Défense")
@@ -591,108 +745,123 @@ elif page == "📅 Matchs à Venir":
     st.header("📅 Prochains Matchs")
     st.markdown("*Calendrier des matchs à venir*")
     
-    # Fetch upcoming matches
+    # Fetch matches into the local store
     @st.cache_data(ttl=600)
-    def fetch_upcoming_matches(comp_id):
-        """Fetch upcoming matches"""
-        try:
-            data = client.get_competition_matches(comp_id)
-            return data.get('matches', [])
-        except Exception as e:
-            st.error(f"Erreur: {e}")
-            return []
+    def sync_matches(comp_id):
+        """Store the competition matches"""
+        matches = fetch_competition_matches(comp_id)
+        return store.save_matches(matches) if matches else 0
     
-    matches = fetch_upcoming_matches(competition_id)
+    sync_matches(competition_id)
+    # Indexed query on the store (SCHEDULED or TIMED status, soonest first)
+    upcoming = store.upcoming_matches(competition_id)
     
-    if not matches:
-        st.warning("Aucun match disponible")
+    if upcoming.empty:
+        st.info("Aucun match à venir planifié pour le moment")
     else:
-        # Filter upcoming matches (SCHEDULED or TIMED status)
-        upcoming = [m for m in matches if m.get('status') in ['SCHEDULED', 'TIMED']]
+        st.success(f"✅ {len(upcoming)} matchs à venir")
         
-        if not upcoming:
-            st.info("Aucun match à venir planifié pour le moment")
-        else:
-            st.success(f"✅ {len(upcoming)} matchs à venir")
+        from datetime import datetime
+        
+        for match in upcoming.head(15).itertuples():  # Show next 15 matches
+            match_date = match.utc_date or ''
+            home_team = match.home_team or 'N/A'
+            away_team = match.away_team or 'N/A'
             
-            # Group by matchday
-            from datetime import datetime
+            try:
+                date_obj = datetime.fromisoformat(match_date.replace('Z', '+00:00'))
+                formatted_date = date_obj.strftime('%d/%m/%Y %H:%M')
+            except:
+                formatted_date = match_date
             
-            # Parse and sort by date
-            for match in upcoming[:15]:  # Show next 15 matches
-                match_date = match.get('utcDate', '')
-                home_team = match.get('homeTeam', {}).get('name', 'N/A')
-                away_team = match.get('awayTeam', {}).get('name', 'N/A')
+            # Create match card
+            with st.container():
+                col1, col2, col3 = st.columns([2, 1, 2])
                 
-                try:
-                    date_obj = datetime.fromisoformat(match_date.replace('Z', '+00:00'))
-                    formatted_date = date_obj.strftime('%d/%m/%Y %H:%M')
-                except:
-                    formatted_date = match_date
+                with col1:
+                    st.markdown(f"**{home_team}**")
                 
-                # Create match card
-                with st.container():
-                    col1, col2, col3 = st.columns([2, 1, 2])
-                    
-                    with col1:
-                        st.markdown(f"**{home_team}**")
-                    
-                    with col2:
-                        st.markdown("🆚")
-                        st.caption(formatted_date)
-                    
-                    with col3:
-                        st.markdown(f"**{away_team}**")
-                    
-                    # Add prediction button
-                    if st.button(f"🔮 Prédire ce match", key=f"predict_{match.get('id')}"):
-                        # Get team IDs from standings
-                        home_stats = standings_df[standings_df['team'] == home_team]
-                        away_stats = standings_df[standings_df['team'] == away_team]
-                        
-                        if not home_stats.empty and not away_stats.empty:
-                            home_data = home_stats.iloc[0].to_dict()
-                            away_data = away_stats.iloc[0].to_dict()
-                            
-                            home_data['name'] = home_team
-                            away_data['name'] = away_team
-                            home_data['avg_goals_scored'] = home_data['goals_for'] / max(home_data['played'], 1)
-                            home_data['avg_goals_conceded'] = home_data['goals_against'] / max(home_data['played'], 1)
-                            away_data['avg_goals_scored'] = away_data['goals_for'] / max(away_data['played'], 1)
-                            away_data['avg_goals_conceded'] = away_data['goals_against'] / max(away_data['played'], 1)
-                            home_data['form_points'] = home_data['won'] * 3 + home_data['draw']
-                            away_data['form_points'] = away_data['won'] * 3 + away_data['draw']
-                            
-                            predictor = MatchPredictor()
-                            prediction = predictor.predict_match(home_data, away_data)
-                            
-                            st.info(f"**Prédiction**: {prediction['predicted_score']}")
-                            st.caption(f"Probabilités: {home_team} {prediction['home_win_probability']}% | Nul {prediction['draw_probability']}% | {away_team} {prediction['away_win_probability']}%")
-                        else:
-                            st.warning("Équipes non trouvées dans le classement")
+                with col2:
+                    st.markdown("🆚")
+                    st.caption(formatted_date)
+                
+                with col3:
+                    st.markdown(f"**{away_team}**")
+                
+                # Add prediction button
+                if st.button(f"🔮 Prédire ce match", key=f"predict_{match.id}"):
+                    # Precomputed prediction, by team ID
+                    prediction = prediction_matrix.get(match.home_team_id, match.away_team_id)
                     
-                    st.markdown("---")
+                    if prediction:
+                        st.info(f"**Prédiction**: {prediction['predicted_score']}")
+                        st.caption(f"Probabilités: {home_team} {prediction['home_win_probability']}% | Nul {prediction['draw_probability']}% | {away_team} {prediction['away_win_probability']}%")
+                    else:
+                        st.warning("Équipes non trouvées dans le classement")
+                
+                st.markdown("---")
 # ========================================
 #Similation Saison
 ######################################
 elif page == "🏆 Simulation Saison":
-    from src.season_similator import SeasonSimulator
+    from src.season_similator import SeasonSimulator, remaining_fixtures
 
     st.header("🏆 Simulation de fin de saison")
     st.markdown("*Monte Carlo sur les matchs restants*")
 
+    # Probabilités précalculées par le service de simulation (app/simulate_all.py)
+    precomputed = store.latest_simulation(competition_id)
+    if len(precomputed):
+        st.subheader("📊 Dernières probabilités précalculées")
+        st.caption(
+            f"{int(precomputed['n_simulations'].iloc[0])} simulations • "
+            f"{precomputed['simulated_at'].iloc[0]} (UTC)"
+        )
+        st.dataframe(
+            precomputed.drop(columns=['simulated_at', 'n_simulations', 'input_key']),
+            use_container_width=True
+        )
+        st.bar_chart(precomputed.set_index('team')['title_prob_%'].head(10))
+        st.markdown("---")
+        st.subheader("🔁 Simulation à la demande")
+    else:
+        st.info("Aucune simulation précalculée : lancez `python app/simulate_all.py` ou simulez ci-dessous")
+
     n_sim = st.slider("Nombre de simulations", 100, 2000, 500, step=100)
+    early_stop = st.checkbox("⏱ Arrêt anticipé (précision cible)", value=True)
+    tolerance = st.select_slider(
+        "Précision cible (± points de %)", [0.5, 1.0, 2.0, 5.0], value=2.0,
+        disabled=not early_stop
+    )
+
+    use_goal_model = st.checkbox("⚽ Scores tirés du modèle Dixon-Coles (Poisson)")
 
     if st.button("🚀 Lancer la simulation"):
         with st.spinner("Simulation en cours..."):
-            matches = fetch_upcoming_matches(competition_id)
-            upcoming = [m for m in matches if m['status'] in ['SCHEDULED', 'TIMED']]
-
-            simulator = SeasonSimulator(standings_df)
-            results = simulator.simulate_season(upcoming, n_simulations=n_sim)
+            # matchs de la compétition déjà en cache (mêmes données que les autres pages)
+            matches = fetch_competition_matches(competition_id) or {}
+            upcoming = remaining_fixtures(matches.get('matches', []))
+
+            score_grid = (
+                build_score_grid(competition_id, standings_key, standings_data) if use_goal_model else None
+            )
+            simulator = SeasonSimulator(standings_df, prediction_matrix, score_grid)
+            results = simulator.simulate_season(
+                upcoming,
+                n_simulations=n_sim,
+                tolerance=tolerance / 100 if early_stop else None,
+                chunk_size=100
+            )
             summary = simulator.summarize(results)
 
-        st.success("✅ Simulation terminée")
+        st.success(f"✅ Simulation terminée ({results.n_simulations} simulations)")
+
+        if early_stop:
+            title_ci = results.confidence_interval(1, 1) * 100
+            summary['title_ci_%'] = [
+                f"{title_ci.loc[team, 'low']:.1f} – {title_ci.loc[team, 'high']:.1f}"
+                for team in summary['team']
+            ]
 
         st.subheader("📊 Classement final simulé (moyenne)")
         st.dataframe(summary, use_container_width=True)
@@ -713,28 +882,34 @@ elif page == "🔴 Matchs en direct":
     st.header("🔴 Matchs en Direct")
     st.markdown("*Scores en temps réel*")
 
-    @st.cache_data(ttl=60)
-    def fetch_live_matches():
-        try:
-            data = client.get_live_matches()
-            return data.get("matches", [])
-        except Exception as e:
-            st.error(f"Erreur API : {e}")
-            return []
+    from src.live_engine import LiveFeed
 
-    live_matches = fetch_live_matches()
+    # Flux propre à la session : garde le dernier snapshot pour le diff
+    if 'live_feed' not in st.session_state:
+        st.session_state.live_feed = LiveFeed(client)
+    feed = st.session_state.live_feed
+    feed.prediction_matrix = prediction_matrix
 
-    if not live_matches:
-        st.info("⏳ Aucun match en cours actuellement")
-    else:
-        st.success(f"⚽ {len(live_matches)} match(s) en cours")
+    # Seul ce fragment est ré-exécuté : tic court, le flux décide s'il interroge l'API
+    @st.fragment(run_every=LIVE_PAGE_TICK)
+    def live_board():
+        update = feed.poll()
+
+        if not update.matches:
+            st.info("⏳ Aucun match en cours actuellement")
+            return
+
+        st.success(f"⚽ {len(update.matches)} match(s) en cours")
+        if update.finished:
+            st.caption(f"🏁 {len(update.finished)} match(s) terminé(s) depuis la dernière mise à jour")
 
-        for match in live_matches:
+        for match_id, match in update.matches.items():
             home = match["homeTeam"]["name"]
             away = match["awayTeam"]["name"]
-            score = match["score"]["fullTime"]
-            minute = match.get("minute", "—")
+            score = (match.get("score") or {}).get("fullTime") or {}
             status = match["status"]
+            live = update.probabilities.get(match_id, {})
+            minute = live.get("minute", "—")
 
             with st.container():
                 col1, col2, col3 = st.columns([3, 2, 3])
@@ -744,47 +919,33 @@ elif page == "🔴 Matchs en direct":
 
                 with col2:
                     st.markdown(
-                        f"## {score['home']} - {score['away']}"
+                        f"## {score.get('home') or 0} - {score.get('away') or 0}"
                     )
-                    st.caption(f"⏱ {minute}' • {status}")
+                    st.caption(f"⏱ {minute:.0f}' • {status}" if live else f"⏱ — • {status}")
 
                 with col3:
                     st.markdown(f"### ✈️ {away}")
 
-                # Prediction button
-                if st.button(f"🔮 Prédire le score final", key=f"live_{match['id']}"):
-                    home_stats = standings_df[standings_df["team"] == home]
-                    away_stats = standings_df[standings_df["team"] == away]
-
-                    if not home_stats.empty and not away_stats.empty:
-                        h = home_stats.iloc[0].to_dict()
-                        a = away_stats.iloc[0].to_dict()
-
-                        h["name"] = home
-                        a["name"] = away
-
-                        h["avg_goals_scored"] = h["goals_for"] / max(h["played"], 1)
-                        h["avg_goals_conceded"] = h["goals_against"] / max(h["played"], 1)
-                        a["avg_goals_scored"] = a["goals_for"] / max(a["played"], 1)
-                        a["avg_goals_conceded"] = a["goals_against"] / max(a["played"], 1)
-
-                        h["form_points"] = h["won"] * 3 + h["draw"]
-                        a["form_points"] = a["won"] * 3 + a["draw"]
-
-                        pred = MatchPredictor().predict_match(h, a)
+                if live:
+                    st.info(
+                        f"📊 **Probabilités en direct** — "
+                        f"{home} {live['home_win_probability']}% | "
+                        f"Nul {live['draw_probability']}% | "
+                        f"{away} {live['away_win_probability']}%"
+                    )
 
-                        st.info(
-                            f"📊 **Probabilités finales** — "
-                            f"{home} {pred['home_win_probability']}% | "
-                            f"Nul {pred['draw_probability']}% | "
-                            f"{away} {pred['away_win_probability']}%"
-                        )
-                        st.caption(f"🔮 Score prédit : {pred['predicted_score']}")
-                    else:
-                        st.warning("Stats indisponibles pour ce match")
+                pred = prediction_matrix.get(match["homeTeam"]["id"], match["awayTeam"]["id"])
+                if pred:
+                    st.caption(
+                        f"🔮 Avant-match : {pred['home_win_probability']}% | "
+                        f"{pred['draw_probability']}% | {pred['away_win_probability']}% • "
+                        f"score prédit {pred['predicted_score']}"
+                    )
 
                 st.markdown("---")
 
+    live_board()
+
 # Footer
 st.markdown("---")
 st.markdown("*Données fournies par football-data.org | Mis à jour toutes les 10 minutes*")
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""Train the match outcome model on the finished matches of the local store"""
+
+import argparse
+import logging
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.api_client import FootballDataClient
+from src.data_store import MatchStore
+from src.outcome_model import MODEL_PATH, OutcomeModel
+from config import COMPETITIONS, LOG_FORMAT, LOG_LEVEL
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the home/draw/away model and save it in models/")
+    parser.add_argument("--method", choices=["logistic", "gradient_boosting"], default="logistic",
+                        help="Classifier to calibrate")
+    parser.add_argument("--fetch", action="store_true",
+                        help="Download every competition's matches into the store first")
+    parser.add_argument("--output", default=str(MODEL_PATH), help="Model file (manifest written next to it)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=LOG_LEVEL, format=LOG_FORMAT)
+    store = MatchStore()
+
+    if args.fetch:
+        client = FootballDataClient()
+        for name, competition_id in COMPETITIONS.items():
+            try:
+                store.save_matches(client.get_competition_matches(competition_id))
+            except Exception as e:
+                logging.error(f"Could not fetch {name}: {e}")
+
+    history = [
+        store.competition_matches(competition_id, ['FINISHED'])
+        for competition_id in COMPETITIONS.values()
+    ]
+    try:
+        model = OutcomeModel.train([df for df in history if len(df)], method=args.method)
+    except ValueError as e:
+        logging.error(f"{e} (run with --fetch or start app/refresher.py first)")
+        sys.exit(1)
+
+    model.save(args.output)
+    for key, value in model.manifest.items():
+        if key != 'features':
+            print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark: orjson + schema flattening vs response.json() + comprehensions"""
+
+import json
+import random
+import time
+
+import pandas as pd
+
+from config import COMPETITIONS
+from src import ingestion
+from src.ingestion import match_columns
+
+N_TEAMS = 20
+REPEAT = 20
+
+
+def make_team(team_id):
+    return {
+        'id': team_id, 'name': f'Team {team_id} FC', 'shortName': f'Team {team_id}',
+        'tla': f'T{team_id:02d}', 'crest': f'https://crests.football-data.org/{team_id}.png'
+    }
+
+
+def make_matches(competition_id, rng):
+    """Season payload shaped like GET /competitions/{id}/matches"""
+    teams = [make_team(competition_id * 100 + i) for i in range(N_TEAMS)]
+    matches = []
+    for k, (home, away) in enumerate((h, a) for h in teams for a in teams if h is not a):
+        played = k < 250
+        matches.append({
+            'area': {'id': 2072, 'name': 'England', 'code': 'ENG', 'flag': 'https://crests.football-data.org/770.svg'},
+            'competition': {'id': competition_id, 'name': 'League', 'code': 'PL', 'type': 'LEAGUE', 'emblem': ''},
+            'season': {'id': 2287, 'startDate': '2024-08-16', 'endDate': '2025-05-25', 'currentMatchday': 26, 'winner': None},
+            'id': competition_id * 1000 + k,
+            'utcDate': f'2024-{8 + k // 100 % 5:02d}-{1 + k % 28:02d}T15:00:00Z',
+            'status': 'FINISHED' if played else 'TIMED',
+            'matchday': 1 + k // 10,
+            'stage': 'REGULAR_SEASON',
+            'group': None,
+            'lastUpdated': '2025-02-20T00:20:52Z',
+            'homeTeam': home,
+            'awayTeam': away,
+            'score': {
+                'winner': 'HOME_TEAM' if played else None,
+                'duration': 'REGULAR',
+                'fullTime': {'home': rng.randint(0, 4) if played else None, 'away': rng.randint(0, 4) if played else None},
+                'halfTime': {'home': None, 'away': None}
+            },
+            'odds': {'msg': 'Activate Odds-Package in User-Panel to retrieve odds.'},
+            'referees': [{'id': 11605, 'name': 'Referee', 'type': 'REFEREE', 'nationality': 'England'}]
+        })
+    return {'filters': {'season': '2024'}, 'resultSet': {'count': len(matches)}, 'matches': matches}
+
+
+def make_standings(competition_id, rng):
+    """Payload shaped like GET /competitions/{id}/standings"""
+    table = []
+    for position in range(1, N_TEAMS + 1):
+        won, draw, lost = rng.randint(0, 20), rng.randint(0, 10), rng.randint(0, 15)
+        goals_for, goals_against = rng.randint(10, 80), rng.randint(10, 80)
+        table.append({
+            'position': position, 'team': make_team(competition_id * 100 + position),
+            'playedGames': won + draw + lost, 'form': None, 'won': won, 'draw': draw, 'lost': lost,
+            'points': won * 3 + draw, 'goalsFor': goals_for, 'goalsAgainst': goals_against,
+            'goalDifference': goals_for - goals_against
+        })
+    return {'standings': [{'stage': 'REGULAR_SEASON', 'type': 'TOTAL', 'group': None, 'table': table}]}
+
+
+def legacy_matches(body):
+    """Today's path: response.json() + walking each match dict"""
+    return pd.DataFrame([{
+        'match_id': match['id'],
+        'date': match['utcDate'],
+        'status': match['status'],
+        'home_id': match['homeTeam']['id'],
+        'home': match['homeTeam']['name'],
+        'away_id': match['awayTeam']['id'],
+        'away': match['awayTeam']['name'],
+        'home_goals': match['score']['fullTime']['home'],
+        'away_goals': match['score']['fullTime']['away'],
+        'winner': match['score']['winner']
+    } for match in json.loads(body)['matches']])
+
+
+def fast_matches(body):
+    return pd.DataFrame(match_columns(body))
+
+
+def timeit(func, bodies):
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for body in bodies:
+            func(body)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+if __name__ == '__main__':
+    rng = random.Random(0)
+    competitions = list(COMPETITIONS.values())
+    matches = [json.dumps(make_matches(c, rng)).encode() for c in competitions]
+
+    print(f"{len(competitions)} competitions, {sum(len(b) for b in matches) / 1e6:.1f} MB of matches")
+    print(f"JSON decoder: {'orjson' if ingestion.orjson is not None else 'json (stdlib)'}\n")
+
+    # un classement (20 lignes) coûte surtout la construction du DataFrame :
+    # process_standings garde les dicts, seul le décodage orjson y gagne
+    before = timeit(legacy_matches, matches)
+    after = timeit(fast_matches, matches)
+    print(f"Matches    response.json() + dicts: {before:7.2f} ms | "
+          f"ingestion: {after:7.2f} ms | x{before / after:.1f}")
+
+    decode_before = timeit(json.loads, matches)
+    decode_after = timeit(ingestion.loads, matches)
+    print(f"\nDecode only  json: {decode_before:.2f} ms | {'orjson' if ingestion.orjson else 'json'}: {decode_after:.2f} ms")
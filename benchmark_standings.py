@@ -0,0 +1,61 @@
+"""Benchmark: incremental standings updates vs full rebuilds"""
+
+import json
+import random
+import time
+
+from benchmark_ingestion import make_standings
+from src.data_processor import FootballDataProcessor
+from src.ingestion import loads
+from src.standings_engine import StandingsTable
+
+REPEAT = 200
+MATCHES_PER_UPDATE = 10  # une journée
+
+
+def make_results(standings, rng, n):
+    teams = [row['team'] for row in standings['standings'][0]['table']]
+    results = []
+    for k in range(n):
+        home, away = rng.sample(teams, 2)
+        results.append({
+            'id': k, 'status': 'FINISHED', 'homeTeam': home, 'awayTeam': away,
+            'score': {'fullTime': {'home': rng.randint(0, 4), 'away': rng.randint(0, 4)}}
+        })
+    return results
+
+
+def timeit(func):
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+if __name__ == '__main__':
+    rng = random.Random(0)
+    standings = make_standings(2021, rng)
+    body = json.dumps(standings).encode()
+    results = make_results(standings, rng, MATCHES_PER_UPDATE)
+    table = StandingsTable(standings)
+
+    def rebuild():
+        # hors réseau : le re-téléchargement coûte en plus une requête (et du quota)
+        return FootballDataProcessor.process_standings(loads(body))
+
+    def incremental():
+        updated = table.copy()
+        updated.apply_matches(results)
+        return updated.to_dataframe()
+
+    def apply_only():
+        updated = table.copy()
+        updated.apply_matches(results)
+        return updated.ranking()
+
+    print(f"{len(table)} teams, {MATCHES_PER_UPDATE} finished matches per update\n")
+    print(f"Full rebuild (decode + process_standings): {timeit(rebuild):.3f} ms + 1 API request")
+    print(f"Incremental (apply + re-rank):             {timeit(apply_only):.3f} ms")
+    print(f"Incremental (apply + re-rank + DataFrame): {timeit(incremental):.3f} ms")
@@ -22,6 +22,52 @@ for directory in [DATA_DIR, RAW_DATA_DIR, PROCESSED_DATA_DIR, MODELS_DIR]:
 API_KEY = os.getenv("FOOTBALL_API_KEY", "")
 API_URL = os.getenv("FOOTBALL_API_URL", "https://api.football-data.org/v4")
 
+# Rate limit (free plan: 10 requests/minute), shared by every client and process
+API_REQUESTS_PER_MINUTE = 10
+API_RATE_LIMIT_STATE = RAW_DATA_DIR / "rate_limit.json"
+
+# HTTP session: connection pool and retries on 429/5xx
+API_POOL_SIZE = 10
+API_MAX_RETRIES = 3
+API_BACKOFF = 1.0  # seconds, doubled at each retry (plus jitter)
+API_MAX_BACKOFF = 60.0
+
+# Persistent API response cache
+API_CACHE_PATH = RAW_DATA_DIR / "api_cache.sqlite"
+API_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# (ttl, stale-while-revalidate) in seconds per endpoint pattern, first match wins
+API_CACHE_TTLS = {
+    "competitions/*/standings": (600, 86400),
+    "competitions/*/matches*": (600, 86400),
+    "teams/*/matches*": (600, 86400),
+    "teams/*": (86400, 7 * 86400),
+    # live matches: fresh for less than LIVE_POLL_INTERVAL and never served stale
+    "matches*": (25, 0),
+}
+API_CACHE_DEFAULT_TTL = (600, 3600)
+
+# Normalized match/standings store (indexed SQLite tables)
+STORE_PATH = PROCESSED_DATA_DIR / "football.sqlite"
+
+# Background refresher (app/refresher.py): when READ_FROM_STORE is set the
+# app only reads the local store that the refresher keeps up to date
+READ_FROM_STORE = os.getenv("FOOTBALL_READ_FROM_STORE", "false").lower() == "true"
+REFRESH_IDLE_INTERVAL = 900  # seconds
+REFRESH_LIVE_INTERVAL = 60  # seconds, around live matches
+
+# Batch season simulation (app/simulate_all.py): every competition is
+# re-simulated when its standings or remaining fixtures change
+BATCH_SIMULATIONS = 10000
+BATCH_INTERVAL = 1800  # seconds between checks for new results
+
+# Live page: poll every LIVE_POLL_INTERVAL seconds while at least
+# LIVE_POLL_RESERVE requests are left in the minute, slower otherwise
+LIVE_POLL_INTERVAL = 30
+LIVE_POLL_MAX_INTERVAL = 120
+LIVE_POLL_RESERVE = 3
+LIVE_PAGE_TICK = 5  # seconds between live page reruns, LiveFeed.poll decides when to fetch
+
 # Saison en cours
 CURRENT_SEASON = "2024-2025"
 
@@ -36,9 +82,26 @@ COMPETITIONS = {
     "Europa League": 2146
 }
 
+# Tie-break rules per competition, applied in order after points
+# (h2h_* : matches between the teams level on points)
+DEFAULT_TIE_BREAKERS = ['points', 'goal_difference', 'goals_for']
+TIE_BREAKERS = {
+    2014: ['points', 'h2h_points', 'h2h_goal_difference', 'goal_difference', 'goals_for'],  # La Liga
+    2019: ['points', 'h2h_points', 'h2h_goal_difference', 'goal_difference', 'goals_for'],  # Serie A
+    2001: ['points', 'goal_difference', 'goals_for', 'won'],  # Champions League
+    2146: ['points', 'goal_difference', 'goals_for', 'won'],  # Europa League
+}
+
 # Prediction parameters
 RECENT_MATCHES = 5  # Nombre de matchs récents pour analyser la forme
+FORM_GOALS_HALF_LIFE = 6  # Demi-vie (en matchs) des moyennes de buts pondérées
+ELO_INITIAL = 1500  # Note Elo d'une équipe sans historique
+ELO_K = 20  # Points Elo échangés par match (avant facteur d'écart de buts)
+ELO_HOME_ADVANTAGE = 60  # Bonus Elo de l'équipe à domicile
+ELO_STRENGTH_WEIGHT = 0.3  # Part de l'Elo dans la force (le reste : points, diff. de buts, forme)
 MIN_MATCHES_FOR_PREDICTION = 10  # Minimum de matchs pour prédire
+GOAL_MODEL_TIME_DECAY = 0.0019  # Dixon-Coles : poids exp(-xi * jours) des matchs anciens
+GOAL_MODEL_MAX_GOALS = 10  # Scores 0..10 dans les matrices de score
 
 # Logging
 LOG_LEVEL = "INFO"
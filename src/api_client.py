@@ -2,66 +2,299 @@
 
 import requests
 import logging
-from typing import Dict
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlencode
 import time
 
-from config import API_KEY, API_URL
+from requests.adapters import HTTPAdapter
+
+from config import (
+    API_BACKOFF, API_KEY, API_MAX_BACKOFF, API_MAX_RETRIES, API_POOL_SIZE, API_URL, READ_FROM_STORE
+)
+from src.http_cache import CacheEntry, ResponseCache
+from src.ingestion import dumps, loads
+from src.rate_limiter import TokenBucket, get_shared_limiter
 
 logger = logging.getLogger(__name__)
 
+# Statuts pour lesquels la requête est retentée
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
 
 class FootballDataClient:
     """Client for Football Data API"""
-    
-    def __init__(self):
-        """Initialize the API client"""
-        self.base_url = API_URL
+
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        use_cache: bool = True,
+        base_url: Optional[str] = None,
+        pool_size: int = API_POOL_SIZE,
+        max_retries: int = API_MAX_RETRIES,
+        limiter: Optional[TokenBucket] = None,
+        offline: bool = READ_FROM_STORE
+    ):
+        """
+        Initialize the API client
+
+        Args:
+            cache: Response cache (defaults to the on-disk cache in config)
+            use_cache: Set to False to always hit the network
+            base_url: API root, e.g. a local stub server (defaults to config)
+            pool_size: Keep-alive connections kept open by the session
+            max_retries: Retries on 429/5xx and connection errors
+            limiter: Rate limiter (defaults to the one shared by all clients)
+            offline: Only read the local store kept up to date by the
+                refresher (app/refresher.py), never the network
+        """
+        self.base_url = base_url or API_URL
         self.headers = {
             "X-Auth-Token": API_KEY
         }
-        self.last_request_time = 0
-        
+        self.max_retries = max_retries
+        self.pool_size = pool_size
+
+        # Session partagée : connexions TCP/TLS réutilisées entre requêtes
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(self.headers)
+        self.limiter = limiter or get_shared_limiter()
+        self.cache = (cache or ResponseCache()) if use_cache or offline else None
+        self.offline = offline
+        self._revalidating = set()
+        self._lock = threading.Lock()
+
     def _rate_limit(self) -> None:
         """Implement rate limiting"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < 6:
-            time.sleep(6 - elapsed)
-        self.last_request_time = time.time()
-    
-    def _make_request(self, endpoint: str) -> Dict:
-        """Make API request with error handling"""
-        self._rate_limit()
-        
+        self.limiter.acquire()
+
+    @staticmethod
+    def _retry_delay(response: Optional[requests.Response], attempt: int) -> float:
+        """Wait before retry: server hints first, else exponential backoff with jitter"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), API_MAX_BACKOFF)
+                except ValueError:
+                    try:
+                        wait = parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)
+                        return min(max(wait.total_seconds(), 0.0), API_MAX_BACKOFF)
+                    except (TypeError, ValueError):
+                        pass
+
+            # quota de la minute épuisé : attendre la remise à zéro du compteur
+            if response.headers.get("X-Requests-Available-Minute") == "0":
+                reset = response.headers.get("X-RequestCounter-Reset")
+                if reset and reset.isdigit():
+                    return min(float(reset), API_MAX_BACKOFF)
+
+        backoff = API_BACKOFF * 2 ** attempt
+        return min(backoff + random.uniform(0, backoff), API_MAX_BACKOFF)
+
+    def _get(self, url: str, headers: Dict) -> requests.Response:
+        """GET through the pooled session, retrying on 429/5xx and connection errors"""
+        for attempt in range(self.max_retries + 1):
+            self._rate_limit()
+            response = None
+            try:
+                response = self.session.get(url, headers=headers, timeout=10)
+                self.limiter.update_from_headers(response.headers)
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == self.max_retries:
+                    raise
+
+            if attempt == self.max_retries:
+                return response
+
+            delay = self._retry_delay(response, attempt)
+            status = response.status_code if response is not None else "connection error"
+            logger.warning(f"Retrying {url} in {delay:.1f}s ({status})")
+            time.sleep(delay)
+
+    def _fetch(self, endpoint: str, entry: Optional[CacheEntry] = None, store: bool = True) -> Dict:
+        """
+        Hit the API and store the response in the cache
+
+        With a cached entry carrying validators the request is conditional
+        and a 304 reuses the cached body.
+        """
         url = f"{self.base_url}/{endpoint}"
-        
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self._get(url, headers)
             response.raise_for_status()
-            logger.info(f"Successfully fetched data from {endpoint}")
-            return response.json()
         except requests.exceptions.RequestException as e:
             logger.error(f"API request failed: {e}")
             raise
-    
+
+        if response.status_code == 304 and entry is not None:
+            logger.info(f"Not modified: {endpoint}")
+            self.cache.touch(endpoint)
+            return entry.json()
+
+        logger.info(f"Successfully fetched data from {endpoint}")
+
+        if self.cache is not None and store:
+            self.cache.set(
+                endpoint,
+                response.content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified")
+            )
+        return loads(response.content)
+
+    def _revalidate(self, entry: CacheEntry, refresh: Callable[[CacheEntry], Dict]) -> None:
+        """Refresh a stale cache entry in the background"""
+        endpoint = entry.endpoint
+        try:
+            refresh(entry)
+        except requests.exceptions.RequestException:
+            pass
+        finally:
+            with self._lock:
+                self._revalidating.discard(endpoint)
+
+    def _make_request(
+        self,
+        endpoint: str,
+        refresh: Optional[Callable[[CacheEntry], Dict]] = None
+    ) -> Dict:
+        """
+        Make API request with error handling, served from the cache when possible
+
+        Args:
+            endpoint: API endpoint
+            refresh: How to update an expired cache entry (defaults to a
+                conditional GET of the endpoint)
+        """
+        if self.cache is None:
+            return self._fetch(endpoint)
+
+        entry = self.cache.get(endpoint)
+
+        if self.offline:
+            if entry is None:
+                raise LookupError(f"{endpoint} is not in the local store yet (is the refresher running?)")
+            return entry.json()
+
+        refresh = refresh or (lambda cached: self._fetch(endpoint, cached))
+
+        if entry is not None and self.cache.is_fresh(entry):
+            return entry.json()
+
+        if entry is not None and self.cache.is_usable_stale(entry):
+            # stale-while-revalidate : réponse immédiate, rafraîchie en arrière-plan
+            with self._lock:
+                start = endpoint not in self._revalidating
+                self._revalidating.add(endpoint)
+            if start:
+                threading.Thread(target=self._revalidate, args=(entry, refresh), daemon=True).start()
+            return entry.json()
+
+        try:
+            return refresh(entry) if entry is not None else self._fetch(endpoint)
+        except requests.exceptions.RequestException:
+            if entry is None:
+                raise
+            logger.warning(f"Serving expired cache for {endpoint}")
+            return entry.json()
+
     def get_competition_standings(self, competition_id: int) -> Dict:
         """Get current standings for a competition"""
         endpoint = f"competitions/{competition_id}/standings"
         return self._make_request(endpoint)
-    
+
     def get_team_info(self, team_id: int) -> Dict:
         """Get information about a specific team"""
         endpoint = f"teams/{team_id}"
         return self._make_request(endpoint)
-    
+
     def get_team_matches(self, team_id: int, status: str = "FINISHED") -> Dict:
         """Get matches for a team"""
         endpoint = f"teams/{team_id}/matches?status={status}"
         return self._make_request(endpoint)
-    
-    def get_competition_matches(self, competition_id: int) -> Dict:
-        """Get all matches for a competition"""
+
+    def get_competition_matches(
+        self,
+        competition_id: int,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None
+    ) -> Dict:
+        """
+        Get all matches for a competition, or those between two dates (YYYY-MM-DD)
+
+        Once the season is cached, refreshes only download the matches of a
+        date window around today and merge them into the stored season.
+        """
         endpoint = f"competitions/{competition_id}/matches"
-        return self._make_request(endpoint)
+        params = {key: value for key, value in (('dateFrom', date_from), ('dateTo', date_to)) if value}
+        if params:
+            return self._make_request(f"{endpoint}?{urlencode(params)}")
+
+        return self._make_request(
+            endpoint, refresh=lambda entry: self._refresh_competition_matches(competition_id, entry)
+        )
+
+    def _refresh_competition_matches(
+        self,
+        competition_id: int,
+        entry: CacheEntry,
+        days_back: int = 3,
+        days_ahead: int = 14
+    ) -> Dict:
+        """Update a cached season with a conditional GET, else a date-windowed delta"""
+        endpoint = f"competitions/{competition_id}/matches"
+        today = datetime.now(timezone.utc).date()
+        fetched_on = datetime.fromtimestamp(entry.fetched_at, timezone.utc).date()
+
+        # validateurs HTTP disponibles, ou premier rafraîchissement du jour : saison complète
+        if entry.etag or entry.last_modified or fetched_on < today:
+            return self._fetch(endpoint, entry)
+
+        date_from = (today - timedelta(days=days_back)).isoformat()
+        date_to = (today + timedelta(days=days_ahead)).isoformat()
+        delta = self._fetch(f"{endpoint}?dateFrom={date_from}&dateTo={date_to}", store=False)
+
+        season = entry.json()
+        changed = self.merge_matches(season, delta.get('matches', []))
+        logger.info(f"{changed} match(es) changed in {endpoint} since last refresh")
+
+        self.cache.set(endpoint, dumps(season))
+        return season
+
+    @staticmethod
+    def merge_matches(season: Dict, matches: List[Dict]) -> int:
+        """Merge updated matches into a season payload by match id, return the number changed"""
+        by_id = {match['id']: i for i, match in enumerate(season.get('matches', []))}
+        changed = 0
+
+        for match in matches:
+            i = by_id.get(match['id'])
+            if i is None:
+                season.setdefault('matches', []).append(match)
+                changed += 1
+            elif season['matches'][i] != match:
+                season['matches'][i] = match
+                changed += 1
+
+        if changed:
+            season['matches'].sort(key=lambda m: m.get('utcDate', ''))
+        return changed
+
     def get_live_matches(self) -> Dict:
         """Get live matches"""
         endpoint = "matches?status=LIVE"
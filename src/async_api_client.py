@@ -0,0 +1,99 @@
+"""Asyncio API client for Football Data"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from config import COMPETITIONS
+from src.api_client import FootballDataClient
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFootballDataClient:
+    """
+    asyncio counterpart of FootballDataClient
+
+    Requests run concurrently on the pooled session of a FootballDataClient
+    (blocking I/O is offloaded to a thread pool the size of the connection
+    pool), so they share its response cache and rate limiter. Identical
+    requests already in flight are coalesced into one API call.
+    """
+
+    def __init__(self, client: Optional[FootballDataClient] = None, **client_kwargs):
+        """
+        Args:
+            client: Synchronous client to wrap (created from client_kwargs otherwise)
+        """
+        self.client = client or FootballDataClient(**client_kwargs)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.client.pool_size,
+            thread_name_prefix="football-api"
+        )
+        self._in_flight: Dict[tuple, asyncio.Future] = {}
+
+    async def _call(self, method: Callable, *args) -> Dict:
+        """Run a client method in the pool, sharing the call with identical in-flight requests"""
+        key = (method.__name__, args)
+        future = self._in_flight.get(key)
+
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, method, *args)
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # shield : annuler un appelant n'annule pas la requête partagée
+        return await asyncio.shield(future)
+
+    async def get_competition_standings(self, competition_id: int) -> Dict:
+        """Get current standings for a competition"""
+        return await self._call(self.client.get_competition_standings, competition_id)
+
+    async def get_team_info(self, team_id: int) -> Dict:
+        """Get information about a specific team"""
+        return await self._call(self.client.get_team_info, team_id)
+
+    async def get_team_matches(self, team_id: int, status: str = "FINISHED") -> Dict:
+        """Get matches for a team"""
+        return await self._call(self.client.get_team_matches, team_id, status)
+
+    async def get_competition_matches(
+        self,
+        competition_id: int,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None
+    ) -> Dict:
+        """Get all matches for a competition, or those between two dates"""
+        return await self._call(self.client.get_competition_matches, competition_id, date_from, date_to)
+
+    async def get_live_matches(self) -> Dict:
+        """Get live matches"""
+        return await self._call(self.client.get_live_matches)
+
+    async def _fetch_all(self, fetch: Callable, competitions: Dict[str, int]) -> Dict[str, Dict]:
+        names = list(competitions)
+        results = await asyncio.gather(
+            *(fetch(competitions[name]) for name in names), return_exceptions=True
+        )
+
+        fetched = {}
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to fetch {name}: {result}")
+            else:
+                fetched[name] = result
+        return fetched
+
+    async def fetch_all_standings(self, competitions: Dict[str, int] = COMPETITIONS) -> Dict[str, Dict]:
+        """Standings of every competition, fetched concurrently (failures are logged and skipped)"""
+        return await self._fetch_all(self.get_competition_standings, competitions)
+
+    async def fetch_all_matches(self, competitions: Dict[str, int] = COMPETITIONS) -> Dict[str, Dict]:
+        """Season matches of every competition, fetched concurrently"""
+        return await self._fetch_all(self.get_competition_matches, competitions)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self.client.session.close()
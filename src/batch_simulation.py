@@ -0,0 +1,198 @@
+"""Season simulations of every competition, run in a worker pool and stored"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import BATCH_SIMULATIONS, COMPETITIONS
+from src.api_client import FootballDataClient
+from src.data_processor import FootballDataProcessor
+from src.data_store import MatchStore
+from src.form_engine import FormEngine
+from src.outcome_model import OutcomeModel
+from src.prediction_matrix import PredictionMatrix
+from src.rating_engine import EloRatings
+from src.season_similator import SeasonSimulator, SeasonState, remaining_fixtures
+
+logger = logging.getLogger(__name__)
+
+def _simulate(competition_id, standings_df, prediction_matrix, remaining, n_simulations, seed):
+    """Worker: simulate one competition, return its summary and its SeasonState"""
+    simulator = SeasonSimulator(standings_df, prediction_matrix)
+    state = simulator.start_season(remaining, n_simulations=n_simulations, seed=seed)
+    return competition_id, simulator.summarize(state.result()), state
+
+
+class BatchSimulator:
+    """
+    Title/top-4/relegation odds of every competition, precomputed
+
+    Standings and matches are fetched in the main process (one rate
+    limiter), then each league is simulated as its own job in a process
+    pool, so leagues of different sizes never share arrays. A league is
+    only re-simulated when its standings or remaining fixtures changed
+    since its last stored run; form and Elo ratings are kept across runs
+    and only fed the new results.
+
+    The sampled fixtures of each league are kept too (SeasonState): when
+    the only change is that some fixtures were played, their columns are
+    replaced by the actual scores and the league is re-ranked in the main
+    process instead of simulated again. The other fixtures keep their
+    draws, so the odds move by the effect of the new results alone.
+    """
+
+    def __init__(
+        self,
+        client: Optional[FootballDataClient] = None,
+        store: Optional[MatchStore] = None,
+        competitions: Optional[Dict[str, int]] = None,
+        n_simulations: int = BATCH_SIMULATIONS,
+        workers: Optional[int] = None
+    ):
+        self.client = client or FootballDataClient()
+        self.store = store or MatchStore()
+        self.competitions = competitions or COMPETITIONS
+        self.n_simulations = n_simulations
+        self.workers = workers
+        self.outcome_model = OutcomeModel.load()
+        self.engines: Dict[int, tuple] = {}
+        self.states: Dict[int, SeasonState] = {}
+
+    def _advance(
+        self,
+        competition_id: int,
+        matches: Dict,
+        standings_df: pd.DataFrame,
+        remaining: List[Dict]
+    ) -> Optional[SeasonState]:
+        """
+        Apply the new results to the kept SeasonState of a competition
+
+        Returns:
+            The updated state, or None (state dropped) when there is none or
+            it no longer matches the standings and fixtures, e.g. after a
+            postponement or a points deduction
+        """
+        state = self.states.pop(competition_id, None)
+        if state is None:
+            return None
+
+        applied = state.apply_results(matches.get('matches', []))
+        pending = state.simulator._fixtures(remaining)[0]
+        table = standings_df.set_index('team').reindex(state.teams)
+        current = state.current_table()
+
+        if (
+            set(state.pending()) != set(pending)
+            or table[['points', 'goal_difference']].isna().any(axis=None)
+            or not np.array_equal(table['points'].to_numpy(dtype=np.int64), current['points'])
+            or not np.array_equal(
+                table['goal_difference'].to_numpy(dtype=np.int64), current['goal_difference']
+            )
+        ):
+            logger.info(f"Competition {competition_id} changed beyond new results, full simulation")
+            return None
+
+        logger.info(f"Competition {competition_id}: {applied} result(s) applied to the kept simulations")
+        self.states[competition_id] = state
+        return state
+
+    def _prepare(self, competition_id: int, force: bool = False) -> Optional[tuple]:
+        """
+        Inputs of one competition's simulation, or None when nothing changed
+
+        The tuple ends with the competition's SeasonState when it could be
+        updated incrementally, in which case no prediction matrix is built.
+        """
+        standings = self.client.get_competition_standings(competition_id)
+        matches = self.client.get_competition_matches(competition_id)
+        self.store.save_matches(matches)
+
+        remaining = remaining_fixtures(matches.get('matches', []))
+        input_key = f"{FootballDataProcessor.standings_hash(standings)}:{len(remaining)}"
+        latest = self.store.latest_simulation(competition_id)
+        if not force and len(latest) and latest['input_key'].iloc[0] == input_key:
+            logger.info(f"Competition {competition_id} unchanged, simulation kept")
+            return None
+
+        form, ratings = self.engines.setdefault(competition_id, (FormEngine(), EloRatings()))
+        form.update(matches)
+        ratings.update(matches)
+
+        standings_df = FootballDataProcessor.process_standings(standings)
+        state = None if force else self._advance(competition_id, matches, standings_df, remaining)
+        if state is not None:
+            return standings_df, None, remaining, input_key, state
+
+        if len(form):
+            features = FootballDataProcessor.build_team_features(
+                standings, form.to_dataframe(), ratings.to_dataframe()
+            )
+        else:
+            features = FootballDataProcessor.build_team_features(standings)
+
+        prediction_matrix = PredictionMatrix(features, key=input_key, outcome_model=self.outcome_model)
+        return standings_df, prediction_matrix, remaining, input_key, None
+
+    def run(self, force: bool = False, seed: Optional[int] = None) -> Dict[int, pd.DataFrame]:
+        """
+        Simulate every competition whose inputs changed and store the results
+
+        Args:
+            force: Simulate every competition even if unchanged
+            seed: Base seed; each competition gets its own child stream
+
+        Returns:
+            Summaries of the competitions simulated, by competition id
+        """
+        jobs: List[tuple] = []
+        summaries = {}
+        seeds = np.random.SeedSequence(seed).spawn(len(self.competitions))
+
+        for (name, competition_id), child in zip(self.competitions.items(), seeds):
+            try:
+                prepared = self._prepare(competition_id, force)
+            except Exception as e:
+                logger.error(f"Could not prepare {name}: {e}")
+                continue
+            if prepared is None:
+                continue
+
+            state = prepared[4]
+            if state is not None:
+                # mise à jour incrémentale : reclassement seul, sans passer par le pool
+                summary = SeasonSimulator.summarize(state.result())
+                self.store.save_simulation(competition_id, summary, state.n_simulations, prepared[3])
+                summaries[competition_id] = summary
+            else:
+                jobs.append((competition_id, child, prepared))
+
+        if not jobs:
+            return summaries
+
+        keys = {competition_id: prepared[3] for competition_id, _, prepared in jobs}
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                executor.submit(
+                    _simulate, competition_id, standings_df, prediction_matrix, remaining,
+                    self.n_simulations, child
+                )
+                for competition_id, child, (standings_df, prediction_matrix, remaining, _, _) in jobs
+            ]
+
+            for future in as_completed(futures):
+                try:
+                    competition_id, summary, state = future.result()
+                except Exception as e:
+                    logger.error(f"Simulation failed: {e}")
+                    continue
+
+                self.states[competition_id] = state
+                self.store.save_simulation(competition_id, summary, state.n_simulations, keys[competition_id])
+                summaries[competition_id] = summary
+                logger.info(f"Competition {competition_id}: {state.n_simulations} simulations stored")
+
+        return summaries
@@ -1,12 +1,54 @@
 """Data processing for football statistics"""
 
+import numpy as np
 import pandas as pd
+import hashlib
+import json
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple, Union
+
+from config import ELO_INITIAL
+from src.ingestion import match_columns, standings_columns
+from src.ml_predictor import MatchPredictor, _round
 
 logger = logging.getLogger(__name__)
 
 
+class TeamFeatureTable:
+    """Prediction features per team, indexed by team name and team id"""
+
+    def __init__(self, features: pd.DataFrame):
+        self.features = features
+        self._by_name = features.to_dict('index')
+        self._name_by_id = (
+            dict(zip(features['team_id'], features.index)) if 'team_id' in features else {}
+        )
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def __contains__(self, team: Union[str, int]) -> bool:
+        return team in self._by_name or team in self._name_by_id
+
+    def name(self, team: Union[str, int]) -> Optional[str]:
+        """Team name from a name or a team id"""
+        name = self._name_by_id.get(team, team)
+        return name if name in self._by_name else None
+
+    def get(self, team: Union[str, int]) -> Optional[Dict]:
+        """Features of a team (by name or id), ready for predict_match"""
+        features = self._by_name.get(self.name(team))
+        return dict(features) if features is not None else None
+
+    def rows(self, teams: List[Union[str, int]]) -> pd.DataFrame:
+        """Features of several teams, one row per entry (for predict_matches)"""
+        names = [self._name_by_id.get(team, team) for team in teams]
+        return self.features.loc[names].reset_index(drop=True)
+
+    def pair(self, home: Union[str, int], away: Union[str, int]) -> Tuple[Optional[Dict], Optional[Dict]]:
+        return self.get(home), self.get(away)
+
+
 class FootballDataProcessor:
     """Process football data for analysis"""
     
@@ -29,89 +71,240 @@ class FootballDataProcessor:
         } for team in table])
         
         return df
+
+    @staticmethod
+    def standings_hash(standings_data: Union[Dict, pd.DataFrame]) -> str:
+        """Content hash of a standings payload (or DataFrame), used as cache key"""
+        if isinstance(standings_data, pd.DataFrame):
+            content = pd.util.hash_pandas_object(standings_data, index=False).to_numpy().tobytes()
+        else:
+            content = json.dumps(standings_data['standings'], sort_keys=True).encode()
+
+        return hashlib.sha256(content).hexdigest()
+
+    @staticmethod
+    def build_team_features(
+        standings_data: Union[Dict, pd.DataFrame],
+        form: Optional[pd.DataFrame] = None,
+        ratings: Optional[pd.DataFrame] = None
+    ) -> TeamFeatureTable:
+        """
+        Precompute prediction features for every team of a standings payload
+
+        Args:
+            standings_data: Standings payload or DataFrame
+            form: FormEngine.to_dataframe() of the competition; without it
+                form falls back to the season's points
+            ratings: EloRatings.to_dataframe() of the competition; with it
+                the Elo rating (elo column) is blended into strength
+        """
+        if isinstance(standings_data, pd.DataFrame):
+            df = standings_data.copy()
+        else:
+            df = pd.DataFrame(standings_columns(standings_data))
+        df['name'] = df['team']
+
+        played = df['played'].clip(lower=1)
+        df['avg_goals_scored'] = df['goals_for'] / played
+        df['avg_goals_conceded'] = df['goals_against'] / played
+
+        if form is not None and 'team_id' in df:
+            # Forme réelle : points des derniers matchs (0 sans match joué)
+            recent = form.reindex(df['team_id'].to_numpy())
+            df['form_points'] = recent['points'].fillna(0).to_numpy(dtype=int)
+            df['form_string'] = recent['form_string'].fillna('').to_numpy()
+            for column in ('home_points', 'away_points', 'goal_rate_for', 'goal_rate_against'):
+                df[f'form_{column}'] = recent[column].to_numpy()
+        else:
+            # Forme simplifiée (points de la saison)
+            df['form_points'] = df['won'] * 3 + df['draw']
+
+        if ratings is not None and 'team_id' in df:
+            df['elo'] = ratings['rating'].reindex(df['team_id'].to_numpy()).fillna(ELO_INITIAL).to_numpy()
+        df['strength'] = MatchPredictor.calculate_team_strengths(
+            df['points'], df['goal_difference'], df['form_points'], df['elo'] if 'elo' in df else None,
+            df['played']
+        )
+
+        return TeamFeatureTable(df.set_index('team', drop=False))
     
     @staticmethod
-    def calculate_form(matches: List[Dict], last_n: int = 5) -> Dict:
-        """Calculate team form from last N matches"""
-        if not matches or len(matches) == 0:
-            return {
-                'form_string': 'N/A',
-                'wins': 0,
-                'draws': 0,
-                'losses': 0,
-                'goals_scored': 0,
-                'goals_conceded': 0,
-                'points': 0
-            }
-        
-        recent_matches = matches[:last_n]
-        
-        wins = draws = losses = 0
-        goals_scored = goals_conceded = 0
-        form_letters = []
-        
-        for match in recent_matches:
-            home_score = match['score']['fullTime']['home']
-            away_score = match['score']['fullTime']['away']
-            
-            # Determine if team is home or away
-            is_home = match['homeTeam']['id'] == match.get('team_id')
-            
-            if is_home:
-                team_score = home_score
-                opponent_score = away_score
-            else:
-                team_score = away_score
-                opponent_score = home_score
-            
-            goals_scored += team_score if team_score else 0
-            goals_conceded += opponent_score if opponent_score else 0
-            
-            if team_score > opponent_score:
-                wins += 1
-                form_letters.append('W')
-            elif team_score < opponent_score:
-                losses += 1
-                form_letters.append('L')
-            else:
-                draws += 1
-                form_letters.append('D')
-        
-        return {
-            'form_string': ''.join(form_letters),
-            'wins': wins,
-            'draws': draws,
-            'losses': losses,
+    def flatten_matches(matches: List[Dict]) -> pd.DataFrame:
+        """
+        Flatten API match dicts into one row per team and match
+
+        The first len(matches) rows are the home teams' side of each match,
+        the next len(matches) the away teams' side. Goals are NaN and result
+        is empty for matches without a score.
+        """
+        columns = match_columns(matches)
+
+        def sides(home: str, away: str) -> np.ndarray:
+            return np.concatenate([columns[home], columns[away]])
+
+        df = pd.DataFrame({
+            'match_id': np.tile(columns['match_id'], 2),
+            'date': np.tile(columns['date'], 2),
+            'status': np.tile(columns['status'], 2),
+            'team_id': sides('home_id', 'away_id'),
+            'team': sides('home', 'away'),
+            'opponent_id': sides('away_id', 'home_id'),
+            'opponent': sides('away', 'home'),
+            'venue': np.repeat(['HOME', 'AWAY'], len(matches)),
+            'goals_for': sides('home_goals', 'away_goals'),
+            'goals_against': sides('away_goals', 'home_goals')
+        })
+
+        diff = np.sign(df['goals_for'].to_numpy() - df['goals_against'].to_numpy())
+        df['result'] = np.select([diff > 0, diff == 0, diff < 0], ['W', 'D', 'L'], default='')
+        df['points'] = np.select([diff > 0, diff == 0], [3, 1], default=0)
+
+        return df
+
+    @staticmethod
+    def _side(matches: List[Dict], df: pd.DataFrame, is_home: np.ndarray) -> pd.DataFrame:
+        """Rows of one team's side of each match (home side where is_home)"""
+        return df.iloc[np.arange(len(matches)) + np.where(is_home, 0, len(matches))]
+
+    @staticmethod
+    def _group_by_team(df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray, pd.Index]:
+        """Rows sorted by team (stable), with their team codes and the team ids"""
+        codes, teams = pd.factorize(df['team_id'])
+        # équipes encore inconnues (phases finales) : code -1, écartées
+        order = np.argsort(codes, kind='stable')
+        order = order[codes[order] >= 0]
+        return df.iloc[order], codes[order], pd.Index(teams, name='team_id')
+
+    @staticmethod
+    def calculate_forms(matches: Union[List[Dict], pd.DataFrame], last_n: int = 5) -> pd.DataFrame:
+        """
+        Form of every team over its last N played matches, in one pass
+
+        Args:
+            matches: API match dicts or the output of flatten_matches
+            last_n: Number of recent matches
+
+        Returns:
+            DataFrame indexed by team_id, same columns as calculate_form
+            (form_string lists the most recent match first)
+        """
+        df = matches if isinstance(matches, pd.DataFrame) else FootballDataProcessor.flatten_matches(matches)
+        played = df[df['result'] != '']
+
+        # plus récents d'abord, ordre d'origine conservé à date égale
+        dates = played['date'].fillna('').to_numpy(dtype=str)[::-1]
+        played = played.iloc[len(dates) - 1 - np.argsort(dates, kind='stable')[::-1]]
+
+        played, codes, teams = FootballDataProcessor._group_by_team(played)
+        starts = np.searchsorted(codes, np.arange(len(teams)))
+        recent = np.arange(len(codes)) - starts[codes] < last_n
+        played, codes = played[recent], codes[recent]
+
+        n = len(teams)
+        results = played['result'].to_numpy()
+        starts = np.searchsorted(codes, np.arange(n))
+
+        def count(values):
+            return np.bincount(codes, values, n).astype(int)
+
+        return pd.DataFrame({
+            'team': played['team'].to_numpy()[starts] if n else [],
+            'form_string': [''.join(letters) for letters in np.split(results, starts[1:])] if n else [],
+            'wins': count(results == 'W'),
+            'draws': count(results == 'D'),
+            'losses': count(results == 'L'),
+            'goals_scored': count(played['goals_for']),
+            'goals_conceded': count(played['goals_against']),
+            'points': count(played['points'])
+        }, index=teams)
+
+    @staticmethod
+    def calculate_competition_stats(matches: Union[List[Dict], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Statistics of every team of a match list, in one pass
+
+        Returns:
+            DataFrame indexed by team_id, same columns as calculate_team_stats
+        """
+        df = matches if isinstance(matches, pd.DataFrame) else FootballDataProcessor.flatten_matches(matches)
+        df, codes, teams = FootballDataProcessor._group_by_team(df)
+
+        n = len(teams)
+        venues = df['venue'].to_numpy()
+
+        def count(values):
+            return np.bincount(codes, values, n).astype(int)
+
+        total = np.bincount(codes, minlength=n)
+        goals_scored = count(df['goals_for'].fillna(0))
+        goals_conceded = count(df['goals_against'].fillna(0))
+
+        return pd.DataFrame({
+            'team': df['team'].to_numpy()[np.searchsorted(codes, np.arange(n))],
+            'total_matches': total,
+            'home_matches': count(venues == 'HOME'),
+            'away_matches': count(venues == 'AWAY'),
             'goals_scored': goals_scored,
             'goals_conceded': goals_conceded,
-            'points': wins * 3 + draws
+            'avg_goals_scored': _round(goals_scored / total, 2),
+            'avg_goals_conceded': _round(goals_conceded / total, 2)
+        }, index=teams)
+
+    @staticmethod
+    def calculate_form(matches: List[Dict], last_n: int = 5, team_id: Optional[int] = None) -> Dict:
+        """
+        Calculate team form from last N played matches
+
+        The team is team_id, or else the 'team_id' set on each match.
+        Matches without a score yet are ignored.
+        """
+        empty = {
+            'form_string': 'N/A',
+            'wins': 0,
+            'draws': 0,
+            'losses': 0,
+            'goals_scored': 0,
+            'goals_conceded': 0,
+            'points': 0
         }
-    
+        if not matches:
+            return empty
+
+        df = FootballDataProcessor.flatten_matches(matches)
+        teams = [team_id if team_id is not None else match.get('team_id') for match in matches]
+        is_home = df['team_id'].iloc[:len(matches)].to_numpy() == np.array(teams, dtype=object)
+        side = FootballDataProcessor._side(matches, df, is_home).assign(team_id=0)
+
+        form = FootballDataProcessor.calculate_forms(side, last_n)
+        if form.empty:
+            return empty
+
+        return form[list(empty)].to_dict('records')[0]
+
     @staticmethod
-    def calculate_team_stats(team_matches: List[Dict]) -> Dict:
-        """Calculate comprehensive team statistics"""
+    def calculate_team_stats(team_matches: List[Dict], team_id: Optional[int] = None) -> Dict:
+        """
+        Calculate comprehensive team statistics
+
+        The team is team_id, or else given by the 'venue' (HOME/AWAY) set
+        on each match.
+        """
         if not team_matches:
             return {}
-        
-        total_matches = len(team_matches)
-        home_matches = [m for m in team_matches if m.get('venue') == 'HOME']
-        away_matches = [m for m in team_matches if m.get('venue') == 'AWAY']
-        
-        # Overall stats
-        total_goals_scored = sum(m['score']['fullTime']['home'] if m.get('venue') == 'HOME' 
-                                else m['score']['fullTime']['away'] 
-                                for m in team_matches if m['score']['fullTime']['home'] is not None)
-        
-        total_goals_conceded = sum(m['score']['fullTime']['away'] if m.get('venue') == 'HOME' 
-                                  else m['score']['fullTime']['home'] 
-                                  for m in team_matches if m['score']['fullTime']['home'] is not None)
-        
-        return {
-            'total_matches': total_matches,
-            'home_matches': len(home_matches),
-            'away_matches': len(away_matches),
-            'goals_scored': total_goals_scored,
-            'goals_conceded': total_goals_conceded,
-            'avg_goals_scored': round(total_goals_scored / total_matches, 2) if total_matches > 0 else 0,
-            'avg_goals_conceded': round(total_goals_conceded / total_matches, 2) if total_matches > 0 else 0
-        }
\ No newline at end of file
+
+        df = FootballDataProcessor.flatten_matches(team_matches)
+        if team_id is not None:
+            is_home = df['team_id'].iloc[:len(team_matches)].to_numpy() == team_id
+        else:
+            is_home = np.array([match.get('venue') == 'HOME' for match in team_matches])
+        side = FootballDataProcessor._side(team_matches, df, is_home).assign(team_id=0)
+        if team_id is None:
+            # sans venue connue, le match n'est compté ni à domicile ni à l'extérieur
+            venues = [match.get('venue') for match in team_matches]
+            side = side.assign(venue=venues)
+
+        stats = FootballDataProcessor.calculate_competition_stats(side)
+        return stats[[
+            'total_matches', 'home_matches', 'away_matches', 'goals_scored',
+            'goals_conceded', 'avg_goals_scored', 'avg_goals_conceded'
+        ]].to_dict('records')[0]
@@ -0,0 +1,334 @@
+"""Local SQLite store of normalized competitions, teams, matches and standings"""
+
+import logging
+import re
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from config import STORE_PATH
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS competitions (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    code TEXT,
+    type TEXT
+);
+
+CREATE TABLE IF NOT EXISTS teams (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    short_name TEXT,
+    tla TEXT
+);
+
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    competition_id INTEGER,
+    season TEXT,
+    matchday INTEGER,
+    stage TEXT,
+    utc_date TEXT,
+    status TEXT,
+    home_team_id INTEGER,
+    away_team_id INTEGER,
+    home_goals INTEGER,
+    away_goals INTEGER,
+    winner TEXT,
+    last_updated TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_matches_competition ON matches (competition_id, status, utc_date);
+CREATE INDEX IF NOT EXISTS idx_matches_home ON matches (home_team_id, utc_date);
+CREATE INDEX IF NOT EXISTS idx_matches_away ON matches (away_team_id, utc_date);
+CREATE INDEX IF NOT EXISTS idx_matches_date ON matches (utc_date);
+
+CREATE TABLE IF NOT EXISTS standings (
+    competition_id INTEGER,
+    season TEXT,
+    snapshot_at TEXT,
+    position INTEGER,
+    team_id INTEGER,
+    played INTEGER,
+    won INTEGER,
+    draw INTEGER,
+    lost INTEGER,
+    goals_for INTEGER,
+    goals_against INTEGER,
+    goal_difference INTEGER,
+    points INTEGER,
+    PRIMARY KEY (competition_id, snapshot_at, team_id)
+);
+CREATE INDEX IF NOT EXISTS idx_standings_team ON standings (team_id, snapshot_at);
+
+CREATE TABLE IF NOT EXISTS simulations (
+    competition_id INTEGER,
+    simulated_at TEXT,
+    input_key TEXT,
+    n_simulations INTEGER,
+    team TEXT,
+    avg_position REAL,
+    title_prob REAL,
+    top_spots INTEGER,
+    top_prob REAL,
+    relegation_spots INTEGER,
+    relegation_prob REAL,
+    PRIMARY KEY (competition_id, simulated_at, team)
+);
+"""
+
+MATCH_COLUMNS = """
+    m.id, m.competition_id, m.season, m.matchday, m.stage, m.utc_date, m.status,
+    m.home_team_id, home.name AS home_team, m.away_team_id, away.name AS away_team,
+    m.home_goals, m.away_goals, m.winner
+"""
+
+
+class MatchStore:
+    """
+    Typed, indexed tables built from API payloads
+
+    Fixture filtering, team history and head-to-head queries become indexed
+    SQL lookups instead of Python scans over full-season payloads.
+    """
+
+    def __init__(self, path: Path = STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _query(self, sql: str, params: Iterable = ()) -> pd.DataFrame:
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(sql, conn, params=list(params))
+
+    @staticmethod
+    def _upsert_competition(conn: sqlite3.Connection, competition: Optional[Dict]) -> None:
+        if competition and competition.get('id') is not None:
+            conn.execute(
+                "INSERT OR REPLACE INTO competitions VALUES (?, ?, ?, ?)",
+                (competition['id'], competition.get('name'), competition.get('code'), competition.get('type'))
+            )
+
+    @staticmethod
+    def _upsert_teams(conn: sqlite3.Connection, teams: List[Dict]) -> None:
+        conn.executemany(
+            "INSERT OR REPLACE INTO teams VALUES (?, ?, ?, ?)",
+            [
+                (team['id'], team.get('name'), team.get('shortName'), team.get('tla'))
+                for team in teams if team and team.get('id') is not None
+            ]
+        )
+
+    def save_matches(self, matches_data: Dict) -> int:
+        """Upsert the matches of an API payload, return the number of rows written"""
+        matches = matches_data.get('matches', [])
+        rows = []
+        teams = {}
+
+        for match in matches:
+            competition = match.get('competition') or matches_data.get('competition') or {}
+            season = (match.get('season') or {}).get('startDate') or ''
+            full_time = (match.get('score') or {}).get('fullTime') or {}
+            home, away = match.get('homeTeam') or {}, match.get('awayTeam') or {}
+            teams[home.get('id')] = home
+            teams[away.get('id')] = away
+
+            rows.append((
+                match['id'], competition.get('id'), season[:4], match.get('matchday'),
+                match.get('stage'), match.get('utcDate'), match.get('status'),
+                home.get('id'), away.get('id'), full_time.get('home'), full_time.get('away'),
+                (match.get('score') or {}).get('winner'), match.get('lastUpdated')
+            ))
+
+        with closing(self._connect()) as conn, conn:
+            self._upsert_competition(conn, matches_data.get('competition'))
+            self._upsert_teams(conn, list(teams.values()))
+            conn.executemany(
+                "INSERT OR REPLACE INTO matches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+        return len(rows)
+
+    def save_standings(self, standings_data: Dict, snapshot_at: Optional[str] = None) -> int:
+        """Store a standings snapshot (TOTAL table) if it changed, return the number of rows written"""
+        competition = standings_data.get('competition') or {}
+        season = ((standings_data.get('season') or {}).get('startDate') or '')[:4]
+        snapshot_at = snapshot_at or datetime.now(timezone.utc).isoformat(timespec='seconds')
+        table = standings_data['standings'][0]['table']
+
+        rows = [(
+            team['position'], team['team']['id'], team['playedGames'], team['won'], team['draw'],
+            team['lost'], team['goalsFor'], team['goalsAgainst'], team['goalDifference'], team['points']
+        ) for team in table]
+
+        with closing(self._connect()) as conn, conn:
+            latest = conn.execute("""
+                SELECT position, team_id, played, won, draw, lost,
+                       goals_for, goals_against, goal_difference, points
+                FROM standings
+                WHERE competition_id = ?
+                  AND snapshot_at = (SELECT MAX(snapshot_at) FROM standings WHERE competition_id = ?)
+                ORDER BY position, team_id
+            """, (competition.get('id'), competition.get('id'))).fetchall()
+
+            # un nouvel instantané seulement si le classement a changé
+            if latest == sorted(rows):
+                return 0
+
+            self._upsert_competition(conn, competition)
+            self._upsert_teams(conn, [team['team'] for team in table])
+            conn.executemany(
+                "INSERT OR REPLACE INTO standings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(competition.get('id'), season, snapshot_at) + row for row in rows]
+            )
+
+        return len(rows)
+
+    def competition_matches(self, competition_id: int, statuses: Optional[List[str]] = None) -> pd.DataFrame:
+        """Matches of a competition (optionally by status), in date order"""
+        sql = f"""
+            SELECT {MATCH_COLUMNS} FROM matches m
+            LEFT JOIN teams home ON home.id = m.home_team_id
+            LEFT JOIN teams away ON away.id = m.away_team_id
+            WHERE m.competition_id = ?
+        """
+        params = [competition_id]
+        if statuses:
+            sql += f" AND m.status IN ({', '.join('?' * len(statuses))})"
+            params += statuses
+
+        return self._query(sql + " ORDER BY m.utc_date", params)
+
+    def upcoming_matches(self, competition_id: int, limit: Optional[int] = None) -> pd.DataFrame:
+        """Scheduled fixtures of a competition, soonest first"""
+        matches = self.competition_matches(competition_id, ['SCHEDULED', 'TIMED'])
+        return matches.head(limit) if limit else matches
+
+    def team_matches(self, team_id: int, status: Optional[str] = 'FINISHED', limit: Optional[int] = None) -> pd.DataFrame:
+        """Matches of a team, most recent first"""
+        sql = f"""
+            SELECT {MATCH_COLUMNS} FROM (
+                SELECT * FROM matches WHERE home_team_id = ?
+                UNION ALL
+                SELECT * FROM matches WHERE away_team_id = ?
+            ) m
+            LEFT JOIN teams home ON home.id = m.home_team_id
+            LEFT JOIN teams away ON away.id = m.away_team_id
+        """
+        params = [team_id, team_id]
+        if status:
+            sql += " WHERE m.status = ?"
+            params.append(status)
+        sql += " ORDER BY m.utc_date DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return self._query(sql, params)
+
+    def head_to_head(self, team_id: int, opponent_id: int, limit: Optional[int] = None) -> pd.DataFrame:
+        """Finished matches between two teams, most recent first"""
+        sql = f"""
+            SELECT {MATCH_COLUMNS} FROM (
+                SELECT * FROM matches WHERE home_team_id = ? AND away_team_id = ?
+                UNION ALL
+                SELECT * FROM matches WHERE home_team_id = ? AND away_team_id = ?
+            ) m
+            LEFT JOIN teams home ON home.id = m.home_team_id
+            LEFT JOIN teams away ON away.id = m.away_team_id
+            WHERE m.status = 'FINISHED'
+            ORDER BY m.utc_date DESC
+        """
+        params = [team_id, opponent_id, opponent_id, team_id]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return self._query(sql, params)
+
+    def latest_standings(self, competition_id: int) -> pd.DataFrame:
+        """Most recent standings snapshot, same columns as process_standings"""
+        return self._query("""
+            SELECT s.position, t.name AS team, s.played, s.won, s.draw, s.lost,
+                   s.goals_for, s.goals_against, s.goal_difference, s.points
+            FROM standings s LEFT JOIN teams t ON t.id = s.team_id
+            WHERE s.competition_id = ?
+              AND s.snapshot_at = (SELECT MAX(snapshot_at) FROM standings WHERE competition_id = ?)
+            ORDER BY s.position
+        """, [competition_id, competition_id])
+
+    def save_simulation(
+        self,
+        competition_id: int,
+        summary: pd.DataFrame,
+        n_simulations: int,
+        input_key: str = '',
+        simulated_at: Optional[str] = None
+    ) -> int:
+        """
+        Store a SeasonSimulator.summarize() table, return the number of rows written
+
+        The top-N and relegation zone sizes are stored with the probabilities:
+        N comes from the top{N}_prob_% column, the relegation spots from the
+        summary's attrs (set by summarize).
+        """
+        top_columns = [column for column in summary if re.fullmatch(r'top\d+_prob_%', column)]
+        relegation_spots = summary.attrs.get('relegation_spots')
+        if len(top_columns) != 1 or relegation_spots is None:
+            raise ValueError(
+                "Expected a SeasonSimulator.summarize() table (one top-N column, relegation spots in attrs)"
+            )
+        top_spots = int(top_columns[0][3:-7])
+
+        simulated_at = simulated_at or datetime.now(timezone.utc).isoformat(timespec='seconds')
+        rows = [
+            (competition_id, simulated_at, input_key, n_simulations, team, avg_position,
+             title, top_spots, top, int(relegation_spots), relegation)
+            for team, avg_position, title, top, relegation in zip(
+                summary['team'], summary['avg_position'], summary['title_prob_%'],
+                summary[top_columns[0]], summary['relegation_prob_%']
+            )
+        ]
+
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO simulations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+        return len(rows)
+
+    def latest_simulation(self, competition_id: int) -> pd.DataFrame:
+        """
+        Most recent simulation of a competition, columns of
+        SeasonSimulator.summarize() (top{N}_prob_% with the stored N) plus
+        simulated_at, n_simulations and input_key; the zone sizes are in attrs
+        """
+        simulation = self._query("""
+            SELECT team, avg_position, title_prob AS "title_prob_%", top_spots, top_prob,
+                   relegation_spots, relegation_prob AS "relegation_prob_%",
+                   simulated_at, n_simulations, input_key
+            FROM simulations
+            WHERE competition_id = ?
+              AND simulated_at = (SELECT MAX(simulated_at) FROM simulations WHERE competition_id = ?)
+            ORDER BY avg_position
+        """, [competition_id, competition_id])
+        if simulation.empty:
+            return simulation.drop(columns=['top_spots', 'relegation_spots'])
+
+        top_spots = int(simulation['top_spots'].iloc[0])
+        relegation_spots = int(simulation['relegation_spots'].iloc[0])
+        simulation = simulation.rename(columns={'top_prob': f'top{top_spots}_prob_%'})
+        simulation = simulation.drop(columns=['top_spots', 'relegation_spots'])
+        simulation.attrs.update(top_spots=top_spots, relegation_spots=relegation_spots)
+        return simulation
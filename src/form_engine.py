@@ -0,0 +1,165 @@
+"""Rolling form of every team, maintained match by match"""
+
+import logging
+from typing import Dict, List, Union
+
+import numpy as np
+import pandas as pd
+
+from config import FORM_GOALS_HALF_LIFE, RECENT_MATCHES
+from src.ingestion import TeamRows, finished_rows, match_columns
+
+logger = logging.getLogger(__name__)
+
+# Portées des tampons : tous les matchs, à domicile, à l'extérieur
+ALL, HOME, AWAY = range(3)
+SCOPES = {ALL: '', HOME: 'home_', AWAY: 'away_'}
+# Champs d'un match dans les tampons circulaires
+POINTS, GOALS_FOR, GOALS_AGAINST = range(3)
+
+
+class FormEngine(TeamRows):
+    """
+    Last-N form, home/away splits and exponentially-weighted goal rates
+
+    Each team has a ring buffer of its last N results (overall, at home
+    and away), so a new result is written in O(1) over the oldest one.
+    Everything derives from a competition's matches payload: the form of
+    every team costs one get_competition_matches call instead of one
+    get_team_matches call per team. Matches are identified by id, so
+    feeding the same payload again only applies the new results.
+    """
+
+    def __init__(self, last_n: int = RECENT_MATCHES, half_life: float = FORM_GOALS_HALF_LIFE):
+        """
+        Args:
+            last_n: Size of the form window
+            half_life: Matches after which a result weighs half as much in
+                the goal rates
+        """
+        super().__init__()
+        self.last_n = last_n
+        self.alpha = 1 - 0.5 ** (1 / half_life)
+        self.applied = set()
+
+        # buffers[scope, équipe, case, champ] ; head = prochaine case écrite
+        self.buffers = np.zeros((3, 0, last_n, 3), dtype=np.int64)
+        self.heads = np.zeros((3, 0), dtype=np.int64)
+        self.counts = np.zeros((3, 0), dtype=np.int64)
+        self.goal_rates = np.zeros((0, 2))
+
+    @classmethod
+    def from_matches(cls, matches: Union[Dict, List[Dict]], **kwargs) -> 'FormEngine':
+        engine = cls(**kwargs)
+        engine.update(matches)
+        return engine
+
+    def _capacity(self) -> int:
+        return self.buffers.shape[1]
+
+    def _grow(self, size: int) -> None:
+        row = len(self.team_ids)
+        buffers = np.zeros((3, size, self.last_n, 3), dtype=np.int64)
+        buffers[:, :row] = self.buffers
+        heads = np.zeros((3, size), dtype=np.int64)
+        heads[:, :row] = self.heads
+        counts = np.zeros((3, size), dtype=np.int64)
+        counts[:, :row] = self.counts
+        goal_rates = np.zeros((size, 2))
+        goal_rates[:row] = self.goal_rates
+        self.buffers, self.heads, self.counts, self.goal_rates = buffers, heads, counts, goal_rates
+
+    def _push(self, scope: int, team: int, points: int, goals_for: int, goals_against: int) -> None:
+        head = self.heads[scope, team]
+        self.buffers[scope, team, head] = (points, goals_for, goals_against)
+        self.heads[scope, team] = (head + 1) % self.last_n
+        self.counts[scope, team] += 1
+
+    def _add(self, home: int, away: int, home_goals: int, away_goals: int) -> None:
+        home_points = 3 if home_goals > away_goals else 1 if home_goals == away_goals else 0
+        away_points = 3 if away_goals > home_goals else 1 if home_goals == away_goals else 0
+
+        for scope, team, points, goals_for, goals_against in (
+            (ALL, home, home_points, home_goals, away_goals),
+            (HOME, home, home_points, home_goals, away_goals),
+            (ALL, away, away_points, away_goals, home_goals),
+            (AWAY, away, away_points, away_goals, home_goals),
+        ):
+            self._push(scope, team, points, goals_for, goals_against)
+
+        for team, goals in ((home, (home_goals, away_goals)), (away, (away_goals, home_goals))):
+            if self.counts[ALL, team] == 1:
+                self.goal_rates[team] = goals
+            else:
+                self.goal_rates[team] += self.alpha * (np.asarray(goals) - self.goal_rates[team])
+
+    def update(self, matches: Union[Dict, List[Dict]]) -> int:
+        """
+        Apply the finished matches not seen yet, oldest first
+
+        Args:
+            matches: Competition matches payload (or list of matches)
+
+        Returns:
+            Number of results applied
+        """
+        columns = match_columns(matches)
+
+        applied = 0
+        for k in finished_rows(columns):
+            match_id = columns['match_id'][k]
+            if match_id in self.applied:
+                continue
+
+            home = self._team(int(columns['home_id'][k]), columns['home'][k])
+            away = self._team(int(columns['away_id'][k]), columns['away'][k])
+            if home == away:
+                continue
+
+            self._add(home, away, int(columns['home_goals'][k]), int(columns['away_goals'][k]))
+            self.applied.add(match_id)
+            applied += 1
+
+        if applied:
+            logger.info(f"Form updated with {applied} result(s)")
+        return applied
+
+    def _window(self, scope: int) -> np.ndarray:
+        """Buffers of a scope, most recent result first, shape (n_teams, last_n, 3)"""
+        n = len(self)
+        slots = (self.heads[scope, :n, None] - 1 - np.arange(self.last_n)) % self.last_n
+        return self.buffers[scope, np.arange(n)[:, None], slots]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Form of every team, indexed by team_id
+
+        Columns of calculate_forms (form_string most recent first), plus
+        played/points over the window at home and away and the
+        exponentially-weighted goal rates.
+        """
+        n = len(self)
+        form = pd.DataFrame({'team': self.teams}, index=pd.Index(self.team_ids, name='team_id'))
+
+        for scope, prefix in SCOPES.items():
+            window = self._window(scope)
+            played = np.minimum(self.counts[scope, :n], self.last_n)
+            valid = np.arange(self.last_n)[None, :] < played[:, None]
+            points = np.where(valid, window[..., POINTS], 0)
+
+            if scope == ALL:
+                letters = np.select([points == 3, points == 1], ['W', 'D'], 'L')
+                form['form_string'] = [''.join(row[:count]) for row, count in zip(letters, played)]
+                form['wins'] = ((points == 3) & valid).sum(axis=1)
+                form['draws'] = ((points == 1) & valid).sum(axis=1)
+                form['losses'] = ((points == 0) & valid).sum(axis=1)
+                form['goals_scored'] = np.where(valid, window[..., GOALS_FOR], 0).sum(axis=1)
+                form['goals_conceded'] = np.where(valid, window[..., GOALS_AGAINST], 0).sum(axis=1)
+                form['points'] = points.sum(axis=1)
+            else:
+                form[f'{prefix}played'] = played
+                form[f'{prefix}points'] = points.sum(axis=1)
+
+        form['goal_rate_for'] = self.goal_rates[:n, 0].round(2)
+        form['goal_rate_against'] = self.goal_rates[:n, 1].round(2)
+        return form
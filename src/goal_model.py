@@ -0,0 +1,331 @@
+"""Dixon-Coles goal model: fitted Poisson score matrices per fixture"""
+
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from scipy.optimize import minimize
+
+from config import GOAL_MODEL_MAX_GOALS, GOAL_MODEL_TIME_DECAY, MODELS_DIR
+from src.ingestion import finished_rows, match_columns
+
+logger = logging.getLogger(__name__)
+
+# Bornes de rho : tau(0,0) = 1 - lambda * mu * rho doit rester positif
+RHO_BOUNDS = (-0.2, 0.2)
+
+
+def _tau(home_goals, away_goals, home_rate, away_rate, rho):
+    """Dixon-Coles correction of the 0-0, 1-0, 0-1 and 1-1 scores"""
+    tau = np.ones(np.broadcast(home_goals, away_goals, home_rate, away_rate).shape)
+    tau = np.where((home_goals == 0) & (away_goals == 0), 1 - home_rate * away_rate * rho, tau)
+    tau = np.where((home_goals == 0) & (away_goals == 1), 1 + home_rate * rho, tau)
+    tau = np.where((home_goals == 1) & (away_goals == 0), 1 + away_rate * rho, tau)
+    tau = np.where((home_goals == 1) & (away_goals == 1), 1 - rho, tau)
+    return np.maximum(tau, 1e-10)
+
+
+class DixonColesModel:
+    """
+    Independent Poisson goals with the Dixon-Coles low-score correction
+
+    log(home rate) = attack[home] + defence[away] + home_advantage
+    log(away rate) = attack[away] + defence[home]
+
+    Attacks sum to zero. Teams without a finished match keep average
+    (zero) parameters.
+    """
+
+    def __init__(
+        self,
+        team_ids: List[int],
+        team_names: List[str],
+        attack: np.ndarray,
+        defence: np.ndarray,
+        home_advantage: float,
+        rho: float
+    ):
+        self.team_ids = list(team_ids)
+        self.team_names = list(team_names)
+        self.attack = np.asarray(attack, dtype=float)
+        self.defence = np.asarray(defence, dtype=float)
+        self.home_advantage = float(home_advantage)
+        self.rho = float(rho)
+        self.index = {team: i for i, team in enumerate(self.team_ids)}
+        self.index.update({name: i for i, name in enumerate(self.team_names)})
+
+    @classmethod
+    def fit(
+        cls,
+        matches: Union[Dict, List[Dict]],
+        teams: Optional[Dict[int, str]] = None,
+        time_decay: float = GOAL_MODEL_TIME_DECAY
+    ) -> 'DixonColesModel':
+        """
+        Maximum-likelihood fit on the finished matches of a payload
+
+        Args:
+            matches: Competition matches payload (or list of matches)
+            teams: team id -> name of every team to model (e.g. from the
+                standings); defaults to the teams seen in the matches
+            time_decay: Weight exp(-time_decay * days) of older matches
+        """
+        columns = match_columns(matches)
+        finished = finished_rows(columns)
+
+        if teams is None:
+            teams = {}
+            for side in ('home', 'away'):
+                for team_id, name in zip(columns[f'{side}_id'][finished], columns[side][finished]):
+                    teams.setdefault(int(team_id), name)
+
+        team_ids = list(teams)
+        index = {team_id: i for i, team_id in enumerate(team_ids)}
+        home = np.array([index.get(int(t), -1) for t in columns['home_id'][finished]], dtype=np.intp)
+        away = np.array([index.get(int(t), -1) for t in columns['away_id'][finished]], dtype=np.intp)
+        known = (home >= 0) & (away >= 0)
+        home, away = home[known], away[known]
+        home_goals = columns['home_goals'][finished][known].astype(float)
+        away_goals = columns['away_goals'][finished][known].astype(float)
+
+        weights = np.ones(len(home))
+        if time_decay and len(home):
+            dates = columns['date'][finished][known].astype('U19').astype('datetime64[s]')
+            days = (dates.max() - dates).astype(float) / 86400
+            weights = np.exp(-time_decay * days)
+
+        n = len(team_ids)
+        if len(home) == 0:
+            logger.warning("No finished match to fit the goal model, using average teams")
+            return cls(team_ids, list(teams.values()), np.zeros(n), np.zeros(n), np.log(1.35), 0.0)
+
+        def objective(params):
+            attack, defence = params[:n], params[n:2 * n]
+            gamma, rho = params[2 * n], params[2 * n + 1]
+            home_rate = np.exp(attack[home] + defence[away] + gamma)
+            away_rate = np.exp(attack[away] + defence[home])
+            tau = _tau(home_goals, away_goals, home_rate, away_rate, rho)
+
+            log_likelihood = weights * (
+                home_goals * np.log(home_rate) - home_rate
+                + away_goals * np.log(away_rate) - away_rate
+                + np.log(tau)
+            )
+
+            # dérivées de log(tau) par rapport aux taux et à rho
+            d_home = np.zeros_like(tau)
+            d_away = np.zeros_like(tau)
+            d_rho = np.zeros_like(tau)
+            s00 = (home_goals == 0) & (away_goals == 0)
+            s01 = (home_goals == 0) & (away_goals == 1)
+            s10 = (home_goals == 1) & (away_goals == 0)
+            s11 = (home_goals == 1) & (away_goals == 1)
+            d_home[s00] = -away_rate[s00] * rho / tau[s00]
+            d_away[s00] = -home_rate[s00] * rho / tau[s00]
+            d_rho[s00] = -home_rate[s00] * away_rate[s00] / tau[s00]
+            d_home[s01] = rho / tau[s01]
+            d_rho[s01] = home_rate[s01] / tau[s01]
+            d_away[s10] = rho / tau[s10]
+            d_rho[s10] = away_rate[s10] / tau[s10]
+            d_rho[s11] = -1 / tau[s11]
+
+            # gradients par rapport à log(taux)
+            g_home = weights * (home_goals - home_rate + home_rate * d_home)
+            g_away = weights * (away_goals - away_rate + away_rate * d_away)
+
+            grad = np.empty_like(params)
+            grad[:n] = np.bincount(home, g_home, n) + np.bincount(away, g_away, n)
+            grad[n:2 * n] = np.bincount(away, g_home, n) + np.bincount(home, g_away, n)
+            grad[2 * n] = g_home.sum()
+            grad[2 * n + 1] = (weights * d_rho).sum()
+
+            # contrainte d'identifiabilité : somme des attaques nulle
+            penalty = attack.sum()
+            grad = -grad
+            grad[:n] += 2 * penalty
+            return -log_likelihood.sum() + penalty ** 2, grad
+
+        start = np.zeros(2 * n + 2)
+        start[2 * n] = 0.25
+        bounds = [(None, None)] * (2 * n + 1) + [RHO_BOUNDS]
+        result = minimize(objective, start, jac=True, method='L-BFGS-B', bounds=bounds)
+        if not result.success:
+            logger.warning(f"Goal model fit did not converge: {result.message}")
+
+        params = result.x
+        logger.info(f"Goal model fitted on {len(home)} matches ({n} teams)")
+        return cls(
+            team_ids, list(teams.values()), params[:n], params[n:2 * n], params[2 * n], params[2 * n + 1]
+        )
+
+    def expected_goals(self, home_idx: np.ndarray, away_idx: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Home and away goal rates of fixtures given as team indices"""
+        home_rate = np.exp(self.attack[home_idx] + self.defence[away_idx] + self.home_advantage)
+        away_rate = np.exp(self.attack[away_idx] + self.defence[home_idx])
+        return home_rate, away_rate
+
+    def score_matrices(
+        self,
+        home_idx: np.ndarray,
+        away_idx: np.ndarray,
+        max_goals: int = GOAL_MODEL_MAX_GOALS
+    ) -> np.ndarray:
+        """
+        Score probabilities of fixtures, shape (n_fixtures, max_goals + 1, max_goals + 1)
+
+        [k, i, j] is the probability that fixture k ends i-j. Scores above
+        max_goals are folded back by renormalizing.
+        """
+        home_rate, away_rate = self.expected_goals(np.asarray(home_idx), np.asarray(away_idx))
+        goals = np.arange(max_goals + 1)
+        factorials = np.cumprod(np.r_[1, goals[1:]]).astype(float)
+
+        home_pmf = np.exp(-home_rate)[:, None] * home_rate[:, None] ** goals / factorials
+        away_pmf = np.exp(-away_rate)[:, None] * away_rate[:, None] ** goals / factorials
+        grid = home_pmf[:, :, None] * away_pmf[:, None, :]
+        grid *= _tau(
+            goals[None, :, None], goals[None, None, :],
+            home_rate[:, None, None], away_rate[:, None, None], self.rho
+        )
+        return grid / grid.sum(axis=(1, 2), keepdims=True)
+
+    def save(self, path: Path, key: str = '') -> None:
+        np.savez(
+            path, key=key, team_ids=np.array(self.team_ids), team_names=np.array(self.team_names),
+            attack=self.attack, defence=self.defence,
+            home_advantage=self.home_advantage, rho=self.rho
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> Tuple['DixonColesModel', str]:
+        """Model saved with save(), and its key"""
+        with np.load(path, allow_pickle=False) as data:
+            model = cls(
+                data['team_ids'].tolist(), data['team_names'].tolist(), data['attack'], data['defence'],
+                data['home_advantage'], data['rho']
+            )
+            return model, str(data['key'])
+
+
+class ScoreGrid:
+    """
+    Score matrices of every home/away pair of a competition, precomputed
+
+    Predictions read the matrices and simulations draw scores from their
+    cumulative distributions, so nothing is recomputed per call.
+    """
+
+    def __init__(self, model: DixonColesModel, max_goals: int = GOAL_MODEL_MAX_GOALS):
+        self.model = model
+        self.max_goals = max_goals
+        self.teams = model.team_names
+        self.team_index = model.index
+
+        n_teams = len(model.team_ids)
+        home_idx, away_idx = np.divmod(np.arange(n_teams * n_teams), n_teams)
+        size = max_goals + 1
+        self.grids = model.score_matrices(home_idx, away_idx, max_goals).reshape(n_teams, n_teams, size, size)
+        self.cdf = np.cumsum(self.grids.reshape(n_teams, n_teams, size * size), axis=-1)
+        self.cdf[..., -1] = 1.0
+
+        goals = np.arange(size)
+        self.home_win = np.tril(np.ones((size, size)), -1)
+        self.home_win = (self.grids * self.home_win).sum(axis=(2, 3))
+        self.draw = np.trace(self.grids, axis1=2, axis2=3)
+        self.away_win = 1 - self.home_win - self.draw
+        self.home_expected_goals = (self.grids.sum(axis=3) * goals).sum(axis=2)
+        self.away_expected_goals = (self.grids.sum(axis=2) * goals).sum(axis=2)
+
+    def indices(self, teams: List[Union[str, int]]) -> np.ndarray:
+        return np.array([self.team_index[team] for team in teams], dtype=np.intp)
+
+    def get(self, home: Union[str, int], away: Union[str, int]) -> Optional[Dict]:
+        """Prediction for home vs away (names or ids), with its score matrix"""
+        i, j = self.team_index.get(home), self.team_index.get(away)
+        if i is None or j is None or i == j:
+            return None
+
+        grid = self.grids[i, j]
+        home_score, away_score = np.unravel_index(np.argmax(grid), grid.shape)
+        probabilities = {
+            'home': self.home_win[i, j], 'draw': self.draw[i, j], 'away': self.away_win[i, j]
+        }
+
+        return {
+            'home_win_probability': round(float(probabilities['home']) * 100, 1),
+            'draw_probability': round(float(probabilities['draw']) * 100, 1),
+            'away_win_probability': round(float(probabilities['away']) * 100, 1),
+            'predicted_score': f"{home_score}-{away_score}",
+            'predicted_winner': max(probabilities, key=probabilities.get),
+            'confidence': round(float(max(probabilities.values())) * 100, 1),
+            'home_expected_goals': round(float(self.home_expected_goals[i, j]), 2),
+            'away_expected_goals': round(float(self.away_expected_goals[i, j]), 2),
+            'score_matrix': grid
+        }
+
+    def sample(
+        self,
+        home_idx: np.ndarray,
+        away_idx: np.ndarray,
+        n_simulations: int,
+        rng: np.random.Generator
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Scores drawn from the fixtures' matrices, each of shape (n_simulations, n_fixtures)"""
+        n_fixtures, n_cells = len(home_idx), self.cdf.shape[-1]
+        offsets = np.arange(n_fixtures)
+
+        # CDF de la rencontre k décalée de +k : une seule recherche pour toutes
+        cdf = (self.cdf[home_idx, away_idx] + offsets[:, None]).ravel()
+        u = rng.random((n_simulations, n_fixtures)) + offsets
+        cells = np.searchsorted(cdf, u, side='right') - offsets * n_cells
+        np.minimum(cells, n_cells - 1, out=cells)
+
+        return np.divmod(cells, self.max_goals + 1)
+
+
+_grids: 'OrderedDict[tuple, ScoreGrid]' = OrderedDict()
+_grids_lock = threading.Lock()
+
+
+def get_score_grid(
+    competition_id: int,
+    key: str,
+    matches: Union[Dict, List[Dict]],
+    teams: Optional[Dict[int, str]] = None,
+    max_entries: int = 16
+) -> ScoreGrid:
+    """
+    Score grid of a competition for one standings snapshot (key)
+
+    Grids are kept in memory per (competition, key) and fitted parameters
+    are saved in MODELS_DIR, so a model is fitted once per snapshot.
+    """
+    with _grids_lock:
+        grid = _grids.get((competition_id, key))
+        if grid is not None:
+            _grids.move_to_end((competition_id, key))
+            return grid
+
+    path = MODELS_DIR / f"dixon_coles_{competition_id}.npz"
+    model = None
+    if path.exists():
+        try:
+            model, saved_key = DixonColesModel.load(path)
+            if saved_key != key:
+                model = None
+        except (OSError, ValueError, KeyError):
+            model = None
+
+    if model is None:
+        model = DixonColesModel.fit(matches, teams)
+        model.save(path, key)
+
+    grid = ScoreGrid(model)
+    with _grids_lock:
+        _grids[(competition_id, key)] = grid
+        while len(_grids) > max_entries:
+            _grids.popitem(last=False)
+    return grid
@@ -0,0 +1,149 @@
+"""Persistent on-disk cache for API responses"""
+
+import logging
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from config import API_CACHE_DEFAULT_TTL, API_CACHE_MAX_BYTES, API_CACHE_PATH, API_CACHE_TTLS
+from src.ingestion import loads
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    """A cached response body with its HTTP validators"""
+    endpoint: str
+    body: bytes
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def json(self) -> Any:
+        return loads(self.body)
+
+
+class ResponseCache:
+    """
+    SQLite-backed response cache shared by processes and container restarts
+
+    Entries are fresh for their endpoint TTL, then may still be served
+    while a refresh runs (stale-while-revalidate). The total body size is
+    bounded; least recently used entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        path: Path = API_CACHE_PATH,
+        max_bytes: int = API_CACHE_MAX_BYTES,
+        ttls: Optional[Dict[str, Tuple[float, float]]] = None
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttls = API_CACHE_TTLS if ttls is None else ttls
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    endpoint TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def policy(self, endpoint: str) -> Tuple[float, float]:
+        """(ttl, stale-while-revalidate window) of an endpoint"""
+        for pattern, policy in self.ttls.items():
+            if fnmatch(endpoint, pattern):
+                return policy
+        return API_CACHE_DEFAULT_TTL
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return entry.age < self.policy(entry.endpoint)[0]
+
+    def is_usable_stale(self, entry: CacheEntry) -> bool:
+        """Expired, but still inside the stale-while-revalidate window"""
+        ttl, stale = self.policy(entry.endpoint)
+        return entry.age < ttl + stale
+
+    def get(self, endpoint: str) -> Optional[CacheEntry]:
+        """Cached entry of an endpoint, whatever its age"""
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT body, fetched_at, etag, last_modified FROM responses WHERE endpoint = ?",
+                (endpoint,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE endpoint = ?",
+                (time.time(), endpoint)
+            )
+
+        return CacheEntry(endpoint, row[0], row[1], row[2], row[3])
+
+    def set(
+        self,
+        endpoint: str,
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> CacheEntry:
+        """Store a response body and evict LRU entries above max_bytes"""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (endpoint, body, len(body), now, now, etag, last_modified)
+            )
+            self._evict(conn)
+
+        return CacheEntry(endpoint, body, now, etag, last_modified)
+
+    def touch(self, endpoint: str) -> None:
+        """Mark an entry as just fetched (e.g. after a revalidation)"""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE endpoint = ?",
+                (now, now, endpoint)
+            )
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = 0
+        evicted = []
+        for endpoint, size in conn.execute(
+            "SELECT endpoint, size FROM responses ORDER BY accessed_at DESC"
+        ):
+            total += size
+            if total > self.max_bytes:
+                evicted.append((endpoint,))
+
+        if evicted:
+            conn.executemany("DELETE FROM responses WHERE endpoint = ?", evicted)
+            logger.info(f"Evicted {len(evicted)} cached responses")
+
+    def clear(self) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM responses")
@@ -0,0 +1,204 @@
+"""Fast decoding and flattening of API payloads into typed columns"""
+
+import json
+import logging
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # bibliothèque standard, plus lente
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON with orjson when installed, else the json module"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode JSON to bytes with orjson when installed, else the json module"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+@dataclass(frozen=True)
+class Field:
+    """
+    A column of a flattened payload
+
+    dtype is a NumPy dtype, or 'nullable' for integers that may be missing
+    (int64 when all are present, float64 with NaN otherwise).
+    """
+    path: Tuple[str, ...]
+    dtype: Any = np.int64
+    default: Any = None
+
+
+# Classement (standings[0].table), une ligne par équipe
+STANDINGS_SCHEMA = {
+    'position': Field(('position',)),
+    'team': Field(('team', 'name'), object),
+    'played': Field(('playedGames',)),
+    'won': Field(('won',)),
+    'draw': Field(('draw',)),
+    'lost': Field(('lost',)),
+    'goals_for': Field(('goalsFor',)),
+    'goals_against': Field(('goalsAgainst',)),
+    'goal_difference': Field(('goalDifference',)),
+    'points': Field(('points',)),
+    'team_id': Field(('team', 'id')),
+}
+
+# Matchs (matches), une ligne par match
+MATCH_SCHEMA = {
+    'match_id': Field(('id',), 'nullable'),
+    'competition_id': Field(('competition', 'id'), 'nullable'),
+    'date': Field(('utcDate',), object),
+    'status': Field(('status',), object),
+    'matchday': Field(('matchday',), 'nullable'),
+    'home_id': Field(('homeTeam', 'id'), 'nullable'),
+    'home': Field(('homeTeam', 'name'), object),
+    'away_id': Field(('awayTeam', 'id'), 'nullable'),
+    'away': Field(('awayTeam', 'name'), object),
+    'home_goals': Field(('score', 'fullTime', 'home'), np.float64),
+    'away_goals': Field(('score', 'fullTime', 'away'), np.float64),
+    'winner': Field(('score', 'winner'), object),
+}
+
+
+def _getter(path: Tuple[str, ...]) -> Callable[[Dict], Any]:
+    """Direct accessor for a path (raises on missing keys)"""
+    if len(path) == 1:
+        return itemgetter(path[0])
+    if len(path) == 2:
+        first, second = path
+        return lambda row: row[first][second]
+    if len(path) == 3:
+        first, second, third = path
+        return lambda row: row[first][second][third]
+
+    def get(row):
+        for key in path:
+            row = row[key]
+        return row
+    return get
+
+
+def _safe_getter(path: Tuple[str, ...], default: Any) -> Callable[[Dict], Any]:
+    """Accessor returning default when a key is missing or null along the path"""
+    def get(row):
+        for key in path:
+            if not isinstance(row, dict):
+                return default
+            row = row.get(key)
+        return default if row is None else row
+    return get
+
+
+def _column(rows: List[Dict], field: Field) -> np.ndarray:
+    try:
+        values = list(map(_getter(field.path), rows))
+    except (KeyError, TypeError):
+        # champ absent sur certaines lignes : chemin lent, ligne par ligne
+        values = list(map(_safe_getter(field.path, field.default), rows))
+
+    if field.dtype == 'nullable':
+        try:
+            return np.array(values, dtype=np.int64)
+        except TypeError:
+            return np.array(values, dtype=np.float64)
+    if field.dtype is object:
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        return array
+    return np.array(values, dtype=field.dtype)
+
+
+def flatten(rows: List[Dict], schema: Dict[str, Field]) -> Dict[str, np.ndarray]:
+    """
+    Flatten a list of nested dicts into one typed array per schema column
+
+    Args:
+        rows: Items of a payload (teams of a table, matches...)
+        schema: Column name -> Field
+
+    Returns:
+        Dict of column name -> NumPy array of len(rows)
+    """
+    return {name: _column(rows, field) for name, field in schema.items()}
+
+
+def standings_columns(standings_data: Union[Dict, bytes, str]) -> Dict[str, np.ndarray]:
+    """Columns of the total standings table of a payload (decoded or raw JSON)"""
+    if not isinstance(standings_data, dict):
+        standings_data = loads(standings_data)
+    return flatten(standings_data['standings'][0]['table'], STANDINGS_SCHEMA)
+
+
+def match_columns(matches_data: Union[Dict, List[Dict], bytes, str]) -> Dict[str, np.ndarray]:
+    """Columns of the matches of a payload (decoded, raw JSON or a list of matches)"""
+    if isinstance(matches_data, (bytes, str)):
+        matches_data = loads(matches_data)
+    if isinstance(matches_data, dict):
+        matches_data = matches_data.get('matches', [])
+    return flatten(matches_data, MATCH_SCHEMA)
+
+
+def finished_rows(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """Rows of match_columns() that are finished with a score and known teams, oldest first"""
+    finished = (
+        (columns['status'] == 'FINISHED')
+        & ~np.isnan(columns['home_goals'].astype(float))
+        & ~np.isnan(columns['away_goals'].astype(float))
+        & ~np.isnan(columns['home_id'].astype(float))
+        & ~np.isnan(columns['away_id'].astype(float))
+    )
+    rows = np.flatnonzero(finished)
+    return rows[np.argsort(columns['date'][rows].astype(str), kind='stable')]
+
+
+class TeamRows:
+    """
+    Teams of an incremental engine by id, one row each in order of arrival
+
+    Subclasses keep per-team arrays, report their size in _capacity() and
+    enlarge them in _grow() when a new team does not fit.
+    """
+
+    def __init__(self):
+        self.team_ids: List[int] = []
+        self.teams: List[str] = []
+        self.index: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.team_ids)
+
+    def _capacity(self) -> int:
+        raise NotImplementedError
+
+    def _grow(self, size: int) -> None:
+        raise NotImplementedError
+
+    def _team(self, team_id: int, name: str) -> int:
+        """Row of a team, registering (and growing the arrays for) a new one"""
+        row = self.index.get(team_id)
+        if row is not None:
+            return row
+
+        row = len(self.team_ids)
+        if row == self._capacity():
+            self._grow(max(2 * row, 8))
+
+        self.team_ids.append(team_id)
+        self.teams.append(name)
+        self.index[team_id] = row
+        return row
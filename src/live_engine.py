@@ -0,0 +1,237 @@
+"""Live match feed: quota-aware polling, snapshot diffs and in-play probabilities"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import LIVE_POLL_INTERVAL, LIVE_POLL_MAX_INTERVAL, LIVE_POLL_RESERVE
+from src.api_client import FootballDataClient
+
+logger = logging.getLogger(__name__)
+
+LIVE_STATUSES = {'IN_PLAY', 'PAUSED'}
+MATCH_MINUTES = 90
+MAX_GOALS = 10
+# Buts attendus sur 90 minutes quand le match n'est pas dans la matrice de prédiction
+DEFAULT_EXPECTED_GOALS = (1.5, 1.2)
+
+
+def match_minute(match: Dict, now: Optional[datetime] = None) -> float:
+    """
+    Minute of play of a match: the API's 'minute' when given, otherwise
+    estimated from the kick-off time (15 minutes of half-time break)
+    """
+    status = match.get('status')
+    if status == 'FINISHED':
+        return float(MATCH_MINUTES)
+
+    minute = match.get('minute')
+    if minute is not None:
+        try:
+            parts = [float(part) for part in str(minute).split('+')]
+            # "45+2" compte déjà le temps additionnel : injuryTime seulement sans partie "+"
+            injury_time = float(match.get('injuryTime') or 0) if len(parts) == 1 else 0.0
+            return sum(parts) + injury_time
+        except ValueError:
+            pass
+
+    if status == 'PAUSED':
+        return MATCH_MINUTES / 2
+    try:
+        kickoff = datetime.fromisoformat(match['utcDate'].replace('Z', '+00:00'))
+    except (KeyError, AttributeError, ValueError):
+        return 0.0
+
+    elapsed = ((now or datetime.now(timezone.utc)) - kickoff).total_seconds() / 60
+    if elapsed > MATCH_MINUTES / 2:
+        elapsed = max(elapsed - 15, MATCH_MINUTES / 2)
+    return float(min(max(elapsed, 0.0), MATCH_MINUTES))
+
+
+def _poisson_pmf(rate: np.ndarray, max_goals: int = MAX_GOALS) -> np.ndarray:
+    """P(k goals) for k = 0..max_goals, one row per rate"""
+    goals = np.arange(max_goals + 1)
+    factorials = np.cumprod(np.r_[1, goals[1:]]).astype(float)
+    rate = np.asarray(rate, dtype=float)[:, None]
+    return np.exp(-rate) * rate ** goals / factorials
+
+
+def in_play_probabilities(
+    home_expected_goals: np.ndarray,
+    away_expected_goals: np.ndarray,
+    home_goals: np.ndarray,
+    away_goals: np.ndarray,
+    minute: np.ndarray,
+    max_goals: int = MAX_GOALS
+) -> Dict[str, np.ndarray]:
+    """
+    Final-result probabilities of matches in play
+
+    Goals still to come follow a Poisson law whose rate is the pre-match
+    expected goals scaled by the share of the 90 minutes left; the final
+    result is the current score plus those goals.
+
+    Args:
+        home_expected_goals, away_expected_goals: Pre-match expected goals
+        home_goals, away_goals: Current score
+        minute: Minute of play
+
+    Returns:
+        Dict with home_win, draw and away_win arrays (fractions)
+    """
+    remaining = np.clip(MATCH_MINUTES - np.asarray(minute, dtype=float), 0, MATCH_MINUTES) / MATCH_MINUTES
+    home_pmf = _poisson_pmf(np.asarray(home_expected_goals) * remaining, max_goals)
+    away_pmf = _poisson_pmf(np.asarray(away_expected_goals) * remaining, max_goals)
+
+    # joint[m, i, j] = P(i buts à domicile et j à l'extérieur d'ici la fin)
+    joint = home_pmf[:, :, None] * away_pmf[:, None, :]
+    goals = np.arange(max_goals + 1)
+    lead = (np.asarray(home_goals) - np.asarray(away_goals))[:, None, None] + goals[:, None] - goals[None, :]
+
+    home_win = (joint * (lead > 0)).sum(axis=(1, 2))
+    draw = (joint * (lead == 0)).sum(axis=(1, 2))
+    away_win = (joint * (lead < 0)).sum(axis=(1, 2))
+    total = home_win + draw + away_win
+
+    return {'home_win': home_win / total, 'draw': draw / total, 'away_win': away_win / total}
+
+
+@dataclass
+class LiveUpdate:
+    """Result of one poll of the live feed"""
+    matches: Dict[int, Dict]
+    probabilities: Dict[int, Dict]
+    changed: List[int] = field(default_factory=list)
+    finished: List[int] = field(default_factory=list)
+    polled: bool = True
+
+
+class LiveFeed:
+    """
+    Polls live matches and keeps in-play probabilities up to date
+
+    Each poll is diffed against the previous snapshot by match id, and
+    probabilities are only recomputed for matches whose status, score or
+    minute changed. Polls are spaced by LIVE_POLL_INTERVAL, stretched while
+    fewer than LIVE_POLL_RESERVE API requests are left in the minute so
+    the live page never starves the rest of the app.
+    """
+
+    def __init__(
+        self,
+        client: FootballDataClient,
+        prediction_matrix=None,
+        competition_id: Optional[int] = None,
+        poll_interval: float = LIVE_POLL_INTERVAL
+    ):
+        """
+        Args:
+            client: API client (its cache, limiter and offline mode apply)
+            prediction_matrix: Pre-match expected goals, when the teams are in it
+            competition_id: Only follow the matches of this competition
+            poll_interval: Seconds between polls when the quota allows
+        """
+        self.client = client
+        self.prediction_matrix = prediction_matrix
+        self.competition_id = competition_id
+        self.poll_interval = poll_interval
+        self.matches: Dict[int, Dict] = {}
+        self.probabilities: Dict[int, Dict] = {}
+        self._states: Dict[int, tuple] = {}
+        self.next_poll = 0.0
+
+    def next_interval(self) -> float:
+        """Seconds until the next poll, given the requests left in the minute"""
+        if self.client.offline:
+            # lecture du stockage local : aucune requête consommée
+            return self.poll_interval
+
+        limiter = self.client.limiter
+        missing = LIVE_POLL_RESERVE - limiter.available()
+        if missing <= 0:
+            return self.poll_interval
+        return min(max(self.poll_interval, missing / limiter.rate), LIVE_POLL_MAX_INTERVAL)
+
+    @staticmethod
+    def _state(match: Dict, minute: float) -> tuple:
+        full_time = (match.get('score') or {}).get('fullTime') or {}
+        return match.get('status'), full_time.get('home'), full_time.get('away'), int(minute)
+
+    def _expected_goals(self, match: Dict) -> tuple:
+        prediction = None
+        if self.prediction_matrix is not None:
+            prediction = self.prediction_matrix.get(
+                (match.get('homeTeam') or {}).get('id'), (match.get('awayTeam') or {}).get('id')
+            )
+        if prediction is None:
+            return DEFAULT_EXPECTED_GOALS
+        return prediction['home_expected_goals'], prediction['away_expected_goals']
+
+    def _update_probabilities(self, match_ids: List[int], minutes: Dict[int, float]) -> None:
+        if not match_ids:
+            return
+
+        expected = np.array([self._expected_goals(self.matches[i]) for i in match_ids], dtype=float)
+        full_times = [(self.matches[i].get('score') or {}).get('fullTime') or {} for i in match_ids]
+        scores = np.array([[full_time.get(side) or 0 for side in ('home', 'away')] for full_time in full_times])
+        probabilities = in_play_probabilities(
+            expected[:, 0], expected[:, 1], scores[:, 0], scores[:, 1],
+            np.array([minutes[i] for i in match_ids])
+        )
+
+        for k, match_id in enumerate(match_ids):
+            self.probabilities[match_id] = {
+                'minute': minutes[match_id],
+                'home_win_probability': round(float(probabilities['home_win'][k]) * 100, 1),
+                'draw_probability': round(float(probabilities['draw'][k]) * 100, 1),
+                'away_win_probability': round(float(probabilities['away_win'][k]) * 100, 1)
+            }
+
+    def poll(self, force: bool = False) -> LiveUpdate:
+        """
+        Fetch live matches if a poll is due and process what changed
+
+        Returns:
+            LiveUpdate with every live match, their probabilities, and the
+            ids of matches changed or no longer live since the last poll
+        """
+        now = time.time()
+        if not force and now < self.next_poll:
+            return LiveUpdate(self.matches, self.probabilities, polled=False)
+
+        try:
+            matches = self.client.get_live_matches().get('matches', [])
+        except Exception as e:
+            logger.error(f"Live poll failed: {e}")
+            self.next_poll = now + self.next_interval()
+            return LiveUpdate(self.matches, self.probabilities, polled=False)
+
+        if self.competition_id is not None:
+            matches = [m for m in matches if (m.get('competition') or {}).get('id') == self.competition_id]
+
+        current = {match['id']: match for match in matches}
+        finished = [match_id for match_id in self.matches if match_id not in current]
+        minutes = {match_id: match_minute(match) for match_id, match in current.items()}
+
+        changed = []
+        for match_id, match in current.items():
+            state = self._state(match, minutes[match_id])
+            if self._states.get(match_id) != state:
+                self._states[match_id] = state
+                changed.append(match_id)
+
+        for match_id in finished:
+            self._states.pop(match_id, None)
+            self.probabilities.pop(match_id, None)
+
+        self.matches = current
+        self._update_probabilities(changed, minutes)
+        self.next_poll = time.time() + self.next_interval()
+
+        if changed or finished:
+            logger.info(f"Live: {len(changed)} match(es) changed, {len(finished)} ended")
+        return LiveUpdate(self.matches, self.probabilities, changed, finished)
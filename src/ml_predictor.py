@@ -2,18 +2,64 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 import logging
 
+from config import ELO_INITIAL, ELO_STRENGTH_WEIGHT
+
 logger = logging.getLogger(__name__)
 
+# Saison de référence de la normalisation (114 points, diff. de buts ±50) :
+# points et diff. de buts sont ramenés par match puis à cette durée
+REFERENCE_GAMES = 38
+
+
+def _round(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """
+    np.round with the exact results of Python's round()
+
+    np.round scales by 10**ndigits before rounding, which can land on the
+    other side of a tie; those few near-tie values are rounded in Python.
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, ndigits)
+
+    scaled = values * 10 ** ndigits
+    near_tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded = np.array(rounded, dtype=float, copy=True)
+        rounded[near_tie] = [round(float(v), ndigits) for v in values[near_tie]]
+
+    return rounded
+
+
+def _games(played) -> np.ndarray:
+    """Games played, REFERENCE_GAMES when unknown, at least 1"""
+    played = np.asarray(played, dtype=float)
+    return np.maximum(np.where(np.isnan(played), REFERENCE_GAMES, played), 1)
+
+
+def _column(df: pd.DataFrame, name: str, default: float) -> np.ndarray:
+    """Column as a float array, with the dict.get default for missing values"""
+    if name not in df:
+        return np.full(len(df), default, dtype=float)
+    return df[name].fillna(default).to_numpy(dtype=float)
+
 
 class MatchPredictor:
     """Predict match outcomes using team statistics"""
     
     @staticmethod
     def calculate_team_strength(team_stats: Dict) -> float:
-        """Calculate overall team strength score (0-100)"""
+        """
+        Calculate overall team strength score (0-100)
+
+        Points and goal difference are taken per game played ('played',
+        a full REFERENCE_GAMES season when missing), so leagues of any
+        length and any point of the season share one scale. With an 'elo'
+        key, the Elo strength is blended in with weight ELO_STRENGTH_WEIGHT
+        (a missing rating counts as ELO_INITIAL).
+        """
         if not team_stats:
             return 50.0
         
@@ -22,12 +68,14 @@ class MatchPredictor:
         goal_diff_weight = 0.3
         form_weight = 0.3
         
-        # Normalize values
+        # Normalize values, per game played over a 38-game season
+        played = team_stats.get('played')
+        scale = REFERENCE_GAMES / float(_games(np.nan if played is None else played))
         max_points = 114  # Theoretical max for 38 games
-        points_score = (team_stats.get('points', 0) / max_points) * 100
+        points_score = (team_stats.get('points', 0) * scale / max_points) * 100
         
         # Goal difference (-50 to +50 range normalized)
-        goal_diff = team_stats.get('goal_difference', 0)
+        goal_diff = team_stats.get('goal_difference', 0) * scale
         goal_diff_score = ((goal_diff + 50) / 100) * 100
         goal_diff_score = max(0, min(100, goal_diff_score))
         
@@ -41,9 +89,93 @@ class MatchPredictor:
             goal_diff_score * goal_diff_weight +
             form_score * form_weight
         )
+
+        # Note Elo disponible : terme supplémentaire, pondéré
+        if 'elo' in team_stats:
+            elo = team_stats['elo']
+            elo = ELO_INITIAL if elo is None or elo != elo else elo
+            strength = MatchPredictor._blend_rating(strength, elo)
         
-        return round(strength, 2)
-    
+        return round(float(strength), 2)
+
+    @staticmethod
+    def calculate_team_strengths(
+        points: np.ndarray,
+        goal_difference: np.ndarray,
+        form_points: np.ndarray,
+        elo: Optional[np.ndarray] = None,
+        played: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Vectorized calculate_team_strength over arrays of any shape
+
+        elo: Elo ratings, blended in like the scalar 'elo' key (NaN counts
+            as ELO_INITIAL)
+        played: Games played, like the scalar 'played' key (None or NaN
+            counts as a full REFERENCE_GAMES season)
+        """
+        scale = REFERENCE_GAMES / _games(np.nan if played is None else played)
+        points_score = (np.asarray(points, dtype=float) * scale / 114) * 100
+        goal_diff_score = ((np.asarray(goal_difference, dtype=float) * scale + 50) / 100) * 100
+        goal_diff_score = np.clip(goal_diff_score, 0, 100)
+        form_score = (np.asarray(form_points, dtype=float) / 15) * 100
+
+        strength = points_score * 0.4 + goal_diff_score * 0.3 + form_score * 0.3
+
+        if elo is not None:
+            elo = np.asarray(elo, dtype=float)
+            strength = MatchPredictor._blend_rating(strength, np.where(np.isnan(elo), ELO_INITIAL, elo))
+
+        return _round(strength, 2)
+
+    @staticmethod
+    def _blend_rating(strength, ratings, weight: float = ELO_STRENGTH_WEIGHT):
+        """Weighted mean of the formula strength and the Elo strength"""
+        return (1 - weight) * strength + weight * MatchPredictor.rating_strengths(ratings)
+
+    @staticmethod
+    def rating_strengths(ratings: np.ndarray, initial: float = ELO_INITIAL) -> np.ndarray:
+        """
+        Strength (0-100) from Elo ratings: expected score in % against an
+        average team on neutral ground, so 50 for an average team
+        """
+        ratings = np.asarray(ratings, dtype=float)
+        return _round(100 / (1 + 10 ** ((initial - ratings) / 400)), 2)
+
+    @staticmethod
+    def outcome_probabilities(
+        home_strength: np.ndarray,
+        away_strength: np.ndarray,
+        home_advantage: float = 5.0
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized home/draw/away probabilities (in %) used by predict_match
+
+        Values are left unrounded so that callers can reproduce the
+        predicted winner of predict_match exactly.
+        """
+        home_strength_adj = np.asarray(home_strength, dtype=float) + home_advantage
+        away_strength = np.asarray(away_strength, dtype=float)
+        total_strength = home_strength_adj + away_strength
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            home_win_prob = (home_strength_adj / total_strength) * 100
+            away_win_prob = (away_strength / total_strength) * 100
+
+            strength_diff = np.abs(home_strength_adj - away_strength)
+            draw_prob = np.maximum(15, 35 - (strength_diff * 0.3))
+
+            remaining = 100 - draw_prob
+            home_win_prob = (home_win_prob / (home_win_prob + away_win_prob)) * remaining
+            away_win_prob = remaining - home_win_prob
+
+        zero = total_strength == 0
+        home_win_prob = np.where(zero, 33.33, home_win_prob)
+        draw_prob = np.where(zero, 33.33, draw_prob)
+        away_win_prob = np.where(zero, 33.33, away_win_prob)
+
+        return home_win_prob, draw_prob, away_win_prob
+
     @staticmethod
     def predict_match(
         home_team: Dict,
@@ -131,6 +263,129 @@ class MatchPredictor:
             'key_factors': MatchPredictor._get_key_factors(home_team, away_team)
         }
     
+    @staticmethod
+    def predict_matches(
+        home_df: pd.DataFrame,
+        away_df: pd.DataFrame,
+        home_advantage: float = 5.0,
+        key_factors: bool = True,
+        model=None
+    ) -> pd.DataFrame:
+        """
+        Predict many matches in one vectorized pass
+
+        Args:
+            home_df: Home team stats, one row per fixture (same keys as predict_match)
+            away_df: Away team stats, aligned row by row with home_df
+            home_advantage: Home advantage bonus (default 5%)
+            key_factors: Also build the per-fixture key factors (slowest column)
+            model: Trained OutcomeModel; when given, its probabilities replace
+                the strength formula's (one batched predict_proba call)
+
+        Returns:
+            DataFrame with one row per fixture, the keys of predict_match as
+            columns plus the unrounded expected goals
+        """
+        with_elo = 'elo' in home_df and 'elo' in away_df
+        home_strength = MatchPredictor.calculate_team_strengths(
+            _column(home_df, 'points', 0),
+            _column(home_df, 'goal_difference', 0),
+            _column(home_df, 'form_points', 0),
+            _column(home_df, 'elo', ELO_INITIAL) if with_elo else None,
+            _column(home_df, 'played', REFERENCE_GAMES)
+        )
+        away_strength = MatchPredictor.calculate_team_strengths(
+            _column(away_df, 'points', 0),
+            _column(away_df, 'goal_difference', 0),
+            _column(away_df, 'form_points', 0),
+            _column(away_df, 'elo', ELO_INITIAL) if with_elo else None,
+            _column(away_df, 'played', REFERENCE_GAMES)
+        )
+
+        if model is not None:
+            home_win_prob, draw_prob, away_win_prob = (model.predict_proba(home_df, away_df) * 100).T
+        else:
+            home_win_prob, draw_prob, away_win_prob = MatchPredictor.outcome_probabilities(
+                home_strength, away_strength, home_advantage
+            )
+
+        # Expected goals
+        home_expected = (_column(home_df, 'avg_goals_scored', 1.5) + _column(away_df, 'avg_goals_conceded', 1.0)) / 2
+        away_expected = (_column(away_df, 'avg_goals_scored', 1.5) + _column(home_df, 'avg_goals_conceded', 1.0)) / 2
+
+        home_score = np.maximum(0, np.round(home_expected)).astype(int)
+        away_score = np.maximum(0, np.round(away_expected)).astype(int)
+
+        # Determine winner
+        home_win = (home_win_prob > away_win_prob) & (home_win_prob > draw_prob)
+        away_win = ~home_win & (away_win_prob > home_win_prob) & (away_win_prob > draw_prob)
+        draw = ~(home_win | away_win)
+
+        home_score = np.where(home_win & (home_score <= away_score), away_score + 1, home_score)
+        away_score = np.where(away_win & (away_score <= home_score), home_score + 1, away_score)
+        away_score = np.where(draw, home_score, away_score)
+
+        predicted_winner = np.where(home_win, "home", np.where(away_win, "away", "draw"))
+
+        max_prob = np.maximum(np.maximum(home_win_prob, draw_prob), away_win_prob)
+        confidence = np.minimum(95, max_prob)
+
+        predictions = pd.DataFrame({
+            'home_win_probability': _round(home_win_prob, 1),
+            'draw_probability': _round(draw_prob, 1),
+            'away_win_probability': _round(away_win_prob, 1),
+            'predicted_score': [f"{h}-{a}" for h, a in zip(home_score, away_score)],
+            'predicted_winner': predicted_winner,
+            'confidence': _round(confidence, 1),
+            'home_strength': _round(home_strength, 1),
+            'away_strength': _round(away_strength, 1),
+            'home_expected_goals': home_expected,
+            'away_expected_goals': away_expected
+        }, index=home_df.index)
+
+        if key_factors:
+            predictions['key_factors'] = MatchPredictor._get_key_factors_batch(home_df, away_df)
+
+        return predictions
+
+    @staticmethod
+    def _get_key_factors_batch(home_df: pd.DataFrame, away_df: pd.DataFrame) -> list:
+        """Vectorized _get_key_factors, one list of factors per fixture"""
+        home_names = home_df['name'].tolist()
+        away_names = away_df['name'].tolist()
+
+        home_form = _column(home_df, 'form_points', 0)
+        away_form = _column(away_df, 'form_points', 0)
+        home_gd = _column(home_df, 'goal_difference', 0)
+        away_gd = _column(away_df, 'goal_difference', 0)
+
+        home_better_form = home_form > away_form + 3
+        away_better_form = ~home_better_form & (away_form > home_form + 3)
+        home_better_gd = home_gd > away_gd + 10
+        away_better_gd = ~home_better_gd & (away_gd > home_gd + 10)
+        attack_vs_defense = (
+            (_column(home_df, 'avg_goals_scored', 0) > 2.0)
+            & (_column(away_df, 'avg_goals_conceded', 100) > 1.5)
+        )
+
+        factors = []
+        for i, (home, away) in enumerate(zip(home_names, away_names)):
+            row = []
+            if home_better_form[i]:
+                row.append(f"🔥 {home} en meilleure forme")
+            elif away_better_form[i]:
+                row.append(f"🔥 {away} en meilleure forme")
+            if home_better_gd[i]:
+                row.append(f"⚽ {home} meilleure différence de buts")
+            elif away_better_gd[i]:
+                row.append(f"⚽ {away} meilleure différence de buts")
+            row.append(f"🏠 Avantage domicile pour {home}")
+            if attack_vs_defense[i]:
+                row.append(f"⚔️ Attaque {home} vs Défense faible {away}")
+            factors.append(row[:3])
+
+        return factors
+
     @staticmethod
     def _get_key_factors(home_team: Dict, away_team: Dict) -> list:
         """Identify key factors influencing the prediction"""
@@ -0,0 +1,269 @@
+"""Trained home/draw/away classifier, persisted in MODELS_DIR"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, log_loss
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from config import MODELS_DIR
+from src.ingestion import match_columns
+
+logger = logging.getLogger(__name__)
+
+MODEL_VERSION = 1
+MODEL_PATH = MODELS_DIR / "outcome_model.joblib"
+
+# Caractéristiques d'une équipe, calculées à partir de ses compteurs de classement
+TEAM_FEATURES = [
+    'points_per_game',
+    'goal_difference_per_game',
+    'goals_for_per_game',
+    'goals_against_per_game',
+]
+FEATURES = [f'home_{name}' for name in TEAM_FEATURES] + [f'away_{name}' for name in TEAM_FEATURES]
+OUTCOMES = ['home', 'draw', 'away']
+
+
+def feature_hash() -> str:
+    """Hash of the feature layout, stored in the manifest to detect stale models"""
+    return hashlib.sha256(json.dumps([MODEL_VERSION, FEATURES]).encode()).hexdigest()[:16]
+
+
+def team_features(teams: pd.DataFrame) -> np.ndarray:
+    """
+    TEAM_FEATURES of teams given by their standings counters
+
+    Args:
+        teams: DataFrame with played, points, goal_difference, goals_for
+            and goals_against columns (e.g. TeamFeatureTable rows)
+
+    Returns:
+        Array of shape (n_teams, len(TEAM_FEATURES))
+    """
+    played = teams['played'].to_numpy(dtype=float).clip(min=1)
+    return np.column_stack([
+        teams['points'].to_numpy(dtype=float) / played,
+        teams['goal_difference'].to_numpy(dtype=float) / played,
+        teams['goals_for'].to_numpy(dtype=float) / played,
+        teams['goals_against'].to_numpy(dtype=float) / played,
+    ])
+
+
+def fixture_features(home_df: pd.DataFrame, away_df: pd.DataFrame) -> np.ndarray:
+    """FEATURES of fixtures, one row per aligned home/away row"""
+    return np.hstack([team_features(home_df), team_features(away_df)])
+
+
+def _history(matches: Union[Dict, List[Dict], pd.DataFrame]) -> pd.DataFrame:
+    """Finished matches as a MatchStore-like frame, in date order"""
+    if isinstance(matches, pd.DataFrame):
+        df = matches
+    else:
+        columns = match_columns(matches)
+        df = pd.DataFrame({
+            'competition_id': columns['competition_id'],
+            'utc_date': columns['date'],
+            'status': columns['status'],
+            'home_team_id': columns['home_id'],
+            'away_team_id': columns['away_id'],
+            'home_goals': columns['home_goals'],
+            'away_goals': columns['away_goals'],
+        })
+
+    df = df[df['status'] == 'FINISHED'].dropna(
+        subset=['home_team_id', 'away_team_id', 'home_goals', 'away_goals']
+    )
+    if 'season' not in df:
+        df = df.assign(season=0)
+    return df.sort_values('utc_date', kind='stable').reset_index(drop=True)
+
+
+def build_training_set(
+    matches: Union[Dict, List[Dict], pd.DataFrame],
+    min_played: int = 3
+) -> pd.DataFrame:
+    """
+    One row per finished match: FEATURES as they stood before kick-off,
+    the outcome (0 home, 1 draw, 2 away) and the match date
+
+    Counters are accumulated per competition, season and team in date
+    order, so a match never sees its own result.
+
+    Args:
+        matches: Matches payload, list of matches or MatchStore frame
+        min_played: Skip matches where a team had played fewer games
+    """
+    df = _history(matches)
+    n = len(df)
+    if n == 0:
+        return pd.DataFrame(columns=FEATURES + ['outcome', 'utc_date'])
+
+    home_goals = df['home_goals'].to_numpy(dtype=np.int64)
+    away_goals = df['away_goals'].to_numpy(dtype=np.int64)
+    home_points = np.select([home_goals > away_goals, home_goals == away_goals], [3, 1], 0)
+    away_points = np.select([away_goals > home_goals, home_goals == away_goals], [3, 1], 0)
+
+    # une ligne par équipe et par match (domicile puis extérieur), ordre chronologique
+    long = pd.DataFrame({
+        'row': np.tile(np.arange(n), 2),
+        'competition_id': np.tile(df['competition_id'].to_numpy(), 2),
+        'season': np.tile(df['season'].to_numpy(), 2),
+        'team': np.concatenate([df['home_team_id'].to_numpy(), df['away_team_id'].to_numpy()]),
+        'played': 1,
+        'points': np.concatenate([home_points, away_points]),
+        'goals_for': np.concatenate([home_goals, away_goals]),
+        'goals_against': np.concatenate([away_goals, home_goals]),
+    }).sort_values('row', kind='stable')
+
+    counters = ['played', 'points', 'goals_for', 'goals_against']
+    groups = long.groupby(['competition_id', 'season', 'team'], sort=False)[counters]
+    before = groups.cumsum() - long[counters]
+    before['goal_difference'] = before['goals_for'] - before['goals_against']
+
+    is_home = long.index < n
+    home = before[is_home].sort_index()
+    away = before[~is_home].sort_index()
+
+    training = pd.DataFrame(fixture_features(home, away), columns=FEATURES)
+    training['outcome'] = np.select([home_goals > away_goals, home_goals == away_goals], [0, 1], 2)
+    training['utc_date'] = df['utc_date'].to_numpy()
+
+    enough = (home['played'].to_numpy() >= min_played) & (away['played'].to_numpy() >= min_played)
+    return training[enough].reset_index(drop=True)
+
+
+class OutcomeModel:
+    """
+    Calibrated classifier of match outcomes, with its manifest
+
+    The manifest records the model version, the feature layout hash and
+    the scikit-learn version; load() refuses models that do not match the
+    running code so a stale artifact never silently feeds predictions.
+    """
+
+    def __init__(self, estimator, manifest: Dict):
+        self.estimator = estimator
+        self.manifest = manifest
+
+    @classmethod
+    def train(
+        cls,
+        matches: Union[Dict, List[Dict], pd.DataFrame, List[pd.DataFrame]],
+        method: str = 'logistic',
+        holdout: float = 0.2
+    ) -> 'OutcomeModel':
+        """
+        Fit the classifier on finished matches
+
+        Args:
+            matches: A matches payload, list of matches or MatchStore
+                frame, or a list of payloads/frames (e.g. one per competition)
+            method: 'logistic' (multinomial logistic regression) or
+                'gradient_boosting'
+            holdout: Share of the most recent matches kept aside to report
+                log loss and accuracy before refitting on everything
+        """
+        sources = [matches]
+        if isinstance(matches, list) and matches and (
+            isinstance(matches[0], pd.DataFrame) or 'matches' in matches[0]
+        ):
+            sources = matches
+        training = pd.concat([build_training_set(source) for source in sources], ignore_index=True)
+        training = training.sort_values('utc_date', kind='stable')
+        if training['outcome'].nunique() < len(OUTCOMES):
+            raise ValueError("Not enough finished matches to train the outcome model")
+
+        X, y = training[FEATURES].to_numpy(), training['outcome'].to_numpy()
+
+        def make_estimator():
+            if method == 'logistic':
+                base = make_pipeline(StandardScaler(), LogisticRegression(C=1.0, max_iter=1000))
+            elif method == 'gradient_boosting':
+                base = HistGradientBoostingClassifier(max_depth=3, learning_rate=0.05, max_iter=200)
+            else:
+                raise ValueError(f"Unknown method: {method}")
+            return CalibratedClassifierCV(base, method='sigmoid', cv=3)
+
+        metrics = {}
+        split = int(len(X) * (1 - holdout))
+        if 0 < split < len(X) and len(np.unique(y[:split])) == len(OUTCOMES):
+            estimator = make_estimator().fit(X[:split], y[:split])
+            probabilities = estimator.predict_proba(X[split:])
+            metrics = {
+                'holdout_matches': int(len(X) - split),
+                'log_loss': round(float(log_loss(y[split:], probabilities, labels=[0, 1, 2])), 4),
+                'accuracy': round(float(accuracy_score(y[split:], probabilities.argmax(axis=1))), 4),
+            }
+
+        estimator = make_estimator().fit(X, y)
+        manifest = {
+            'version': MODEL_VERSION,
+            'feature_hash': feature_hash(),
+            'features': FEATURES,
+            'method': method,
+            'sklearn_version': sklearn.__version__,
+            'trained_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'n_matches': int(len(X)),
+            **metrics,
+        }
+        logger.info(f"Outcome model trained on {len(X)} matches: {metrics}")
+        return cls(estimator, manifest)
+
+    @property
+    def identity(self) -> str:
+        """Hash of the manifest, identifies this trained model in cache keys"""
+        return hashlib.sha256(json.dumps(self.manifest, sort_keys=True).encode()).hexdigest()[:16]
+
+    def predict_proba(self, home_df: pd.DataFrame, away_df: pd.DataFrame) -> np.ndarray:
+        """Home/draw/away probabilities (fractions) of aligned fixtures, shape (n, 3)"""
+        if len(home_df) == 0:
+            return np.empty((0, len(OUTCOMES)))
+        return self.estimator.predict_proba(fixture_features(home_df, away_df))
+
+    @staticmethod
+    def manifest_path(path: Path) -> Path:
+        return Path(path).with_suffix('.json')
+
+    def save(self, path: Path = MODEL_PATH) -> None:
+        """Write the estimator (uncompressed, so it can be memory-mapped) and its manifest"""
+        joblib.dump(self.estimator, path)
+        self.manifest_path(path).write_text(json.dumps(self.manifest, indent=2))
+        logger.info(f"Outcome model saved to {path}")
+
+    @classmethod
+    def load(cls, path: Path = MODEL_PATH) -> Optional['OutcomeModel']:
+        """Saved model, or None when missing or built for other features/library versions"""
+        manifest_path = cls.manifest_path(path)
+        if not Path(path).exists() or not manifest_path.exists():
+            return None
+
+        try:
+            manifest = json.loads(manifest_path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable outcome model manifest: {e}")
+            return None
+
+        if manifest.get('feature_hash') != feature_hash():
+            logger.warning("Outcome model was trained on other features, retrain it")
+            return None
+        if manifest.get('sklearn_version') != sklearn.__version__:
+            logger.warning(
+                f"Outcome model was saved with scikit-learn {manifest.get('sklearn_version')}, retrain it"
+            )
+            return None
+
+        # tableaux numpy mappés en mémoire : pas de copie au démarrage
+        return cls(joblib.load(path, mmap_mode='r'), manifest)
@@ -0,0 +1,112 @@
+"""Precomputed predictions for every home/away pair of a competition"""
+
+import numpy as np
+import pandas as pd
+import logging
+from typing import Dict, Optional, Union
+
+from src.data_processor import FootballDataProcessor, TeamFeatureTable
+from src.ml_predictor import MatchPredictor
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionMatrix:
+    """
+    All N x N match predictions for one standings snapshot
+
+    The model only depends on the standings, so every ordered pair is
+    predicted once in a single predict_matches call; pages and the season
+    simulator then read predictions instead of calling the predictor.
+    With a trained OutcomeModel its probabilities replace the formula's.
+    """
+
+    def __init__(
+        self,
+        team_features: TeamFeatureTable,
+        key: Optional[str] = None,
+        home_advantage: float = 5.0,
+        outcome_model=None
+    ):
+        self.team_features = team_features
+        self.key = key
+        self.teams = team_features.features.index.tolist()
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+
+        n_teams = len(self.teams)
+        home_idx, away_idx = np.divmod(np.arange(n_teams * n_teams), n_teams)
+        pairs = home_idx != away_idx
+        home_idx, away_idx = home_idx[pairs], away_idx[pairs]
+
+        predictions = MatchPredictor.predict_matches(
+            team_features.rows([self.teams[i] for i in home_idx]),
+            team_features.rows([self.teams[i] for i in away_idx]),
+            home_advantage=home_advantage,
+            model=outcome_model
+        )
+        predictions.index = pd.MultiIndex.from_arrays(
+            [[self.teams[i] for i in home_idx], [self.teams[i] for i in away_idx]],
+            names=['home', 'away']
+        )
+        self.predictions = predictions
+        self._records = predictions.to_dict('index')
+
+        # Matrices (home, away) pour la simulation, NaN sur la diagonale
+        def matrix(column):
+            values = np.full((n_teams, n_teams), np.nan)
+            values[home_idx, away_idx] = predictions[column].to_numpy(dtype=float)
+            return values
+
+        self.home_win = matrix('home_win_probability') / 100
+        self.draw = matrix('draw_probability') / 100
+        self.away_win = matrix('away_win_probability') / 100
+        self.home_expected_goals = matrix('home_expected_goals')
+        self.away_expected_goals = matrix('away_expected_goals')
+
+        winner = np.full((n_teams, n_teams), -1, dtype=np.int8)
+        winner[home_idx, away_idx] = predictions['predicted_winner'].map(
+            {'home': 0, 'draw': 1, 'away': 2}
+        ).to_numpy()
+        self.predicted_winner = winner
+
+        scores = predictions['predicted_score'].str.split('-', expand=True).astype(int)
+        self.home_score = np.zeros((n_teams, n_teams), dtype=np.int64)
+        self.away_score = np.zeros((n_teams, n_teams), dtype=np.int64)
+        self.home_score[home_idx, away_idx] = scores[0].to_numpy()
+        self.away_score[home_idx, away_idx] = scores[1].to_numpy()
+
+        logger.info(f"Prediction matrix built for {n_teams} teams")
+
+    @classmethod
+    def from_standings(
+        cls,
+        standings_data: Union[Dict, pd.DataFrame],
+        home_advantage: float = 5.0,
+        outcome_model=None,
+        ratings: Optional[pd.DataFrame] = None
+    ) -> 'PredictionMatrix':
+        """Build the matrix of a standings payload (or DataFrame), keyed by its inputs"""
+        return cls(
+            FootballDataProcessor.build_team_features(standings_data, ratings=ratings),
+            key=cls.input_key(standings_data, ratings, outcome_model),
+            home_advantage=home_advantage,
+            outcome_model=outcome_model
+        )
+
+    @staticmethod
+    def input_key(
+        standings_data: Union[Dict, pd.DataFrame],
+        ratings: Optional[pd.DataFrame] = None,
+        outcome_model=None
+    ) -> str:
+        """Key of the matrix inputs: standings hash, Elo ratings hash and outcome model identity"""
+        return ':'.join([
+            FootballDataProcessor.standings_hash(standings_data),
+            FootballDataProcessor.standings_hash(ratings.reset_index()) if ratings is not None else 'no-ratings',
+            outcome_model.identity if outcome_model is not None else 'formula',
+        ])
+
+    def get(self, home: Union[str, int], away: Union[str, int]) -> Optional[Dict]:
+        """Prediction for home vs away (names or ids), same keys as predict_match"""
+        record = self._records.get((self.team_features.name(home), self.team_features.name(away)))
+        return dict(record) if record is not None else None
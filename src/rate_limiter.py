@@ -0,0 +1,141 @@
+"""Token-bucket rate limiter shared by API clients"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Mapping, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows : partage entre threads seulement
+    fcntl = None
+
+from config import API_RATE_LIMIT_STATE, API_REQUESTS_PER_MINUTE
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token-bucket limiter: bursts up to `capacity` requests, refilled at
+    `requests_per_minute`
+
+    Thread-safe. With a state_path the bucket lives in a file guarded by
+    an exclusive lock, so every process using the same file shares the
+    quota. The bucket follows the quota headers returned by the API, and
+    grows (capacity and refill rate) when they report a larger quota.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = API_REQUESTS_PER_MINUTE,
+        capacity: Optional[float] = None,
+        state_path: Optional[Path] = None
+    ):
+        self.rate = requests_per_minute / 60
+        self.capacity = capacity or requests_per_minute
+        self.state_path = Path(state_path) if state_path and fcntl else None
+        self._lock = threading.Lock()
+        self._memory = self._initial_state()
+
+    def _initial_state(self) -> Dict:
+        return {'tokens': self.capacity, 'updated': time.time(), 'blocked_until': 0.0}
+
+    @contextmanager
+    def _state(self) -> Iterator[Dict]:
+        """Locked read-modify-write access to the bucket state"""
+        with self._lock:
+            if self.state_path is None:
+                yield self._memory
+                return
+
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.state_path, 'a+') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    raw = f.read()
+                    try:
+                        state = json.loads(raw) if raw else self._initial_state()
+                    except ValueError:
+                        state = self._initial_state()
+                    yield state
+                    f.seek(0)
+                    f.truncate()
+                    json.dump(state, f)
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _grow(self, capacity: float) -> None:
+        """Raise the bucket to a larger quota reported by the API (refill rate included)"""
+        logger.info(f"API quota of {capacity:g} requests/minute, rate limit raised")
+        self.capacity = capacity
+        self.rate = capacity / 60
+
+    def _refill(self, state: Dict, now: float) -> None:
+        # quota agrandi par un autre processus partageant le fichier d'état
+        if state.get('capacity', 0) > self.capacity:
+            self._grow(state['capacity'])
+        elapsed = max(now - state['updated'], 0.0)
+        state['tokens'] = min(self.capacity, state['tokens'] + elapsed * self.rate)
+        state['updated'] = now
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available; return the time waited"""
+        waited = 0.0
+        while True:
+            with self._state() as state:
+                now = time.time()
+                self._refill(state, now)
+                wait = max(state['blocked_until'] - now, 0.0)
+                if wait == 0 and state['tokens'] >= 1:
+                    state['tokens'] -= 1
+                    return waited
+                if wait == 0:
+                    wait = (1 - state['tokens']) / self.rate
+
+            time.sleep(wait)
+            waited += wait
+
+    def available(self) -> float:
+        """Tokens available right now, without taking one (0 while blocked)"""
+        with self._state() as state:
+            now = time.time()
+            self._refill(state, now)
+            return 0.0 if state['blocked_until'] > now else state['tokens']
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Align the bucket with the quota reported by the API"""
+        available = headers.get("X-Requests-Available-Minute")
+        if available is None or not available.isdigit():
+            return
+
+        with self._state() as state:
+            now = time.time()
+            self._refill(state, now)
+            # plus de requêtes restantes que la capacité : le quota réel est plus large
+            if float(available) > self.capacity:
+                self._grow(float(available))
+                state['capacity'] = self.capacity
+            state['tokens'] = min(float(available), self.capacity)
+
+            reset = headers.get("X-RequestCounter-Reset")
+            if int(available) == 0 and reset and reset.isdigit():
+                state['blocked_until'] = now + int(reset)
+                logger.info(f"API quota exhausted, waiting {reset}s for reset")
+
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_limiter() -> TokenBucket:
+    """Process-wide limiter, shared with other processes through config.API_RATE_LIMIT_STATE"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = TokenBucket(state_path=API_RATE_LIMIT_STATE)
+        return _shared_limiter
@@ -0,0 +1,197 @@
+"""Elo ratings of a competition's teams, with per-matchday history"""
+
+import logging
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from config import ELO_HOME_ADVANTAGE, ELO_INITIAL, ELO_K
+from src.ingestion import TeamRows, finished_rows, match_columns
+
+logger = logging.getLogger(__name__)
+
+
+def expected_score(home_rating, away_rating, home_advantage: float = ELO_HOME_ADVANTAGE):
+    """Expected score (win = 1, draw = 0.5) of the home side"""
+    return 1 / (1 + 10 ** ((np.asarray(away_rating) - np.asarray(home_rating) - home_advantage) / 400))
+
+
+class EloRatings(TeamRows):
+    """
+    Elo ratings updated result by result
+
+    Finished matches are processed once, in date order; each new result
+    moves the two teams' ratings in O(1), scaled by the goal margin. After
+    each matchday the ratings are copied into a snapshot row, so the
+    strength of every team "as of" a date is one searchsorted and one row
+    lookup. Matches are tracked by id, like StandingsTable and FormEngine.
+    """
+
+    def __init__(
+        self,
+        k: float = ELO_K,
+        home_advantage: float = ELO_HOME_ADVANTAGE,
+        initial: float = ELO_INITIAL
+    ):
+        super().__init__()
+        self.k = k
+        self.home_advantage = home_advantage
+        self.initial = initial
+        self.applied = set()
+        self.ratings = np.zeros(0)
+        self.played = np.zeros(0, dtype=np.int64)
+
+        # snapshots[s, équipe] : notes à la fin de la journée s (date snapshot_dates[s])
+        self.snapshot_dates = np.empty(0, dtype='datetime64[s]')
+        self.snapshots = np.empty((0, 0), dtype=np.float32)
+        self._matchday = None
+        self._last_date = None
+
+    @classmethod
+    def from_matches(cls, matches: Union[Dict, List[Dict]], **kwargs) -> 'EloRatings':
+        ratings = cls(**kwargs)
+        ratings.update(matches)
+        return ratings
+
+    def _capacity(self) -> int:
+        return len(self.ratings)
+
+    def _grow(self, size: int) -> None:
+        """New teams start at the initial rating, in the snapshots too"""
+        row = len(self.ratings)
+        self.ratings = np.r_[self.ratings, np.full(size - row, self.initial)]
+        self.played = np.r_[self.played, np.zeros(size - row, dtype=np.int64)]
+        self.snapshots = np.hstack([
+            self.snapshots, np.full((len(self.snapshots), size - row), self.initial, dtype=np.float32)
+        ])
+
+    def _snapshot(self) -> None:
+        """Close the current matchday: store the ratings at its last match date"""
+        if self._last_date is None:
+            return
+        date = np.datetime64(self._last_date, 's')
+        if len(self.snapshot_dates) and self.snapshot_dates[-1] == date:
+            # même date (journée reprise par un appel suivant) : snapshot remplacé
+            self.snapshots[-1] = self.ratings
+            return
+        self.snapshot_dates = np.r_[self.snapshot_dates, date]
+        self.snapshots = np.vstack([self.snapshots, self.ratings.astype(np.float32)[None, :]])
+
+    def _apply_late(self, home: int, away: int, delta: float, date: np.datetime64) -> None:
+        """
+        Carry a result older than the last snapshot into the snapshots from
+        its date on, inserting a snapshot at that date to keep them sorted
+        """
+        row = np.searchsorted(self.snapshot_dates, date)
+        if self.snapshot_dates[row] != date:
+            previous = self.snapshots[row - 1] if row else np.full(self.snapshots.shape[1], self.initial)
+            self.snapshot_dates = np.insert(self.snapshot_dates, row, date)
+            self.snapshots = np.insert(self.snapshots, row, previous.astype(np.float32), axis=0)
+        self.snapshots[row:, home] += delta
+        self.snapshots[row:, away] -= delta
+
+    def apply_result(self, home: int, away: int, home_goals: int, away_goals: int) -> float:
+        """Update two team rows with a result, return the rating points exchanged"""
+        expected = expected_score(self.ratings[home], self.ratings[away], self.home_advantage)
+        actual = 1.0 if home_goals > away_goals else 0.5 if home_goals == away_goals else 0.0
+
+        # facteur d'écart de buts du World Football Elo : 1, 1.5 puis (11 + N) / 8
+        goals = abs(home_goals - away_goals)
+        margin = 1.0 if goals <= 1 else 1.5 if goals == 2 else (11 + goals) / 8
+        delta = self.k * margin * (actual - expected)
+
+        self.ratings[home] += delta
+        self.ratings[away] -= delta
+        self.played[[home, away]] += 1
+        return float(delta)
+
+    def update(self, matches: Union[Dict, List[Dict]]) -> int:
+        """
+        Apply the finished matches not seen yet, oldest first
+
+        A snapshot is taken each time the matchday (or, without
+        matchdays, the day) changes, and after the last match. A result
+        older than the last snapshot is added to every snapshot from its
+        date on, so snapshot dates stay sorted.
+
+        Returns:
+            Number of results applied
+        """
+        columns = match_columns(matches)
+        dates = columns['date'].astype(str)
+
+        applied = 0
+        for k in finished_rows(columns):
+            match_id = columns['match_id'][k]
+            if match_id in self.applied:
+                continue
+
+            home = self._team(int(columns['home_id'][k]), columns['home'][k])
+            away = self._team(int(columns['away_id'][k]), columns['away'][k])
+            if home == away:
+                continue
+
+            score = int(columns['home_goals'][k]), int(columns['away_goals'][k])
+            date = np.datetime64(dates[k][:19], 's')
+            self.applied.add(match_id)
+            applied += 1
+
+            # résultat arrivé après coup (match reporté, fin tardive) : snapshots corrigés
+            if len(self.snapshot_dates) and date < self.snapshot_dates[-1]:
+                self._apply_late(home, away, self.apply_result(home, away, *score), date)
+                continue
+
+            matchday = columns['matchday'][k]
+            matchday = dates[k][:10] if matchday is None or matchday != matchday else matchday
+            if self._matchday is not None and matchday != self._matchday:
+                self._snapshot()
+            self._matchday = matchday
+            self._last_date = dates[k][:19]
+
+            self.apply_result(home, away, *score)
+
+        if applied:
+            self._snapshot()
+            logger.info(f"Elo ratings updated with {applied} result(s)")
+        return applied
+
+    def as_of(self, date: Optional[Union[str, np.datetime64]] = None) -> np.ndarray:
+        """
+        Ratings of every team (team_ids order) after the last matchday
+        played by date; current ratings when date is None
+        """
+        n = len(self)
+        if date is None:
+            return self.ratings[:n].copy()
+
+        date = np.datetime64(str(date)[:19], 's')
+        row = np.searchsorted(self.snapshot_dates, date, side='right') - 1
+        if row < 0:
+            return np.full(n, float(self.initial))
+        return self.snapshots[row, :n].astype(float)
+
+    def rating(self, team_id: int, date: Optional[Union[str, np.datetime64]] = None) -> float:
+        """Rating of one team, initial rating for an unknown team"""
+        row = self.index.get(team_id)
+        if row is None:
+            return self.initial
+        if date is None:
+            return float(self.ratings[row])
+        return float(self.as_of(date)[row])
+
+    def history(self, team_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Snapshot dates and the team's rating at each of them"""
+        row = self.index.get(team_id)
+        if row is None:
+            return self.snapshot_dates[:0], np.empty(0)
+        return self.snapshot_dates, self.snapshots[:, row].astype(float)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Current ratings, indexed by team_id"""
+        n = len(self)
+        return pd.DataFrame({
+            'team': self.teams,
+            'rating': self.ratings[:n].round(1),
+            'played': self.played[:n]
+        }, index=pd.Index(self.team_ids, name='team_id'))
@@ -0,0 +1,118 @@
+"""Background refresh of API data into the local store"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from config import COMPETITIONS, REFRESH_IDLE_INTERVAL, REFRESH_LIVE_INTERVAL
+from src.async_api_client import AsyncFootballDataClient
+from src.data_store import MatchStore
+from src.http_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+LIVE_STATUSES = {'IN_PLAY', 'PAUSED'}
+PENDING_STATUSES = {'SCHEDULED', 'TIMED'}
+
+
+def is_live_window(
+    matches: List[Dict],
+    now: Optional[datetime] = None,
+    before: timedelta = timedelta(minutes=15),
+    after: timedelta = timedelta(hours=2, minutes=30)
+) -> bool:
+    """True if a match is in play, or kicks off / may still be running around now"""
+    now = now or datetime.now(timezone.utc)
+
+    for match in matches:
+        status = match.get('status')
+        if status in LIVE_STATUSES:
+            return True
+        if status not in PENDING_STATUSES or not match.get('utcDate'):
+            continue
+        try:
+            kickoff = datetime.fromisoformat(match['utcDate'].replace('Z', '+00:00'))
+        except ValueError:
+            continue
+        if kickoff - before <= now <= kickoff + after:
+            return True
+
+    return False
+
+
+class Refresher:
+    """
+    Periodically pulls standings, fixtures and live matches of every
+    competition into the response cache, which the app then reads as its
+    local store (see config.READ_FROM_STORE), and normalizes them into the
+    match store for indexed queries
+
+    Each competition is refreshed every idle_interval seconds, or every
+    live_interval seconds while one of its matches is (about to be) played.
+    """
+
+    def __init__(
+        self,
+        client: Optional[AsyncFootballDataClient] = None,
+        competitions: Dict[str, int] = COMPETITIONS,
+        idle_interval: float = REFRESH_IDLE_INTERVAL,
+        live_interval: float = REFRESH_LIVE_INTERVAL,
+        base_url: Optional[str] = None,
+        store: Optional[MatchStore] = None
+    ):
+        # TTL nul : chaque passage revalide (requête conditionnelle ou delta)
+        self.client = client or AsyncFootballDataClient(
+            cache=ResponseCache(ttls={'*': (0, 0)}), base_url=base_url, offline=False
+        )
+        self.store = store or MatchStore()
+        self.competitions = competitions
+        self.idle_interval = idle_interval
+        self.live_interval = live_interval
+        self.next_due = {name: 0.0 for name in competitions}
+
+    async def _refresh_competition(self, name: str) -> bool:
+        """Refresh one competition, return whether it is in a live window"""
+        competition_id = self.competitions[name]
+        standings, matches = await asyncio.gather(
+            self.client.get_competition_standings(competition_id),
+            self.client.get_competition_matches(competition_id)
+        )
+        await asyncio.to_thread(self.store.save_standings, standings)
+        await asyncio.to_thread(self.store.save_matches, matches)
+
+        live = is_live_window(matches.get('matches', []))
+        logger.info(f"Refreshed {name} ({'live' if live else 'idle'})")
+        return live
+
+    async def run_once(self) -> float:
+        """Refresh what is due, return the number of seconds until the next refresh"""
+        now = time.time()
+        due = [name for name, at in self.next_due.items() if at <= now]
+
+        results = await asyncio.gather(
+            self.client.get_live_matches(),
+            *(self._refresh_competition(name) for name in due),
+            return_exceptions=True
+        )
+
+        if isinstance(results[0], Exception):
+            logger.error(f"Live matches refresh failed: {results[0]}")
+
+        for name, live in zip(due, results[1:]):
+            if isinstance(live, Exception):
+                logger.error(f"Refresh of {name} failed: {live}")
+                live = False
+            interval = self.live_interval if live else self.idle_interval
+            self.next_due[name] = time.time() + interval
+
+        # le direct est suivi au rythme le plus rapide
+        next_refresh = min(self.next_due.values()) - time.time()
+        return max(min(next_refresh, self.live_interval), 0.0)
+
+    async def run_forever(self) -> None:
+        while True:
+            wait = await self.run_once()
+            logger.info(f"Next refresh in {wait:.0f}s")
+            await asyncio.sleep(wait)
@@ -1,94 +1,494 @@
-import copy
+import numpy as np
 import pandas as pd
-from collections import defaultdict
-from src.ml_predictor import MatchPredictor
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+from scipy.stats import poisson
+from config import GOAL_MODEL_MAX_GOALS
+from src.prediction_matrix import PredictionMatrix
+from src.goal_model import ScoreGrid
+
+# Matchs déjà comptés au classement, ou qui ne seront pas joués
+SETTLED_STATUSES = {'FINISHED', 'AWARDED', 'CANCELLED'}
+
+# Points marqués selon le résultat (0 domicile, 1 nul, 2 extérieur)
+HOME_POINTS = np.array([3.0, 1.0, 0.0])
+AWAY_POINTS = np.array([0.0, 1.0, 3.0])
+
+# Taille fixe des blocs de simulations : chaque bloc a son propre flux
+# aléatoire, le résultat ne dépend donc pas du nombre de workers
+CHUNK_SIZE = 1000
+
+
+def remaining_fixtures(matches: List[Dict]) -> List[Dict]:
+    """Matches still to simulate: every one not settled, in-play and postponed included"""
+    return [match for match in matches if match.get('status') not in SETTLED_STATUSES]
+
+
+def _outcome_score_cdf(home_rate, away_rate, max_goals: int = GOAL_MODEL_MAX_GOALS) -> np.ndarray:
+    """
+    Score CDFs of each fixture given each outcome, shape (n_fixtures, 3, (max_goals + 1) ** 2)
+
+    Independent Poisson scores (cell home * (max_goals + 1) + away) kept
+    to the home win, draw or away win cells and renormalized.
+    """
+    goals = np.arange(max_goals + 1)
+    home_pmf = poisson.pmf(goals, np.asarray(home_rate, dtype=float)[:, None])
+    away_pmf = poisson.pmf(goals, np.asarray(away_rate, dtype=float)[:, None])
+    joint = (home_pmf[:, :, None] * away_pmf[:, None, :]).reshape(len(home_pmf), 1, -1)
+
+    outcome = (np.sign(goals[None, :] - goals[:, None]) + 1).ravel()
+    mass = joint * (outcome[None, :] == np.arange(3)[:, None])
+
+    # issue sans score possible (taux nul) : score minimal 1-0, 0-0 ou 0-1
+    fallback = np.zeros((3, outcome.size))
+    fallback[[0, 1, 2], [max_goals + 1, 0, 1]] = 1
+    mass = np.where(mass.sum(axis=-1, keepdims=True) > 0, mass, fallback)
+
+    cdf = np.cumsum(mass, axis=-1)
+    return cdf / cdf[..., -1:]
+
+
+def _simulate_chunk(simulator, home_idx, away_idx, n_simulations, seed_seq):
+    """Simulate one chunk and return its (n_teams, n_positions) histogram"""
+    rng = np.random.default_rng(seed_seq)
+    positions = simulator._simulate_positions(home_idx, away_idx, n_simulations, rng)
+
+    chunk = SimulationResult(simulator.teams)
+    chunk.add(positions)
+    return chunk.counts
+
+
+class SimulationResult:
+    """
+    Final-position histogram of a season simulation
+
+    counts[i, p] is the number of simulations in which team i finished at
+    position p + 1, so memory does not grow with the number of simulations
+    and every probability below is a slice of the matrix.
+    """
+
+    def __init__(self, teams, counts=None):
+        self.teams = list(teams)
+        n_teams = len(self.teams)
+        self.counts = (
+            np.zeros((n_teams, n_teams), dtype=np.int64) if counts is None
+            else np.asarray(counts, dtype=np.int64)
+        )
+
+    @property
+    def n_teams(self) -> int:
+        return len(self.teams)
+
+    @property
+    def n_simulations(self) -> int:
+        """Each simulation places every team once"""
+        return int(self.counts[0].sum()) if self.n_teams else 0
+
+    def add(self, positions: np.ndarray) -> None:
+        """Accumulate final positions (1-based) of shape (n_simulations, n_teams)"""
+        positions = np.atleast_2d(positions)
+        flat = np.arange(self.n_teams)[None, :] * self.n_teams + (positions - 1)
+
+        self.counts += np.bincount(
+            flat.ravel(), minlength=self.n_teams * self.n_teams
+        ).reshape(self.n_teams, self.n_teams)
+
+    def merge(self, counts: np.ndarray) -> None:
+        """Accumulate a histogram computed elsewhere (e.g. another process)"""
+        self.counts += counts
+
+    def position_range_probability(self, first: int, last: int) -> pd.Series:
+        """Probability of finishing between positions first and last (inclusive)"""
+        hits = self.counts[:, first - 1:last].sum(axis=1)
+        return pd.Series(hits / max(self.n_simulations, 1), index=self.teams)
+
+    def title_probability(self) -> pd.Series:
+        return self.position_range_probability(1, 1)
+
+    def top_probability(self, spots: int = 4) -> pd.Series:
+        return self.position_range_probability(1, spots)
+
+    def relegation_probability(self, spots: int = 3) -> pd.Series:
+        return self.position_range_probability(self.n_teams - spots + 1, self.n_teams)
+
+    def confidence_interval(self, first: int, last: int, z: float = 1.96) -> pd.DataFrame:
+        """Wilson score interval of position_range_probability (low/high columns)"""
+        n = max(self.n_simulations, 1)
+        p = self.position_range_probability(first, last).to_numpy()
+
+        denominator = 1 + z ** 2 / n
+        center = (p + z ** 2 / (2 * n)) / denominator
+        half_width = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominator
+
+        return pd.DataFrame(
+            {'low': center - half_width, 'high': center + half_width},
+            index=self.teams
+        )
+
+    def average_position(self) -> pd.Series:
+        positions = np.arange(1, self.n_teams + 1)
+        return pd.Series(self.counts @ positions / max(self.n_simulations, 1), index=self.teams)
 
 
 class SeasonSimulator:
-    def __init__(self, standings_df: pd.DataFrame):
+    def __init__(
+        self,
+        standings_df: pd.DataFrame,
+        prediction_matrix: Optional[PredictionMatrix] = None,
+        score_grid: Optional[ScoreGrid] = None,
+        ratings: Optional[pd.DataFrame] = None
+    ):
+        if ratings is not None and 'team_id' not in standings_df:
+            # les notes Elo sont jointes par team_id (absent de process_standings)
+            raise ValueError(
+                "ratings need a team_id column in standings_df, e.g. StandingsTable(...).to_dataframe()"
+            )
+
         self.base_standings = standings_df.copy()
-        self.predictor = MatchPredictor()
-
-    def _init_table(self):
-        table = {}
-        for _, row in self.base_standings.iterrows():
-            table[row['team']] = {
-                'points': row['points'],
-                'goal_difference': row['goal_difference'],
-                'played': row['played'],
-                'goals_for': row['goals_for'],
-                'goals_against': row['goals_against'],
-                'won': row['won'],
-                'draw': row['draw'],
-                'lost': row['lost']
-            }
-        return table
-
-    def simulate_match(self, home, away, table):
-        home_data = table[home].copy()
-        away_data = table[away].copy()
-
-        # stats nécessaires au ML
-        for t in (home_data, away_data):
-            t['avg_goals_scored'] = t['goals_for'] / max(t['played'], 1)
-            t['avg_goals_conceded'] = t['goals_against'] / max(t['played'], 1)
-            t['form_points'] = t['won'] * 3 + t['draw']
-
-        home_data['name'] = home
-        away_data['name'] = away
-
-        pred = self.predictor.predict_match(home_data, away_data)
-
-        # résultat
-        if pred['predicted_winner'] == 'home':
-            table[home]['points'] += 3
-            table[home]['won'] += 1
-            table[away]['lost'] += 1
-        elif pred['predicted_winner'] == 'away':
-            table[away]['points'] += 3
-            table[away]['won'] += 1
-            table[home]['lost'] += 1
-        else:
-            table[home]['points'] += 1
-            table[away]['points'] += 1
-            table[home]['draw'] += 1
-            table[away]['draw'] += 1
-
-    def simulate_season(self, remaining_matches, n_simulations=500):
-        results = defaultdict(list)
-
-        for _ in range(n_simulations):
-            table = self._init_table()
-
-            for match in remaining_matches:
-                home = match['homeTeam']['name']
-                away = match['awayTeam']['name']
-
-                if home in table and away in table:
-                    self.simulate_match(home, away, table)
-
-            final = (
-                pd.DataFrame.from_dict(table, orient='index')
-                .sort_values(['points', 'goal_difference'], ascending=False)
+        self.teams = self.base_standings['team'].tolist()
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+
+        # Les probabilités viennent de la matrice : aucun appel au prédicteur
+        # (sans matrice fournie, force Elo des équipes si ratings est donné)
+        self.prediction_matrix = prediction_matrix or PredictionMatrix.from_standings(
+            standings_df, ratings=ratings
+        )
+        self._matrix_idx = np.array(
+            [self.prediction_matrix.team_index[team] for team in self.teams], dtype=np.intp
+        )
+
+        # Modèle de buts : les scores sont tirés de ses matrices de score
+        self.score_grid = score_grid
+        if score_grid is not None:
+            self._grid_idx = score_grid.indices(self.teams)
+
+    def _fixtures(self, remaining_matches):
+        """Map fixtures to (match ids, home, away) team indices, skipping unknown teams"""
+        match_ids, home_idx, away_idx = [], [], []
+
+        for match in remaining_matches:
+            home = self.team_index.get(match['homeTeam']['name'])
+            away = self.team_index.get(match['awayTeam']['name'])
+
+            if home is not None and away is not None and home != away:
+                match_ids.append(match.get('id'))
+                home_idx.append(home)
+                away_idx.append(away)
+
+        return match_ids, np.array(home_idx, dtype=np.intp), np.array(away_idx, dtype=np.intp)
+
+    def _fixture_indices(self, remaining_matches):
+        """Map fixtures to (home, away) team indices, skipping unknown teams"""
+        return self._fixtures(remaining_matches)[1:]
+
+    def _sample_fixtures(self, home_idx, away_idx, n_simulations, rng=None):
+        """
+        Result of every fixture in every simulation
+
+        Without rng the predicted result and score are applied (deterministic
+        model). With a numpy Generator the outcome is drawn from the predicted
+        probabilities, then the score from independent Poisson expected
+        goals restricted to that outcome's scores; with a score grid, the
+        score is drawn from the fixture's score matrix and the outcome
+        follows from it.
+
+        Returns:
+            (winner, home_goals, away_goals) arrays of shape
+            (n_simulations, n_fixtures); winner is 0 home, 1 draw, 2 away
+        """
+        matrix = self.prediction_matrix
+        home, away = self._matrix_idx[home_idx], self._matrix_idx[away_idx]
+        shape = (n_simulations, len(home))
+
+        if rng is None:
+            winner = np.broadcast_to(matrix.predicted_winner[home, away], shape)
+            home_goals = np.broadcast_to(matrix.home_score[home, away], shape)
+            away_goals = np.broadcast_to(matrix.away_score[home, away], shape)
+            return winner, home_goals, away_goals
+
+        if self.score_grid is not None:
+            home_goals, away_goals = self.score_grid.sample(
+                self._grid_idx[home_idx], self._grid_idx[away_idx], n_simulations, rng
             )
+            winner = np.sign(away_goals - home_goals).astype(np.int8) + 1
+            return winner, home_goals, away_goals
+
+        home_prob = matrix.home_win[home, away]
+        u = rng.random(shape)
+        home_win = u < home_prob
+        draw = ~home_win & (u < home_prob + matrix.draw[home, away])
+        winner = np.where(home_win, 0, np.where(draw, 1, 2)).astype(np.int8)
+
+        # score tiré parmi les scores de l'issue tirée (Poisson restreint à l'issue)
+        cdf = _outcome_score_cdf(matrix.home_expected_goals[home, away], matrix.away_expected_goals[home, away])
+        n_rows, n_cells = cdf.shape[0] * 3, cdf.shape[-1]
+        rows = np.arange(len(home)) * 3 + winner
+        flat = (cdf.reshape(n_rows, n_cells) + np.arange(n_rows)[:, None]).ravel()
+        cells = np.searchsorted(flat, rng.random(shape) + rows, side='right') - rows * n_cells
+        np.minimum(cells, n_cells - 1, out=cells)
 
-            for pos, team in enumerate(final.index, start=1):
-                results[team].append(pos)
+        home_goals, away_goals = np.divmod(cells, GOAL_MODEL_MAX_GOALS + 1)
+        return winner, home_goals, away_goals
 
-        return results
+    def _final_table(self, home_idx, away_idx, winner, home_goals, away_goals):
+        """Final points and goal difference per simulation, shape (n_simulations, n_teams)"""
+        n_fixtures, n_teams = len(home_idx), len(self.teams)
+
+        # fixture -> équipe (+1 domicile, -1 extérieur) pour sommer par matmul
+        home_onehot = np.zeros((n_fixtures, n_teams))
+        away_onehot = np.zeros((n_fixtures, n_teams))
+        home_onehot[np.arange(n_fixtures), home_idx] = 1
+        away_onehot[np.arange(n_fixtures), away_idx] = 1
+
+        home_points = HOME_POINTS[winner]
+        away_points = AWAY_POINTS[winner]
+        margin = (home_goals - away_goals).astype(float)
+
+        points = home_points @ home_onehot + away_points @ away_onehot
+        goal_difference = margin @ (home_onehot - away_onehot)
+
+        return {
+            'points': self.base_standings['points'].to_numpy(dtype=np.int64) + points.astype(np.int64),
+            'goal_difference': (
+                self.base_standings['goal_difference'].to_numpy(dtype=np.int64)
+                + goal_difference.astype(np.int64)
+            )
+        }
+
+    @staticmethod
+    def _rank(table):
+        """Final positions (1-based) per simulation, shape (n_simulations, n_teams)"""
+        # lexsort est stable : à égalité, l'ordre du classement de départ est conservé
+        order = np.lexsort((-table['goal_difference'], -table['points']), axis=-1)
+
+        positions = np.empty_like(order)
+        np.put_along_axis(
+            positions, order, np.arange(1, order.shape[1] + 1)[None, :], axis=1
+        )
+        return positions
+
+    def _simulate_positions(self, home_idx, away_idx, n_simulations, rng=None):
+        """Play all fixtures and return final positions (n_simulations, n_teams)"""
+        sampled = self._sample_fixtures(home_idx, away_idx, n_simulations, rng)
+        return self._rank(self._final_table(home_idx, away_idx, *sampled))
+
+    def _run_chunks(self, home_idx, away_idx, sizes, children, workers, window):
+        """Yield chunk histograms in chunk order, submitting `window` chunks at a time"""
+        if not workers or workers <= 1 or len(sizes) <= 1:
+            for size, child in zip(sizes, children):
+                yield _simulate_chunk(self, home_idx, away_idx, size, child)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for start in range(0, len(sizes), window):
+                futures = [
+                    executor.submit(_simulate_chunk, self, home_idx, away_idx, size, child)
+                    for size, child in zip(sizes[start:start + window], children[start:start + window])
+                ]
+                for future in futures:
+                    yield future.result()
+
+    @staticmethod
+    def _converged(result, tolerance, relegation_spots, z):
+        """True when every title and relegation interval is narrower than ±tolerance"""
+        n_teams = result.n_teams
+        for first, last in ((1, 1), (n_teams - relegation_spots + 1, n_teams)):
+            interval = result.confidence_interval(first, last, z)
+            if ((interval['high'] - interval['low']) / 2).max() > tolerance:
+                return False
+        return True
+
+    def simulate_season(
+        self,
+        remaining_matches,
+        n_simulations=500,
+        stochastic=True,
+        seed=None,
+        workers=None,
+        tolerance=None,
+        chunk_size=CHUNK_SIZE,
+        relegation_spots=3,
+        z=1.96
+    ):
+        """
+        Monte Carlo over the remaining fixtures, vectorized across simulations
+
+        Args:
+            remaining_matches: Fixtures still to play (API match dicts)
+            n_simulations: Number of simulated seasons
+            stochastic: Draw outcomes from the predicted probabilities. When
+                False the predicted result is always applied, so the season
+                is simulated once and repeated n_simulations times.
+            seed: Seed (int or numpy SeedSequence) for reproducible simulations
+            workers: Number of processes to spread the chunks over (None runs
+                in-process). Results for a given seed do not depend on it.
+            tolerance: Target precision. Simulations run chunk by chunk and
+                stop once every title and relegation probability is known
+                within ±tolerance (confidence level given by z);
+                n_simulations is then the maximum budget.
+            chunk_size: Number of simulations per chunk
+            relegation_spots: Relegation places, used by the tolerance check
+
+        Returns:
+            SimulationResult; its n_simulations is the number actually run
+        """
+        result = SimulationResult(self.teams)
+
+        if n_simulations == 0:
+            return result
+
+        home_idx, away_idx = self._fixture_indices(remaining_matches)
+
+        if not stochastic:
+            # modèle déterministe : toutes les simulations sont identiques
+            positions = self._simulate_positions(home_idx, away_idx, 1)
+            result.add(np.repeat(positions, n_simulations, axis=0))
+            return result
+
+        seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        sizes = [chunk_size] * (n_simulations // chunk_size)
+        if n_simulations % chunk_size:
+            sizes.append(n_simulations % chunk_size)
+        children = seed_seq.spawn(len(sizes))
+
+        # en mode précision cible, on ne lance qu'un bloc par worker à la fois
+        window = (workers or 1) if tolerance is not None else len(sizes)
+
+        for counts in self._run_chunks(home_idx, away_idx, sizes, children, workers, window):
+            result.merge(counts)
+
+            if tolerance is not None and self._converged(result, tolerance, relegation_spots, z):
+                break
+
+        return result
+
+    def start_season(self, remaining_matches, n_simulations=500, seed=None, chunk_size=CHUNK_SIZE):
+        """
+        Monte Carlo that keeps its sampled fixtures, for incremental updates
+
+        Chunks and seeds are the same as simulate_season (for a given seed
+        the result is identical), but the sampled outcomes and the final
+        totals of every simulation are kept in a SeasonState, so results
+        can later be applied one fixture at a time.
+        """
+        match_ids, home_idx, away_idx = self._fixtures(remaining_matches)
+
+        seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        sizes = [chunk_size] * (n_simulations // chunk_size)
+        if n_simulations % chunk_size:
+            sizes.append(n_simulations % chunk_size)
+
+        samples = [
+            self._sample_fixtures(home_idx, away_idx, size, np.random.default_rng(child))
+            for size, child in zip(sizes, seed_seq.spawn(len(sizes)))
+        ]
+        winner, home_goals, away_goals = (
+            np.concatenate([sample[k] for sample in samples]) if samples
+            else np.zeros((0, len(home_idx)), dtype=np.int64)
+            for k in range(3)
+        )
+        return SeasonState(self, match_ids, home_idx, away_idx, winner, home_goals, away_goals)
 
     @staticmethod
-    def summarize(results, relegation_spots=3):
-        summary = []
-
-        for team, positions in results.items():
-            summary.append({
-                'team': team,
-                'avg_position': round(sum(positions) / len(positions), 2),
-                'title_prob_%': round(positions.count(1) / len(positions) * 100, 1),
-                'relegation_prob_%': round(
-                    sum(p > (20 - relegation_spots) for p in positions) / len(positions) * 100, 1
-                )
-            })
-
-        return pd.DataFrame(summary).sort_values('avg_position')
+    def summarize(results: SimulationResult, relegation_spots=3, top_spots=4):
+        summary = pd.DataFrame({
+            'team': results.teams,
+            'avg_position': results.average_position().round(2).values,
+            'title_prob_%': (results.title_probability() * 100).round(1).values,
+            f'top{top_spots}_prob_%': (results.top_probability(top_spots) * 100).round(1).values,
+            'relegation_prob_%': (results.relegation_probability(relegation_spots) * 100).round(1).values
+        })
+        # tailles des zones, reprises par MatchStore.save_simulation
+        summary.attrs.update(top_spots=top_spots, relegation_spots=relegation_spots)
+
+        return summary.sort_values('avg_position')
+
+
+class SeasonState:
+    """
+    Sampled fixtures of a season simulation, updated result by result
+
+    winner/home_goals/away_goals hold the outcome of every fixture in
+    every simulation (n_simulations x n_fixtures) and points /
+    goal_difference the final totals they produce (n_simulations x
+    n_teams). When a fixture is played, its column is replaced by the
+    actual result and only the two teams' totals change, in
+    O(n_simulations); ranking again gives the new odds. Every other
+    fixture keeps its draws (common random numbers), so odds move with
+    the result instead of with Monte Carlo noise.
+    """
+
+    def __init__(self, simulator, match_ids, home_idx, away_idx, winner, home_goals, away_goals):
+        self.simulator = simulator
+        self.teams = simulator.teams
+        self.match_ids = list(match_ids)
+        self.columns = {match_id: k for k, match_id in enumerate(self.match_ids)}
+        self.home_idx, self.away_idx = home_idx, away_idx
+
+        # petits entiers : la matrice d'échantillons reste compacte
+        self.winner = np.asarray(winner, dtype=np.int8)
+        self.home_goals = np.asarray(home_goals, dtype=np.int16)
+        self.away_goals = np.asarray(away_goals, dtype=np.int16)
+        self.played = np.zeros(len(self.match_ids), dtype=bool)
+
+        table = simulator._final_table(home_idx, away_idx, self.winner, self.home_goals, self.away_goals)
+        self.points, self.goal_difference = table['points'], table['goal_difference']
+        base = simulator.base_standings
+        self.actual_points = base['points'].to_numpy(dtype=np.int64, copy=True)
+        self.actual_goal_difference = base['goal_difference'].to_numpy(dtype=np.int64, copy=True)
+
+    @property
+    def n_simulations(self) -> int:
+        return len(self.points)
+
+    def pending(self) -> List:
+        """Ids of the fixtures still simulated"""
+        return [match_id for match_id, played in zip(self.match_ids, self.played) if not played]
+
+    def apply_result(self, match: Dict) -> bool:
+        """
+        Replace a fixture's simulated outcomes by its final score
+
+        Returns:
+            False if the fixture is not simulated here, already applied or
+            has no score
+        """
+        k = self.columns.get(match.get('id'))
+        full_time = (match.get('score') or {}).get('fullTime') or {}
+        home_goals, away_goals = full_time.get('home'), full_time.get('away')
+        if k is None or self.played[k] or home_goals is None or away_goals is None:
+            return False
+
+        home, away = self.home_idx[k], self.away_idx[k]
+        winner = 0 if home_goals > away_goals else 1 if home_goals == away_goals else 2
+
+        # retrait du résultat simulé, ajout du résultat réel
+        self.points[:, home] += int(HOME_POINTS[winner]) - HOME_POINTS[self.winner[:, k]].astype(np.int64)
+        self.points[:, away] += int(AWAY_POINTS[winner]) - AWAY_POINTS[self.winner[:, k]].astype(np.int64)
+        margin = self.home_goals[:, k].astype(np.int64) - self.away_goals[:, k]
+        self.goal_difference[:, home] += (home_goals - away_goals) - margin
+        self.goal_difference[:, away] -= (home_goals - away_goals) - margin
+
+        self.actual_points[[home, away]] += (int(HOME_POINTS[winner]), int(AWAY_POINTS[winner]))
+        self.actual_goal_difference[[home, away]] += (home_goals - away_goals, away_goals - home_goals)
+
+        self.winner[:, k] = winner
+        self.home_goals[:, k] = home_goals
+        self.away_goals[:, k] = away_goals
+        self.played[k] = True
+        return True
+
+    def apply_results(self, matches: List[Dict]) -> int:
+        """Apply the FINISHED matches of a list, return the number applied"""
+        return sum(self.apply_result(match) for match in matches if match.get('status') == 'FINISHED')
+
+    def current_table(self) -> Dict[str, np.ndarray]:
+        """Actual points and goal difference: starting standings plus the applied results"""
+        return {'points': self.actual_points.copy(), 'goal_difference': self.actual_goal_difference.copy()}
+
+    def result(self) -> SimulationResult:
+        """Final-position histogram from the current totals"""
+        result = SimulationResult(self.teams)
+        if self.n_simulations:
+            result.add(self.simulator._rank({'points': self.points, 'goal_difference': self.goal_difference}))
+        return result
@@ -0,0 +1,205 @@
+"""Incremental standings: apply finished matches to a standings snapshot"""
+
+import copy
+import logging
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from config import DEFAULT_TIE_BREAKERS, TIE_BREAKERS
+from src.ingestion import standings_columns
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = ['played', 'won', 'draw', 'lost', 'goals_for', 'goals_against', 'points']
+HEAD_TO_HEAD = {'h2h_points', 'h2h_goal_difference', 'h2h_goals_for'}
+LIVE_STATUSES = {'IN_PLAY', 'PAUSED'}
+
+
+class StandingsTable:
+    """
+    A league table updated match by match
+
+    Built once from a standings snapshot, then each newly finished match
+    updates the two teams' counters in O(1). Matches are identified by id
+    so the same result is never counted twice. Positions are recomputed
+    with the competition's tie-break rules (config.TIE_BREAKERS) when the
+    table is read; teams still level keep their snapshot order.
+    """
+
+    def __init__(
+        self,
+        standings_data: Union[Dict, pd.DataFrame],
+        competition_id: Optional[int] = None,
+        tie_breakers: Optional[Sequence[str]] = None,
+        results: Optional[List[Dict]] = None
+    ):
+        """
+        Args:
+            standings_data: Standings payload, or a DataFrame with the
+                columns of process_standings plus team_id
+            competition_id: Selects the tie-break rules (read from the
+                payload when omitted)
+            tie_breakers: Explicit ranking keys, overriding the competition's
+            results: Matches already counted in the snapshot (e.g. the
+                season's matches fetched with it): they are never applied
+                again and feed head-to-head tie-breaks
+        """
+        if isinstance(standings_data, pd.DataFrame):
+            columns = {name: standings_data[name].to_numpy() for name in standings_data}
+        else:
+            columns = standings_columns(standings_data)
+            competition_id = competition_id or (standings_data.get('competition') or {}).get('id')
+
+        self.team_ids = np.asarray(columns['team_id'])
+        self.teams = np.asarray(columns['team'], dtype=object)
+        self.snapshot_position = np.asarray(columns['position'])
+        self.index = {team_id: i for i, team_id in enumerate(self.team_ids.tolist())}
+        self.counters = np.stack([np.asarray(columns[name], dtype=np.int64) for name in COUNTERS])
+        self.tie_breakers = list(tie_breakers or TIE_BREAKERS.get(competition_id, DEFAULT_TIE_BREAKERS))
+
+        self.applied = set()
+        # résultats (i domicile, j extérieur, buts) pour les confrontations directes
+        self.results: List[tuple] = []
+        for match in results or []:
+            self._record(match)
+
+    def __len__(self) -> int:
+        return len(self.team_ids)
+
+    def copy(self) -> 'StandingsTable':
+        table = copy.copy(self)
+        table.counters = self.counters.copy()
+        table.applied = set(self.applied)
+        table.results = list(self.results)
+        return table
+
+    @staticmethod
+    def _score(match: Dict) -> Optional[tuple]:
+        full_time = (match.get('score') or {}).get('fullTime') or {}
+        home_goals, away_goals = full_time.get('home'), full_time.get('away')
+        if home_goals is None or away_goals is None:
+            return None
+        return home_goals, away_goals
+
+    def _teams(self, match: Dict) -> Optional[tuple]:
+        home = self.index.get((match.get('homeTeam') or {}).get('id'))
+        away = self.index.get((match.get('awayTeam') or {}).get('id'))
+        if home is None or away is None or home == away:
+            return None
+        return home, away
+
+    def _record(self, match: Dict) -> None:
+        """Note a match already counted in the snapshot"""
+        teams, score = self._teams(match), self._score(match)
+        if match.get('status') == 'FINISHED' and teams is not None and score is not None:
+            self.results.append((*teams, *score))
+            self.applied.add(match.get('id'))
+
+    def _add(self, home: int, away: int, home_goals: int, away_goals: int) -> None:
+        played, won, draw, lost, goals_for, goals_against, points = range(len(COUNTERS))
+        c = self.counters
+        c[played, [home, away]] += 1
+        c[goals_for, home] += home_goals
+        c[goals_against, home] += away_goals
+        c[goals_for, away] += away_goals
+        c[goals_against, away] += home_goals
+
+        if home_goals == away_goals:
+            c[draw, [home, away]] += 1
+            c[points, [home, away]] += 1
+        else:
+            winner, loser = (home, away) if home_goals > away_goals else (away, home)
+            c[won, winner] += 1
+            c[lost, loser] += 1
+            c[points, winner] += 3
+
+    def apply_match(self, match: Dict) -> bool:
+        """
+        Count a finished match, return whether the table changed
+
+        Matches already applied, without a score or between teams not in
+        the table are ignored.
+        """
+        match_id = match.get('id')
+        if match_id in self.applied:
+            return False
+
+        teams, score = self._teams(match), self._score(match)
+        if teams is None or score is None:
+            return False
+
+        self._add(*teams, *score)
+        self.results.append((*teams, *score))
+        self.applied.add(match_id)
+        return True
+
+    def apply_matches(self, matches: List[Dict]) -> int:
+        """Count the FINISHED matches of a list, return the number applied"""
+        return sum(self.apply_match(match) for match in matches if match.get('status') == 'FINISHED')
+
+    def with_live(self, matches: List[Dict]) -> 'StandingsTable':
+        """Copy of the table with matches in play counted at their current score"""
+        table = self.copy()
+        for match in matches:
+            if match.get('status') in LIVE_STATUSES:
+                teams, score = table._teams(match), table._score(match)
+                if teams is not None and score is not None:
+                    table._add(*teams, *score)
+                    table.results.append((*teams, *score))
+        return table
+
+    def _head_to_head(self, points: np.ndarray) -> Dict[str, np.ndarray]:
+        """Mini-table of the matches between teams level on points"""
+        h2h = {key: np.zeros(len(self), dtype=np.int64) for key in HEAD_TO_HEAD}
+        if not self.results:
+            return h2h
+
+        home, away, home_goals, away_goals = np.array(self.results).T
+        level = points[home] == points[away]
+        home, away, home_goals, away_goals = home[level], away[level], home_goals[level], away_goals[level]
+
+        home_points = np.select([home_goals > away_goals, home_goals == away_goals], [3, 1], 0)
+        away_points = np.select([away_goals > home_goals, home_goals == away_goals], [3, 1], 0)
+        n = len(self)
+        h2h['h2h_points'] = (
+            np.bincount(home, home_points, n) + np.bincount(away, away_points, n)
+        ).astype(np.int64)
+        h2h['h2h_goals_for'] = (
+            np.bincount(home, home_goals, n) + np.bincount(away, away_goals, n)
+        ).astype(np.int64)
+        h2h['h2h_goal_difference'] = h2h['h2h_goals_for'] - (
+            np.bincount(home, away_goals, n) + np.bincount(away, home_goals, n)
+        ).astype(np.int64)
+        return h2h
+
+    def ranking(self) -> np.ndarray:
+        """Row indices from first to last under the tie-break rules"""
+        values = dict(zip(COUNTERS, self.counters))
+        values['goal_difference'] = values['goals_for'] - values['goals_against']
+        if HEAD_TO_HEAD.intersection(self.tie_breakers):
+            values.update(self._head_to_head(values['points']))
+
+        # lexsort : dernière clé prioritaire ; à égalité complète, ordre du snapshot
+        keys = [self.snapshot_position] + [-values[key] for key in reversed(self.tie_breakers)]
+        return np.lexsort(keys)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Current table, same columns as process_standings plus team_id"""
+        order = self.ranking()
+        values = dict(zip(COUNTERS, self.counters[:, order]))
+
+        return pd.DataFrame({
+            'position': np.arange(1, len(self) + 1),
+            'team': self.teams[order],
+            'played': values['played'],
+            'won': values['won'],
+            'draw': values['draw'],
+            'lost': values['lost'],
+            'goals_for': values['goals_for'],
+            'goals_against': values['goals_against'],
+            'goal_difference': values['goals_for'] - values['goals_against'],
+            'points': values['points'],
+            'team_id': self.team_ids[order]
+        })
@@ -0,0 +1,95 @@
+"""Shared fixtures: a local fake football-data API"""
+
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+class FakeAPI:
+    """
+    HTTP server answering API paths from handlers set by the test
+
+    Each handler receives (path, headers) and returns (status, headers,
+    payload); every request is recorded in `requests`.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                path = self.path.split('/v4/', 1)[1]
+                api.requests.append((path, dict(self.headers)))
+                route = api.routes.get(path.split('?', 1)[0])
+                status, headers, payload = route(path, self.headers) if route else (404, {}, {})
+
+                body = b'' if status == 304 else json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v4"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def paths(self):
+        return [path for path, _ in self.requests]
+
+
+@pytest.fixture
+def fake_api():
+    api = FakeAPI()
+    yield api
+    api.server.shutdown()
+    api.server.server_close()
+
+
+@pytest.fixture
+def client(fake_api, tmp_path):
+    """Client of the fake API, with an always-expired cache and an unthrottled limiter"""
+    from src.api_client import FootballDataClient
+    from src.http_cache import ResponseCache
+    from src.rate_limiter import TokenBucket
+
+    client = FootballDataClient(
+        cache=ResponseCache(tmp_path / 'cache.sqlite', ttls={'*': (0, 0)}),
+        base_url=fake_api.url,
+        max_retries=2,
+        limiter=TokenBucket(requests_per_minute=6000),
+        offline=False
+    )
+    yield client
+    client.session.close()
+
+
+def match(match_id, home, away, status='FINISHED', home_goals=None, away_goals=None,
+          date='2025-01-01T15:00:00Z', matchday=1):
+    """Match payload in the API format; teams are (id, name) tuples"""
+    return {
+        'id': match_id,
+        'competition': {'id': 2021, 'name': 'Premier League'},
+        'season': {'startDate': '2024-08-01'},
+        'utcDate': date,
+        'status': status,
+        'matchday': matchday,
+        'homeTeam': {'id': home[0], 'name': home[1]},
+        'awayTeam': {'id': away[0], 'name': away[1]},
+        'score': {'fullTime': {'home': home_goals, 'away': away_goals}},
+    }
@@ -0,0 +1,75 @@
+"""FootballDataClient against the fake API: conditional GETs, deltas and retries"""
+
+import pytest
+import requests
+
+from conftest import match
+
+ARSENAL, CHELSEA, LIVERPOOL = (57, 'Arsenal'), (61, 'Chelsea'), (64, 'Liverpool')
+
+
+def test_not_modified_reuses_cached_body(fake_api, client):
+    standings = {'standings': [{'type': 'TOTAL', 'table': []}], 'competition': {'id': 2021}}
+
+    def route(path, headers):
+        if headers.get('If-None-Match') == '"v1"':
+            return 304, {'ETag': '"v1"'}, None
+        return 200, {'ETag': '"v1"'}, standings
+
+    fake_api.routes['competitions/2021/standings'] = route
+
+    assert client.get_competition_standings(2021) == standings
+    assert client.get_competition_standings(2021) == standings
+
+    first, second = fake_api.requests
+    assert 'If-None-Match' not in first[1]
+    assert second[1]['If-None-Match'] == '"v1"'
+
+
+def test_refresh_merges_date_window_into_season(fake_api, client):
+    season = {'matches': [
+        match(1, ARSENAL, CHELSEA, 'FINISHED', 2, 1, date='2025-01-01T15:00:00Z'),
+        match(2, CHELSEA, LIVERPOOL, 'TIMED', date='2025-01-08T15:00:00Z'),
+    ]}
+    delta = {'matches': [
+        match(2, CHELSEA, LIVERPOOL, 'FINISHED', 0, 0, date='2025-01-08T15:00:00Z'),
+        match(3, LIVERPOOL, ARSENAL, 'TIMED', date='2025-01-15T15:00:00Z'),
+    ]}
+
+    def route(path, headers):
+        # pas de validateurs : le client doit passer par la fenêtre de dates
+        return 200, {}, delta if 'dateFrom=' in path else season
+
+    fake_api.routes['competitions/2021/matches'] = route
+
+    client.get_competition_matches(2021)
+    merged = client.get_competition_matches(2021)
+
+    assert 'dateFrom=' in fake_api.paths()[1] and 'dateTo=' in fake_api.paths()[1]
+    assert [m['id'] for m in merged['matches']] == [1, 2, 3]
+    assert merged['matches'][1]['status'] == 'FINISHED'
+    assert client.cache.get('competitions/2021/matches').json() == merged
+
+
+def test_date_bounds_only_sent_when_given(fake_api, client):
+    fake_api.routes['competitions/2021/matches'] = lambda path, headers: (200, {}, {'matches': []})
+
+    client.get_competition_matches(2021, date_from='2025-01-01')
+    client.get_competition_matches(2021, date_to='2025-02-01')
+
+    assert fake_api.paths() == [
+        'competitions/2021/matches?dateFrom=2025-01-01',
+        'competitions/2021/matches?dateTo=2025-02-01',
+    ]
+
+
+def test_server_errors_are_retried_then_raised(fake_api, client, monkeypatch):
+    delays = []
+    monkeypatch.setattr(client, '_retry_delay', lambda response, attempt: delays.append(attempt) or 0.0)
+    fake_api.routes['competitions/2021/standings'] = lambda path, headers: (503, {}, {})
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get_competition_standings(2021)
+
+    assert len(fake_api.requests) == client.max_retries + 1
+    assert delays == list(range(client.max_retries))
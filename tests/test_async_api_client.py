@@ -0,0 +1,71 @@
+"""AsyncFootballDataClient against the fake API: fan-out and coalescing"""
+
+import asyncio
+import threading
+import time
+
+from src.api_client import FootballDataClient
+from src.async_api_client import AsyncFootballDataClient
+from src.http_cache import ResponseCache
+from src.rate_limiter import TokenBucket
+
+COMPETITIONS = {'PL': 2021, 'PD': 2014, 'SA': 2019, 'BL1': 2002}
+
+
+def slow_standings(fake_api, delay=0.2):
+    """Standings routes that answer after `delay`; returns the peak of concurrent requests"""
+    active = {'now': 0, 'peak': 0}
+    lock = threading.Lock()
+
+    def route(path, headers):
+        with lock:
+            active['now'] += 1
+            active['peak'] = max(active['peak'], active['now'])
+        time.sleep(delay)
+        with lock:
+            active['now'] -= 1
+        return 200, {}, {'competition': {'id': int(path.split('/')[1])}, 'standings': []}
+
+    for competition_id in COMPETITIONS.values():
+        fake_api.routes[f'competitions/{competition_id}/standings'] = route
+    return active
+
+
+def test_executor_sized_from_the_client(fake_api, tmp_path):
+    client = FootballDataClient(
+        cache=ResponseCache(tmp_path / 'cache.sqlite', ttls={'*': (0, 0)}),
+        base_url=fake_api.url,
+        pool_size=3,
+        limiter=TokenBucket(requests_per_minute=6000),
+        offline=False
+    )
+    async_client = AsyncFootballDataClient(client)
+
+    assert async_client._executor._max_workers == 3
+    async_client.close()
+
+
+def test_competitions_fetched_concurrently(fake_api, client):
+    active = slow_standings(fake_api)
+    async_client = AsyncFootballDataClient(client)
+
+    standings = asyncio.run(async_client.fetch_all_standings(COMPETITIONS))
+
+    assert {name: s['competition']['id'] for name, s in standings.items()} == COMPETITIONS
+    assert active['peak'] > 1
+    async_client.close()
+
+
+def test_identical_requests_coalesced(fake_api, client):
+    slow_standings(fake_api)
+    async_client = AsyncFootballDataClient(client)
+
+    async def fetch():
+        return await asyncio.gather(*(async_client.get_competition_standings(2021) for _ in range(5)))
+
+    results = asyncio.run(fetch())
+
+    assert all(result == results[0] for result in results)
+    assert fake_api.paths() == ['competitions/2021/standings']
+    assert not async_client._in_flight
+    async_client.close()
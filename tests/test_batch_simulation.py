@@ -0,0 +1,63 @@
+"""BatchSimulator: fixtures still to play and incremental updates"""
+
+import copy
+
+from conftest import match
+from src.batch_simulation import BatchSimulator
+from src.data_store import MatchStore
+from src.season_similator import remaining_fixtures
+from test_standings_engine import row
+
+TEAMS = [(1, 'Alpha'), (2, 'Bravo'), (3, 'Charlie'), (4, 'Delta')]
+
+
+class StubClient:
+    def __init__(self):
+        self.table = [row(k + 1, team, 0, 0, 0, 0, 0, 0) for k, team in enumerate(TEAMS)]
+        self.matches = [
+            match(len(TEAMS) * i + j, home, away, 'TIMED', date=f'2025-01-{1 + i * 4 + j:02d}T15:00:00Z')
+            for i, home in enumerate(TEAMS) for j, away in enumerate(TEAMS) if home != away
+        ]
+
+    def get_competition_standings(self, competition_id):
+        return {'competition': {'id': competition_id}, 'standings': [{'type': 'TOTAL', 'table': copy.deepcopy(self.table)}]}
+
+    def get_competition_matches(self, competition_id):
+        return {'competition': {'id': competition_id}, 'matches': copy.deepcopy(self.matches)}
+
+    def finish(self, match_id, home_goals, away_goals):
+        played = next(m for m in self.matches if m['id'] == match_id)
+        played.update(status='FINISHED', score={'fullTime': {'home': home_goals, 'away': away_goals}})
+        for team, scored, conceded in ((played['homeTeam'], home_goals, away_goals), (played['awayTeam'], away_goals, home_goals)):
+            entry = next(r for r in self.table if r['team']['id'] == team['id'])
+            won, draw = scored > conceded, scored == conceded
+            entry.update(
+                playedGames=entry['playedGames'] + 1, won=entry['won'] + won, draw=entry['draw'] + draw,
+                lost=entry['lost'] + (not won and not draw), goalsFor=entry['goalsFor'] + scored,
+                goalsAgainst=entry['goalsAgainst'] + conceded, points=entry['points'] + 3 * won + draw,
+                goalDifference=entry['goalDifference'] + scored - conceded,
+            )
+
+
+def test_every_unsettled_fixture_remains():
+    statuses = ['SCHEDULED', 'TIMED', 'IN_PLAY', 'PAUSED', 'POSTPONED', 'SUSPENDED', 'FINISHED', 'AWARDED', 'CANCELLED']
+    matches = [dict(match(k, *TEAMS[:2]), status=status) for k, status in enumerate(statuses)]
+
+    assert [m['status'] for m in remaining_fixtures(matches)] == statuses[:6]
+
+
+def test_in_play_fixture_keeps_the_simulation(tmp_path):
+    client = StubClient()
+    batch = BatchSimulator(client, MatchStore(tmp_path / 'store.db'), {'PL': 2021}, n_simulations=300, workers=1)
+    assert list(batch.run(seed=1)) == [2021]
+    state = batch.states[2021]
+
+    # match en cours : ni nouveau résultat, ni fixture en moins
+    live = client.matches[0]
+    live.update(status='IN_PLAY', score={'fullTime': {'home': 1, 'away': 0}})
+    assert batch.run(seed=1) == {}
+
+    # puis terminé : appliqué aux simulations gardées
+    client.finish(live['id'], 2, 0)
+    assert list(batch.run(seed=1)) == [2021]
+    assert batch.states[2021] is state and live['id'] not in state.pending()
@@ -0,0 +1,68 @@
+"""Form and team statistics against the outputs of the original per-team loops"""
+
+from conftest import match
+from src.data_processor import FootballDataProcessor
+
+ALPHA, BRAVO, CHARLIE, UNKNOWN = (1, 'Alpha'), (2, 'Bravo'), (3, 'Charlie'), (None, None)
+
+MATCHES = [
+    match(1, ALPHA, BRAVO, 'FINISHED', 2, 1, date='2025-01-04T15:00:00Z'),
+    match(2, CHARLIE, ALPHA, 'FINISHED', 0, 0, date='2025-01-11T15:00:00Z'),
+    match(3, BRAVO, CHARLIE, 'FINISHED', 3, 2, date='2025-01-18T15:00:00Z'),
+    match(4, ALPHA, CHARLIE, 'FINISHED', 1, 3, date='2025-01-25T15:00:00Z'),
+    match(5, BRAVO, ALPHA, 'TIMED', date='2025-02-01T15:00:00Z'),
+    # adversaire pas encore connu (phase finale)
+    match(6, UNKNOWN, CHARLIE, 'TIMED', date='2025-02-08T15:00:00Z'),
+]
+
+# Sorties des anciennes boucles (calculate_form sur les matchs joués, plus
+# récent d'abord ; calculate_team_stats sur tous les matchs de l'équipe)
+BASELINE_FORM = {
+    1: {'form_string': 'LDW', 'wins': 1, 'draws': 1, 'losses': 1, 'goals_scored': 3, 'goals_conceded': 4, 'points': 4},
+    2: {'form_string': 'WL', 'wins': 1, 'draws': 0, 'losses': 1, 'goals_scored': 4, 'goals_conceded': 4, 'points': 3},
+    3: {'form_string': 'WLD', 'wins': 1, 'draws': 1, 'losses': 1, 'goals_scored': 5, 'goals_conceded': 4, 'points': 4},
+}
+BASELINE_STATS = {
+    1: {'total_matches': 4, 'home_matches': 2, 'away_matches': 2, 'goals_scored': 3, 'goals_conceded': 4,
+        'avg_goals_scored': 0.75, 'avg_goals_conceded': 1.0},
+    2: {'total_matches': 3, 'home_matches': 2, 'away_matches': 1, 'goals_scored': 4, 'goals_conceded': 4,
+        'avg_goals_scored': 1.33, 'avg_goals_conceded': 1.33},
+    3: {'total_matches': 4, 'home_matches': 1, 'away_matches': 3, 'goals_scored': 5, 'goals_conceded': 4,
+        'avg_goals_scored': 1.25, 'avg_goals_conceded': 1.0},
+}
+
+
+def team_matches(team_id, tagged=True):
+    """Matches of one team, tagged as the app does (team_id and venue on each match)"""
+    matches = [m for m in MATCHES if team_id in (m['homeTeam']['id'], m['awayTeam']['id'])]
+    if not tagged:
+        return matches
+    return [dict(m, team_id=team_id, venue='HOME' if m['homeTeam']['id'] == team_id else 'AWAY') for m in matches]
+
+
+def test_form_matches_baseline():
+    for team_id, expected in BASELINE_FORM.items():
+        matches = team_matches(team_id)
+        # matchs sans score ignorés, plus récents d'abord quel que soit l'ordre reçu
+        assert FootballDataProcessor.calculate_form(matches, 3) == expected
+        assert FootballDataProcessor.calculate_form(matches[::-1], 3) == expected
+
+    assert FootballDataProcessor.calculate_form(team_matches(2), 1)['form_string'] == 'W'
+    assert FootballDataProcessor.calculate_form([MATCHES[4]], team_id=1)['form_string'] == 'N/A'
+
+
+def test_team_stats_match_baseline():
+    for team_id, expected in BASELINE_STATS.items():
+        assert FootballDataProcessor.calculate_team_stats(team_matches(team_id)) == expected
+        assert FootballDataProcessor.calculate_team_stats(team_matches(team_id, tagged=False), team_id=team_id) == expected
+
+
+def test_competition_frames_match_baseline():
+    forms = FootballDataProcessor.calculate_forms(MATCHES, 3)
+    stats = FootballDataProcessor.calculate_competition_stats(MATCHES)
+
+    # équipe sans id écartée
+    assert sorted(forms.index) == sorted(stats.index) == [1, 2, 3]
+    for team_id in BASELINE_FORM:
+        assert forms.loc[team_id, list(BASELINE_FORM[team_id])].to_dict() == BASELINE_FORM[team_id]
+        assert stats.loc[team_id, list(BASELINE_STATS[team_id])].to_dict() == BASELINE_STATS[team_id]
@@ -0,0 +1,36 @@
+"""MatchStore simulation results"""
+
+import numpy as np
+import pytest
+
+from src.data_store import MatchStore
+from src.season_similator import SeasonSimulator, SimulationResult
+
+TEAMS = ['Alpha', 'Bravo', 'Charlie', 'Delta', 'Echo', 'Foxtrot']
+
+
+def summary(**spots):
+    result = SimulationResult(TEAMS)
+    rng = np.random.default_rng(0)
+    result.add(np.argsort(rng.random((200, len(TEAMS))), axis=1) + 1)
+    return SeasonSimulator.summarize(result, **spots)
+
+
+def test_zone_sizes_stored_with_the_probabilities(tmp_path):
+    store = MatchStore(tmp_path / 'store.db')
+    saved = summary(top_spots=2, relegation_spots=1)
+    store.save_simulation(2014, saved, 200, 'key')
+
+    latest = store.latest_simulation(2014)
+    assert latest.attrs == {'top_spots': 2, 'relegation_spots': 1}
+    columns = ['team', 'avg_position', 'title_prob_%', 'top2_prob_%', 'relegation_prob_%']
+    assert latest[columns].reset_index(drop=True).equals(saved[columns].reset_index(drop=True))
+
+
+def test_summary_without_zone_sizes_rejected(tmp_path):
+    store = MatchStore(tmp_path / 'store.db')
+    saved = summary()
+    saved.attrs.clear()
+
+    with pytest.raises(ValueError):
+        store.save_simulation(2021, saved, 200)
@@ -0,0 +1,52 @@
+"""FormEngine ring buffers and home/away split"""
+
+from conftest import match
+from src.data_processor import FootballDataProcessor
+from src.form_engine import FormEngine
+
+ALPHA, BRAVO, CHARLIE, UNKNOWN = (1, 'Alpha'), (2, 'Bravo'), (3, 'Charlie'), (None, None)
+
+# Alpha : V, V, N, D, V (du plus ancien au plus récent)
+MATCHES = [
+    match(1, ALPHA, BRAVO, 'FINISHED', 2, 0, date='2025-01-04T15:00:00Z'),
+    match(2, CHARLIE, ALPHA, 'FINISHED', 0, 1, date='2025-01-11T15:00:00Z'),
+    match(3, ALPHA, CHARLIE, 'FINISHED', 1, 1, date='2025-01-18T15:00:00Z'),
+    match(4, BRAVO, ALPHA, 'FINISHED', 3, 1, date='2025-01-25T15:00:00Z'),
+    match(5, ALPHA, BRAVO, 'FINISHED', 4, 2, date='2025-02-01T15:00:00Z'),
+    match(6, CHARLIE, ALPHA, 'IN_PLAY', 1, 0, date='2025-02-08T15:00:00Z'),
+    match(7, UNKNOWN, CHARLIE, 'TIMED', date='2025-02-15T15:00:00Z'),
+]
+
+
+def test_window_rolls_over_oldest_results():
+    # reçus dans le désordre : appliqués par date
+    engine = FormEngine.from_matches(MATCHES[::-1], last_n=3)
+    alpha = engine.to_dataframe().loc[1]
+
+    assert alpha['form_string'] == 'WLD'
+    assert (alpha['wins'], alpha['draws'], alpha['losses'], alpha['points']) == (1, 1, 1, 4)
+    assert (alpha['goals_scored'], alpha['goals_conceded']) == (6, 6)
+
+    # mêmes fenêtres que le calcul groupé sur les matchs terminés
+    batch = FootballDataProcessor.calculate_forms([m for m in MATCHES if m['status'] == 'FINISHED'], 3)
+    form = engine.to_dataframe()
+    for column in ('form_string', 'wins', 'draws', 'losses', 'goals_scored', 'goals_conceded', 'points'):
+        assert form[column].to_dict() == batch[column].to_dict()
+
+
+def test_home_and_away_windows():
+    alpha = FormEngine.from_matches(MATCHES, last_n=2).to_dataframe().loc[1]
+
+    # domicile : V (2-0), N, V (4-2) -> fenêtre de 2 : N, V
+    assert (alpha['home_played'], alpha['home_points']) == (2, 4)
+    # extérieur : V (1-0), D (3-1)
+    assert (alpha['away_played'], alpha['away_points']) == (2, 3)
+
+
+def test_only_new_finished_results_applied():
+    engine = FormEngine.from_matches(MATCHES[:3])
+
+    assert engine.update(MATCHES) == 2
+    assert engine.update(MATCHES) == 0
+    # match en cours et équipe inconnue ignorés
+    assert sorted(engine.team_ids) == [1, 2, 3]
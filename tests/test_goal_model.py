@@ -0,0 +1,67 @@
+"""Dixon-Coles fit and ScoreGrid sampling"""
+
+import numpy as np
+
+from src.goal_model import DixonColesModel, ScoreGrid
+
+TEAMS = {1: 'Alpha', 2: 'Bravo', 3: 'Charlie', 4: 'Delta'}
+ATTACK = np.log([2.0, 1.3, 1.0, 0.7])
+DEFENCE = np.log([0.7, 1.0, 1.2, 1.4])
+HOME_ADVANTAGE = np.log(1.3)
+
+
+def season(n_rounds=40, seed=0):
+    """Matches drawn from known Poisson rates, every pair home and away each round"""
+    rng = np.random.default_rng(seed)
+    ids = list(TEAMS)
+    matches = []
+    for k in range(n_rounds):
+        for i in range(len(ids)):
+            for j in range(len(ids)):
+                if i == j:
+                    continue
+                home_rate = np.exp(ATTACK[i] + DEFENCE[j] + HOME_ADVANTAGE)
+                away_rate = np.exp(ATTACK[j] + DEFENCE[i])
+                matches.append({
+                    'id': len(matches), 'status': 'FINISHED', 'utcDate': f'2025-01-{1 + k % 28:02d}T15:00:00Z',
+                    'homeTeam': {'id': ids[i], 'name': TEAMS[ids[i]]},
+                    'awayTeam': {'id': ids[j], 'name': TEAMS[ids[j]]},
+                    'score': {'fullTime': {'home': int(rng.poisson(home_rate)), 'away': int(rng.poisson(away_rate))}},
+                })
+    return matches
+
+
+def test_fit_recovers_team_strengths():
+    model = DixonColesModel.fit(season(), TEAMS, time_decay=0)
+
+    assert np.argsort(model.attack).tolist() == [3, 2, 1, 0]
+    assert np.argsort(model.defence).tolist() == [0, 1, 2, 3]
+    assert abs(model.home_advantage - HOME_ADVANTAGE) < 0.15
+    assert abs(model.attack.sum()) < 1e-3
+
+    home_rate, away_rate = model.expected_goals(np.array([0]), np.array([3]))
+    assert abs(home_rate[0] - 2.0 * 1.4 * 1.3) < 0.6 and abs(away_rate[0] - 0.7 * 0.7) < 0.25
+
+
+def test_grid_rows_are_distributions():
+    grid = ScoreGrid(DixonColesModel.fit(season(10), TEAMS))
+
+    off_diagonal = ~np.eye(len(TEAMS), dtype=bool)
+    assert np.allclose(grid.grids.sum(axis=(2, 3))[off_diagonal], 1)
+    assert np.allclose((grid.home_win + grid.draw + grid.away_win)[off_diagonal], 1)
+    assert grid.get('Alpha', 'Delta')['predicted_winner'] == 'home'
+    assert grid.get('Alpha', 'Alpha') is None
+
+
+def test_sampled_scores_follow_the_grid():
+    grid = ScoreGrid(DixonColesModel.fit(season(10), TEAMS))
+    home_idx, away_idx = grid.indices([1, 2, 4]), grid.indices([4, 3, 1])
+
+    home_goals, away_goals = grid.sample(home_idx, away_idx, 40000, np.random.default_rng(2))
+
+    assert home_goals.shape == away_goals.shape == (40000, 3)
+    size = grid.max_goals + 1
+    for k, (i, j) in enumerate(zip(home_idx, away_idx)):
+        frequencies = np.bincount(home_goals[:, k] * size + away_goals[:, k], minlength=size * size) / 40000
+        assert np.abs(frequencies - grid.grids[i, j].ravel()).max() < 0.01
+        assert abs(home_goals[:, k].mean() - grid.home_expected_goals[i, j]) < 0.05
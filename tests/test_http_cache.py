@@ -0,0 +1,75 @@
+"""ResponseCache: TTL, stale-while-revalidate and LRU eviction"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src import http_cache
+from src.api_client import FootballDataClient
+from src.http_cache import ResponseCache
+from src.rate_limiter import TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Manual clock of the cache module"""
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(http_cache, 'time', SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def test_entry_fresh_then_stale_then_expired(tmp_path, clock):
+    cache = ResponseCache(tmp_path / 'cache.sqlite', ttls={'teams/*': (60, 120)})
+    cache.set('teams/1', b'{}')
+
+    clock.now += 59
+    entry = cache.get('teams/1')
+    assert cache.is_fresh(entry)
+
+    clock.now += 2
+    assert not cache.is_fresh(entry) and cache.is_usable_stale(entry)
+
+    clock.now += 120
+    assert not cache.is_usable_stale(entry)
+
+    # revalidation : de nouveau frais sans changer le contenu
+    cache.touch('teams/1')
+    assert cache.is_fresh(cache.get('teams/1'))
+
+
+def test_least_recently_used_evicted_first(tmp_path, clock):
+    cache = ResponseCache(tmp_path / 'cache.sqlite', max_bytes=30)
+    for endpoint in ('a', 'b', 'c'):
+        clock.now += 1
+        cache.set(endpoint, b'x' * 10)
+
+    clock.now += 1
+    cache.get('a')
+    clock.now += 1
+    cache.set('d', b'x' * 10)
+
+    assert cache.get('b') is None
+    assert all(cache.get(endpoint) is not None for endpoint in ('a', 'c', 'd'))
+
+
+def test_stale_entry_served_while_refreshed(fake_api, tmp_path):
+    version = {'n': 1}
+    fake_api.routes['teams/57'] = lambda path, headers: (200, {}, {'version': version['n']})
+    client = FootballDataClient(
+        cache=ResponseCache(tmp_path / 'cache.sqlite', ttls={'*': (0, 3600)}),
+        base_url=fake_api.url,
+        limiter=TokenBucket(requests_per_minute=6000),
+        offline=False
+    )
+
+    assert client.get_team_info(57) == {'version': 1}
+    version['n'] = 2
+    # réponse périmée immédiate, rafraîchissement en arrière-plan
+    assert client.get_team_info(57) == {'version': 1}
+
+    deadline = time.monotonic() + 5
+    while (len(fake_api.requests) < 2 or client._revalidating) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert client.get_team_info(57) == {'version': 2}
+    client.session.close()
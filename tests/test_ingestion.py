@@ -0,0 +1,64 @@
+"""Schema flattening against the dict-based flattening it replaced"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from conftest import match
+from src.data_processor import FootballDataProcessor
+from src.ingestion import dumps, match_columns, standings_columns
+from test_standings_engine import standings
+
+ALPHA, BRAVO, UNKNOWN = (1, 'Alpha'), (2, 'Bravo'), (None, None)
+
+MATCHES = [
+    match(1, ALPHA, BRAVO, 'FINISHED', 2, 1),
+    match(2, BRAVO, ALPHA, 'TIMED'),
+    match(3, UNKNOWN, ALPHA, 'SCHEDULED'),
+]
+
+
+def dict_matches(matches):
+    """Per-match dicts, as flatten_matches built them before the schema"""
+    return pd.DataFrame([{
+        'match_id': m['id'],
+        'date': m['utcDate'],
+        'status': m['status'],
+        'home_id': m['homeTeam']['id'],
+        'home': m['homeTeam']['name'],
+        'away_id': m['awayTeam']['id'],
+        'away': m['awayTeam']['name'],
+        'home_goals': m['score']['fullTime']['home'],
+        'away_goals': m['score']['fullTime']['away'],
+    } for m in matches]).astype({'home_id': float, 'away_id': float, 'home_goals': float, 'away_goals': float})
+
+
+def test_match_columns_equal_dict_flattening():
+    expected = dict_matches(MATCHES)
+
+    for payload in ({'matches': MATCHES}, MATCHES, dumps({'matches': MATCHES})):
+        columns = pd.DataFrame(match_columns(payload))[expected.columns]
+        pd.testing.assert_frame_equal(columns, expected, check_dtype=False)
+
+    # ids complets : entiers, pas de flottants
+    assert match_columns(MATCHES[:2])['home_id'].dtype.kind == 'i'
+
+
+def test_missing_fields_fall_back_to_defaults():
+    partial = dict(MATCHES[0])
+    del partial['score']
+
+    columns = match_columns([MATCHES[1], partial])
+    assert np.isnan(columns['home_goals']).all()
+    assert columns['match_id'].tolist() == [2, 1]
+
+
+def test_standings_columns_equal_process_standings():
+    payload = standings(2021)
+    expected = FootballDataProcessor.process_standings(payload)
+
+    for data in (payload, json.dumps(payload), dumps(payload)):
+        columns = pd.DataFrame(standings_columns(data))
+        assert columns.pop('team_id').tolist() == [1, 2, 3]
+        pd.testing.assert_frame_equal(columns, expected)
@@ -0,0 +1,43 @@
+"""Live feed: minute of play and payloads without a score"""
+
+from conftest import match
+from src.live_engine import LiveFeed, match_minute
+from src.rate_limiter import TokenBucket
+
+
+class StubClient:
+    offline = False
+
+    def __init__(self, matches):
+        self.matches = matches
+        self.limiter = TokenBucket(requests_per_minute=6000)
+
+    def get_live_matches(self):
+        return {'matches': self.matches}
+
+
+def test_stoppage_time_counted_once():
+    live = match(1, (1, 'Alpha'), (2, 'Bravo'), 'IN_PLAY', 0, 0)
+
+    assert match_minute(dict(live, minute='45+2', injuryTime=2)) == 47
+    assert match_minute(dict(live, minute='90', injuryTime=3)) == 93
+    assert match_minute(dict(live, minute=63)) == 63
+
+
+def test_poll_without_full_time_score():
+    live = dict(match(1, (1, 'Alpha'), (2, 'Bravo'), 'IN_PLAY'), minute=10)
+    live['score'] = {'fullTime': None}
+    update = LiveFeed(StubClient([live])).poll(force=True)
+
+    assert update.changed == [1]
+    probabilities = update.probabilities[1]
+    total = sum(probabilities[f'{key}_probability'] for key in ('home_win', 'draw', 'away_win'))
+    assert abs(total - 100) < 0.5
+
+
+def test_live_endpoint_cache_never_outlives_a_poll(tmp_path):
+    from config import LIVE_POLL_INTERVAL
+    from src.http_cache import ResponseCache
+
+    ttl, stale = ResponseCache(tmp_path / 'cache.sqlite').policy('matches?status=LIVE')
+    assert ttl < LIVE_POLL_INTERVAL and stale == 0
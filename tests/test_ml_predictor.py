@@ -0,0 +1,84 @@
+"""MatchPredictor strength with and without Elo ratings"""
+
+import numpy as np
+import pandas as pd
+
+from config import ELO_INITIAL
+from src.ml_predictor import MatchPredictor
+
+TEAMS = [
+    {'name': 'Alpha', 'points': 60, 'goal_difference': 25, 'form_points': 12, 'elo': 1620.0},
+    {'name': 'Bravo', 'points': 35, 'goal_difference': -8, 'form_points': 4, 'elo': np.nan},
+    {'name': 'Charlie', 'points': 35, 'goal_difference': -8, 'form_points': 4, 'elo': ELO_INITIAL},
+]
+
+
+def test_scalar_and_batch_strengths_agree():
+    frame = pd.DataFrame(TEAMS)
+    batch = MatchPredictor.calculate_team_strengths(
+        frame['points'], frame['goal_difference'], frame['form_points'], frame['elo']
+    )
+    scalar = [MatchPredictor.calculate_team_strength(team) for team in TEAMS]
+
+    assert np.allclose(batch, scalar)
+    # note manquante = note initiale, sur les deux chemins
+    assert scalar[1] == scalar[2]
+
+
+def test_elo_is_blended_not_substituted():
+    alpha = dict(TEAMS[0])
+    stronger = dict(alpha, points=alpha['points'] + 10)
+
+    assert MatchPredictor.calculate_team_strength(stronger) > MatchPredictor.calculate_team_strength(alpha)
+    without_elo = {key: value for key, value in alpha.items() if key != 'elo'}
+    assert MatchPredictor.calculate_team_strength(alpha) != MatchPredictor.calculate_team_strength(without_elo)
+
+
+def test_predict_matches_uses_the_same_strength():
+    frame = pd.DataFrame(TEAMS)
+    predictions = MatchPredictor.predict_matches(frame.iloc[[0]], frame.iloc[[1]], key_factors=False)
+
+    assert predictions['home_strength'].iloc[0] == round(MatchPredictor.calculate_team_strength(TEAMS[0]), 1)
+    assert predictions['away_strength'].iloc[0] == round(MatchPredictor.calculate_team_strength(TEAMS[1]), 1)
+
+
+def test_batch_predictions_equal_predict_match():
+    rng = np.random.default_rng(8)
+    n_teams = 12
+    frame = pd.DataFrame({
+        'name': [f'Team {k}' for k in range(n_teams)],
+        'played': rng.integers(0, 39, n_teams),
+        'points': rng.integers(0, 90, n_teams),
+        'goal_difference': rng.integers(-40, 40, n_teams),
+        'form_points': rng.integers(0, 16, n_teams),
+        # demi-buts : arrondis sur égalité
+        'avg_goals_scored': rng.integers(0, 8, n_teams) / 2,
+        'avg_goals_conceded': rng.integers(0, 8, n_teams) / 2,
+        'elo': np.where(rng.random(n_teams) < 0.2, np.nan, rng.normal(ELO_INITIAL, 120, n_teams)),
+    })
+    home, away = np.array([(h, a) for h in range(n_teams) for a in range(n_teams) if h != a]).T
+    predictions = MatchPredictor.predict_matches(frame.iloc[home], frame.iloc[away])
+
+    teams = frame.to_dict('records')
+    for row, (h, a) in zip(predictions.to_dict('records'), zip(home, away)):
+        expected = MatchPredictor.predict_match(teams[h], teams[a])
+        assert {key: row[key] for key in expected} == expected
+
+
+def test_strength_per_game_across_league_lengths():
+    # même bilan par match : 2 points et +1 de diff. de buts, saison de 34 ou 38 matchs
+    short = {'played': 34, 'points': 68, 'goal_difference': 34, 'form_points': 10}
+    full = {'played': 38, 'points': 76, 'goal_difference': 38, 'form_points': 10}
+    halfway = {'played': 17, 'points': 34, 'goal_difference': 17, 'form_points': 10}
+
+    strengths = [MatchPredictor.calculate_team_strength(team) for team in (short, full, halfway)]
+    assert strengths[0] == strengths[1] == strengths[2]
+
+    frame = pd.DataFrame([short, full, halfway, dict(full, played=np.nan), dict(full, played=0)])
+    batch = MatchPredictor.calculate_team_strengths(
+        frame['points'], frame['goal_difference'], frame['form_points'], played=frame['played']
+    )
+    scalar = [MatchPredictor.calculate_team_strength(team) for team in frame.to_dict('records')]
+    assert np.array_equal(batch, scalar)
+    # sans matchs joués connus : saison complète de référence
+    assert batch[3] == strengths[1]
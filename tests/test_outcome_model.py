@@ -0,0 +1,81 @@
+"""OutcomeModel: manifest checks on load and predictions through predict_matches"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from conftest import match
+from src.ml_predictor import MatchPredictor
+from src.outcome_model import OutcomeModel, feature_hash
+
+TEAMS = [(k, f'Team {k}') for k in range(1, 7)]
+STRENGTH = np.array([2.2, 1.8, 1.4, 1.1, 0.9, 0.6])
+
+
+def season(seed=0, n_rounds=6):
+    rng = np.random.default_rng(seed)
+    matches = []
+    for r in range(n_rounds):
+        for i, home in enumerate(TEAMS):
+            for j, away in enumerate(TEAMS):
+                if i != j:
+                    matches.append(match(
+                        len(matches), home, away, 'FINISHED',
+                        int(rng.poisson(STRENGTH[i] * 1.2)), int(rng.poisson(STRENGTH[j])),
+                        date=f'2025-{1 + r:02d}-{1 + i * 4 + j:02d}T15:00:00Z', matchday=r + 1
+                    ))
+    return {'matches': matches}
+
+
+def teams_frame():
+    return pd.DataFrame({
+        'name': [name for _, name in TEAMS], 'played': 20, 'points': [45, 38, 30, 25, 20, 12],
+        'goal_difference': [25, 12, 3, -5, -12, -23], 'goals_for': [45, 36, 30, 24, 20, 15],
+        'goals_against': [20, 24, 27, 29, 32, 38], 'form_points': [12, 10, 7, 6, 4, 2],
+    })
+
+
+def test_saved_model_round_trip(tmp_path):
+    model = OutcomeModel.train(season())
+    path = tmp_path / 'outcome_model.joblib'
+    model.save(path)
+
+    loaded = OutcomeModel.load(path)
+    frame = teams_frame()
+    assert loaded.manifest == model.manifest and loaded.identity == model.identity
+    assert np.allclose(loaded.predict_proba(frame, frame[::-1]), model.predict_proba(frame, frame[::-1]))
+
+
+def test_stale_manifest_rejected(tmp_path):
+    path = tmp_path / 'outcome_model.joblib'
+    OutcomeModel.train(season()).save(path)
+    manifest_path = OutcomeModel.manifest_path(path)
+    manifest = json.loads(manifest_path.read_text())
+    assert manifest['feature_hash'] == feature_hash()
+
+    for stale in ({'feature_hash': 'other'}, {'sklearn_version': '0.0'}):
+        manifest_path.write_text(json.dumps(dict(manifest, **stale)))
+        assert OutcomeModel.load(path) is None
+
+    manifest_path.write_text('{not json')
+    assert OutcomeModel.load(path) is None
+    manifest_path.unlink()
+    assert OutcomeModel.load(path) is None
+
+
+def test_predict_matches_with_model():
+    model = OutcomeModel.train(season())
+    frame = teams_frame()
+    home, away = frame.iloc[[0, 5, 2]], frame.iloc[[5, 0, 3]]
+
+    predictions = MatchPredictor.predict_matches(home, away, key_factors=False, model=model)
+    expected = np.round(model.predict_proba(home, away) * 100, 1)
+
+    columns = ['home_win_probability', 'draw_probability', 'away_win_probability']
+    assert np.allclose(predictions[columns].to_numpy(), expected)
+    assert predictions['predicted_winner'].iloc[0] == 'home'
+    assert predictions['predicted_winner'].iloc[1] == 'away'
+    # la force affichée reste celle de la formule
+    formula = MatchPredictor.predict_matches(home, away, key_factors=False)
+    assert predictions['home_strength'].equals(formula['home_strength'])
@@ -0,0 +1,24 @@
+"""PredictionMatrix cache key"""
+
+from types import SimpleNamespace
+
+from conftest import match
+from src.prediction_matrix import PredictionMatrix
+from src.rating_engine import EloRatings
+from test_standings_engine import standings
+
+ALPHA, BRAVO = (1, 'Alpha'), (2, 'Bravo')
+
+
+def test_key_covers_ratings_and_model():
+    payload = standings(2021)
+    before = EloRatings().to_dataframe()
+    after = EloRatings.from_matches([match(1, ALPHA, BRAVO, 'FINISHED', 2, 0)]).to_dataframe()
+
+    key = PredictionMatrix.input_key(payload, after)
+    assert key == PredictionMatrix.input_key(payload, after.copy())
+    assert key != PredictionMatrix.input_key(payload, before)
+    assert key != PredictionMatrix.input_key(payload)
+    assert key != PredictionMatrix.input_key(payload, after, SimpleNamespace(identity='trained'))
+
+    assert PredictionMatrix.from_standings(payload, ratings=after).key == key
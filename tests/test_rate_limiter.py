@@ -0,0 +1,37 @@
+"""TokenBucket alignment on the API quota headers"""
+
+from src.rate_limiter import TokenBucket
+
+
+def test_headers_can_lower_tokens():
+    bucket = TokenBucket(requests_per_minute=10)
+    bucket.update_from_headers({'X-Requests-Available-Minute': '3'})
+
+    assert bucket.capacity == 10
+    assert 2.9 < bucket.available() < 4
+
+
+def test_larger_quota_grows_the_bucket():
+    bucket = TokenBucket(requests_per_minute=10)
+    bucket.update_from_headers({'X-Requests-Available-Minute': '30'})
+
+    assert bucket.capacity == 30
+    assert bucket.rate == 0.5
+    assert bucket.available() >= 30 - 1e-6
+
+
+def test_larger_quota_shared_through_state_file(tmp_path):
+    state = tmp_path / 'rate_limit.json'
+    first = TokenBucket(requests_per_minute=10, state_path=state)
+    second = TokenBucket(requests_per_minute=10, state_path=state)
+    first.update_from_headers({'X-Requests-Available-Minute': '30'})
+
+    assert second.available() >= 30 - 1e-6
+    assert second.capacity == 30
+
+
+def test_exhausted_quota_blocks_until_reset():
+    bucket = TokenBucket(requests_per_minute=10)
+    bucket.update_from_headers({'X-Requests-Available-Minute': '0', 'X-RequestCounter-Reset': '42'})
+
+    assert bucket.available() == 0
@@ -0,0 +1,41 @@
+"""EloRatings snapshots"""
+
+import numpy as np
+
+from conftest import match
+from src.rating_engine import EloRatings
+
+ALPHA, BRAVO, CHARLIE, DELTA = (1, 'Alpha'), (2, 'Bravo'), (3, 'Charlie'), (4, 'Delta')
+
+
+def test_late_result_keeps_snapshots_sorted():
+    ratings = EloRatings.from_matches([
+        match(1, ALPHA, BRAVO, 'FINISHED', 2, 0, date='2025-01-04T15:00:00Z', matchday=1),
+        match(2, CHARLIE, DELTA, 'FINISHED', 1, 1, date='2025-01-04T17:00:00Z', matchday=1),
+        match(3, BRAVO, CHARLIE, 'FINISHED', 0, 1, date='2025-01-11T15:00:00Z', matchday=2),
+    ])
+    before = ratings.as_of('2025-01-05')
+
+    # match de la 1re journée reporté, joué après la 2e
+    ratings.update([match(4, DELTA, ALPHA, 'FINISHED', 3, 0, date='2025-01-08T19:00:00Z', matchday=1)])
+
+    dates = ratings.snapshot_dates
+    assert (np.diff(dates.astype(np.int64)) > 0).all()
+    assert np.array_equal(ratings.as_of('2025-01-05'), before)
+
+    alpha, delta = ratings.index[1], ratings.index[4]
+    after_late = ratings.as_of('2025-01-09')
+    assert after_late[delta] > before[delta] and after_late[alpha] < before[alpha]
+    # la dernière photo reste égale aux notes courantes
+    assert np.allclose(ratings.as_of('2025-02-01'), ratings.as_of(), atol=1e-3)
+
+
+def test_snapshot_per_matchday():
+    ratings = EloRatings.from_matches([
+        match(1, ALPHA, BRAVO, 'FINISHED', 1, 0, date='2025-01-04T15:00:00Z', matchday=1),
+        match(2, ALPHA, CHARLIE, 'FINISHED', 1, 0, date='2025-01-11T15:00:00Z', matchday=2),
+    ])
+
+    assert len(ratings.snapshot_dates) == 2
+    assert ratings.rating(1, '2025-01-05') < ratings.rating(1)
+    assert ratings.rating(1, '2025-01-01') == ratings.initial
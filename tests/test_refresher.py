@@ -0,0 +1,80 @@
+"""Refresher cycle against a stub client"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from conftest import match
+from src.data_store import MatchStore
+from src.refresher import Refresher
+
+ARSENAL, CHELSEA = (57, 'Arsenal'), (61, 'Chelsea')
+
+
+class StubClient:
+    """Async client serving fixed payloads"""
+
+    def __init__(self, matches):
+        self.matches = matches
+        self.calls = []
+
+    async def get_competition_standings(self, competition_id):
+        self.calls.append(('standings', competition_id))
+        return {
+            'competition': {'id': competition_id, 'name': 'Premier League'},
+            'season': {'startDate': '2024-08-01'},
+            'standings': [{'type': 'TOTAL', 'table': [
+                {'position': 1, 'team': {'id': 57, 'name': 'Arsenal'}, 'playedGames': 1, 'won': 1,
+                 'draw': 0, 'lost': 0, 'goalsFor': 2, 'goalsAgainst': 1, 'goalDifference': 1, 'points': 3},
+                {'position': 2, 'team': {'id': 61, 'name': 'Chelsea'}, 'playedGames': 1, 'won': 0,
+                 'draw': 0, 'lost': 1, 'goalsFor': 1, 'goalsAgainst': 2, 'goalDifference': -1, 'points': 0},
+            ]}],
+        }
+
+    async def get_competition_matches(self, competition_id):
+        self.calls.append(('matches', competition_id))
+        return {'competition': {'id': competition_id}, 'matches': self.matches}
+
+    async def get_live_matches(self):
+        self.calls.append(('live', None))
+        return {'matches': []}
+
+
+def run_cycle(matches, tmp_path):
+    store = MatchStore(tmp_path / 'store.db')
+    client = StubClient(matches)
+    refresher = Refresher(
+        client=client, competitions={'PL': 2021}, idle_interval=900, live_interval=60, store=store
+    )
+    started = time.time()
+    wait = asyncio.run(refresher.run_once())
+    return refresher, store, refresher.next_due['PL'] - started, wait
+
+
+def test_idle_cycle_fills_store(tmp_path):
+    later = (datetime.now(timezone.utc) + timedelta(days=3)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    matches = [
+        match(1, ARSENAL, CHELSEA, 'FINISHED', 2, 1, date='2025-01-01T15:00:00Z'),
+        match(2, CHELSEA, ARSENAL, 'TIMED', date=later, matchday=2),
+    ]
+    refresher, store, interval, wait = run_cycle(matches, tmp_path)
+
+    stored = store.competition_matches(2021)
+    assert stored['id'].tolist() == [1, 2]
+    assert stored['home_team'].tolist() == ['Arsenal', 'Chelsea']
+    assert store.upcoming_matches(2021)['id'].tolist() == [2]
+    assert store.latest_standings(2021)['team'].tolist() == ['Arsenal', 'Chelsea']
+
+    # compétition sans direct : repassage à l'intervalle idle, boucle jamais plus lente que le direct
+    assert 900 <= interval < 905
+    assert wait == 60
+
+
+def test_live_cycle_uses_live_interval(tmp_path):
+    kickoff = (datetime.now(timezone.utc) - timedelta(minutes=30)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    matches = [match(3, ARSENAL, CHELSEA, 'IN_PLAY', 1, 0, date=kickoff)]
+    refresher, store, interval, wait = run_cycle(matches, tmp_path)
+
+    assert store.competition_matches(2021, ['IN_PLAY'])['id'].tolist() == [3]
+    assert 60 <= interval < 65
+    assert 55 < wait <= 60
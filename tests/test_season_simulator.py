@@ -0,0 +1,120 @@
+"""SeasonSimulator: inputs and incremental SeasonState updates"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.rating_engine import EloRatings
+from src.season_similator import SeasonSimulator
+
+NAMES = ['Alpha', 'Bravo', 'Charlie', 'Delta', 'Echo', 'Foxtrot']
+
+
+def standings(with_team_id=True):
+    rng = np.random.default_rng(3)
+    won, draw, lost = rng.integers(0, 10, (3, len(NAMES)))
+    goals_for, goals_against = rng.integers(5, 30, (2, len(NAMES)))
+    df = pd.DataFrame({
+        'team': NAMES, 'played': won + draw + lost, 'won': won, 'draw': draw, 'lost': lost,
+        'goals_for': goals_for, 'goals_against': goals_against,
+        'goal_difference': goals_for - goals_against, 'points': 3 * won + draw,
+    }).sort_values(['points', 'goal_difference'], ascending=False, ignore_index=True)
+    df.insert(0, 'position', np.arange(1, len(df) + 1))
+    if with_team_id:
+        df['team_id'] = np.arange(100, 100 + len(df))
+    return df
+
+
+def fixtures():
+    return [
+        {'id': k, 'status': 'TIMED', 'homeTeam': {'name': home}, 'awayTeam': {'name': away}}
+        for k, (home, away) in enumerate((h, a) for h in NAMES for a in NAMES if h != a)
+    ]
+
+
+def test_ratings_need_team_ids():
+    with pytest.raises(ValueError):
+        SeasonSimulator(standings(with_team_id=False), ratings=EloRatings().to_dataframe())
+
+    assert len(SeasonSimulator(standings(), ratings=EloRatings().to_dataframe()).teams) == len(NAMES)
+
+
+def test_start_season_matches_simulate_season():
+    simulator = SeasonSimulator(standings())
+    full = simulator.simulate_season(fixtures(), n_simulations=2500, seed=7, workers=1)
+    state = simulator.start_season(fixtures(), n_simulations=2500, seed=7)
+
+    assert np.array_equal(state.result().counts, full.counts)
+
+
+def test_applied_result_updates_totals_in_place():
+    simulator = SeasonSimulator(standings())
+    remaining = fixtures()
+    state = simulator.start_season(remaining, n_simulations=500, seed=1)
+    played = dict(remaining[4], status='FINISHED', score={'fullTime': {'home': 3, 'away': 1}})
+
+    assert state.apply_results([played, remaining[5]]) == 1
+    assert not state.apply_result(played)
+    assert 4 not in state.pending() and len(state.pending()) == len(remaining) - 1
+
+    # totaux identiques à un recalcul complet depuis les échantillons modifiés
+    table = simulator._final_table(
+        state.home_idx, state.away_idx, state.winner, state.home_goals, state.away_goals
+    )
+    assert np.array_equal(table['points'], state.points)
+    assert np.array_equal(table['goal_difference'], state.goal_difference)
+
+    home = simulator.team_index[played['homeTeam']['name']]
+    base = simulator.base_standings
+    assert state.current_table()['points'][home] == base['points'].iloc[home] + 3
+    assert state.current_table()['goal_difference'][home] == base['goal_difference'].iloc[home] + 2
+
+
+def test_sampled_scores_follow_the_outcome():
+    simulator = SeasonSimulator(standings())
+    home_idx, away_idx = simulator._fixture_indices(fixtures())
+    winner, home_goals, away_goals = simulator._sample_fixtures(
+        home_idx, away_idx, 4000, np.random.default_rng(5)
+    )
+
+    assert np.array_equal(winner, np.sign(away_goals - home_goals) + 1)
+    # le score n'est pas gonflé pour coller à l'issue
+    matrix = simulator.prediction_matrix
+    home, away = simulator._matrix_idx[home_idx], simulator._matrix_idx[away_idx]
+    expected = matrix.home_expected_goals[home, away] + matrix.away_expected_goals[home, away]
+    assert abs((home_goals + away_goals).mean() - expected.mean()) < 0.15
+    draws = winner == 1
+    assert (home_goals[draws] > 0).any() and (home_goals[draws] == 0).any()
+
+
+@pytest.mark.parametrize('tolerance', [None, 0.05])
+def test_worker_count_does_not_change_results(tolerance):
+    simulator = SeasonSimulator(standings())
+    kwargs = dict(n_simulations=6000, seed=11, tolerance=tolerance, chunk_size=1000)
+    in_process = simulator.simulate_season(fixtures(), workers=None, **kwargs)
+    parallel = simulator.simulate_season(fixtures(), workers=2, **kwargs)
+
+    assert in_process.n_simulations == parallel.n_simulations
+    assert np.array_equal(in_process.counts, parallel.counts)
+
+
+def test_same_seed_same_histogram():
+    simulator = SeasonSimulator(standings())
+    first = simulator.simulate_season(fixtures(), n_simulations=3000, seed=42)
+    second = simulator.simulate_season(fixtures(), n_simulations=3000, seed=42)
+    other = simulator.simulate_season(fixtures(), n_simulations=3000, seed=43)
+
+    assert np.array_equal(first.counts, second.counts)
+    assert not np.array_equal(first.counts, other.counts)
+
+
+def test_tolerance_stops_within_budget():
+    simulator = SeasonSimulator(standings())
+    loose = simulator.simulate_season(fixtures(), n_simulations=20000, seed=3, tolerance=0.05, chunk_size=500)
+    tight = simulator.simulate_season(fixtures(), n_simulations=2000, seed=3, tolerance=1e-4, chunk_size=500)
+
+    # arrêt anticipé sur un bloc entier, précision atteinte
+    assert 0 < loose.n_simulations < 20000 and loose.n_simulations % 500 == 0
+    assert simulator._converged(loose, 0.05, 3, 1.96)
+    # précision inatteignable : tout le budget est consommé
+    assert tight.n_simulations == 2000
@@ -0,0 +1,60 @@
+"""StandingsTable tie-breaks"""
+
+from conftest import match
+from src.standings_engine import StandingsTable
+
+ALPHA, BRAVO, CHARLIE = (1, 'Alpha'), (2, 'Bravo'), (3, 'Charlie')
+
+# Alpha et Bravo à égalité de points : Alpha gagne la confrontation directe,
+# Bravo a la meilleure différence de buts
+RESULTS = [
+    match(10, ALPHA, BRAVO, 'FINISHED', 1, 0, date='2025-01-01T15:00:00Z'),
+    match(11, BRAVO, CHARLIE, 'FINISHED', 5, 0, date='2025-01-08T15:00:00Z'),
+    match(12, ALPHA, CHARLIE, 'FINISHED', 0, 0, date='2025-01-15T15:00:00Z'),
+    match(13, BRAVO, CHARLIE, 'FINISHED', 0, 0, date='2025-01-22T15:00:00Z'),
+]
+
+
+def row(position, team, played, won, draw, lost, goals_for, goals_against):
+    return {
+        'position': position, 'team': {'id': team[0], 'name': team[1]}, 'playedGames': played,
+        'won': won, 'draw': draw, 'lost': lost, 'goalsFor': goals_for, 'goalsAgainst': goals_against,
+        'goalDifference': goals_for - goals_against, 'points': 3 * won + draw,
+    }
+
+
+def standings(competition_id):
+    return {
+        'competition': {'id': competition_id},
+        'standings': [{'type': 'TOTAL', 'table': [
+            row(1, ALPHA, 2, 1, 1, 0, 1, 0),
+            row(2, BRAVO, 3, 1, 1, 1, 5, 1),
+            row(3, CHARLIE, 3, 0, 2, 1, 0, 5),
+        ]}],
+    }
+
+
+def test_head_to_head_beats_goal_difference():
+    table = StandingsTable(standings(2014), 2014, results=RESULTS)
+
+    assert table.to_dataframe()['team'].tolist() == ['Alpha', 'Bravo', 'Charlie']
+
+
+def test_head_to_head_kept_with_live_matches():
+    table = StandingsTable(standings(2014), 2014, results=RESULTS)
+    live = [match(14, CHARLIE, (4, 'Delta'), 'IN_PLAY', 1, 0)]
+
+    assert table.with_live(live).to_dataframe()['team'].tolist() == ['Alpha', 'Bravo', 'Charlie']
+
+
+def test_goal_difference_first_without_head_to_head_rule():
+    table = StandingsTable(standings(2021), 2021, results=RESULTS)
+
+    assert table.to_dataframe()['team'].tolist() == ['Bravo', 'Alpha', 'Charlie']
+
+
+def test_results_are_not_counted_twice():
+    table = StandingsTable(standings(2014), 2014, results=RESULTS)
+
+    assert table.apply_matches(RESULTS) == 0
+    assert table.to_dataframe()['points'].tolist() == [4, 4, 2]